@@ -0,0 +1,163 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Reports the peak RSS of build_tabText before and after the non-mutating join.
+
+The baseline is a copy of ``build_tabText`` as it was before the column-wise date
+labels, which labels the dates row by row, so it takes minutes for a million rows.
+Each variant runs in its own process and the peak RSS is reset once the input
+dataframes are built, so the reported peak only covers the join itself. It reads
+``/proc/self``, so it runs on Linux only. Run it from the repository root:
+
+    python benchmarks/build_tabText_memory.py --rows 1000000 --text-length 2000
+"""
+from __future__ import absolute_import
+
+import argparse
+import gc
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from smjsindustry.finance.build_tabText import build_tabText, JUMPSTART_NORMALIZED_DATE
+from smjsindustry.finance.utils import FREQ_LABEL_MAP
+
+
+def _make_frames(rows, text_length):
+    """Builds a tabular and a text dataframe sharing ``rows`` (ticker, quarter) keys."""
+    rng = np.random.default_rng(0)
+    tickers = np.array(["T{}".format(i) for i in range(rows // 40 + 1)], dtype=object)
+    ticker_column = np.repeat(tickers, 40)[:rows]
+    dates = pd.date_range("2001-01-01", periods=40, freq="QS").strftime("%Y-%m-%d")
+    date_column = np.tile(np.asarray(dates, dtype=object), len(tickers))[:rows]
+    tabular_df = pd.DataFrame(
+        {
+            "ticker": ticker_column,
+            "date": date_column,
+            **{"metric{}".format(i): rng.random(rows) for i in range(8)},
+        }
+    )
+    text_df = pd.DataFrame(
+        {
+            "ticker": ticker_column,
+            "date": date_column,
+            "text": ["x" * text_length + str(i) for i in range(rows)],
+        }
+    )
+    return tabular_df, text_df
+
+
+def _baseline_get_freq_label(date_value, freq):
+    """The uncached per-value ``get_freq_label`` of the baseline, verbatim."""
+    freq = freq.upper()
+    if freq not in FREQ_LABEL_MAP:
+        raise ValueError("frequency {} not supported".format(freq))
+    if not isinstance(date_value, str):
+        raise Exception("The date column needs to be string")
+    return FREQ_LABEL_MAP[freq](date_value.upper())
+
+
+def _baseline_build_tabText(
+    tabular_df,
+    tabular_key,
+    tabular_date_column,
+    text_df,
+    text_key,
+    text_date_column,
+    how="inner",
+    freq="Q",
+):
+    """The baseline ``build_tabText``, verbatim but for calling the uncached label function.
+
+    It labels the dates row by row into a column it adds to both inputs, and drops
+    the column again after the merge.
+    """
+    if tabular_date_column and text_date_column:
+        tabular_df[JUMPSTART_NORMALIZED_DATE] = tabular_df[tabular_date_column]
+        for i in range(len(tabular_df)):
+            date_value = tabular_df.loc[i, tabular_date_column]
+            freq_label = _baseline_get_freq_label(date_value, freq)
+            tabular_df.loc[i, JUMPSTART_NORMALIZED_DATE] = freq_label
+        text_df[JUMPSTART_NORMALIZED_DATE] = text_df[text_date_column]
+        for i in range(len(text_df)):
+            date_value = text_df.loc[i, text_date_column]
+            freq_label = _baseline_get_freq_label(date_value, freq)
+            text_df.loc[i, JUMPSTART_NORMALIZED_DATE] = freq_label
+        joined = pd.merge(
+            tabular_df,
+            text_df,
+            left_on=[tabular_key, JUMPSTART_NORMALIZED_DATE],
+            right_on=[text_key, JUMPSTART_NORMALIZED_DATE],
+            how=how,
+        )
+        tabular_df.drop(columns=[JUMPSTART_NORMALIZED_DATE], inplace=True)
+        text_df.drop(columns=[JUMPSTART_NORMALIZED_DATE], inplace=True)
+        joined.drop(columns=[JUMPSTART_NORMALIZED_DATE], inplace=True)
+    else:
+        joined = pd.merge(tabular_df, text_df, left_on=tabular_key, right_on=text_key, how=how)
+    return joined
+
+
+def _reset_peak_rss():
+    """Resets the peak RSS of this process to its current RSS (Linux only)."""
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+
+
+def _rss_mb(field):
+    """Returns the ``VmRSS`` or ``VmHWM`` (peak RSS) field of this process in MiB."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 2**10
+    raise RuntimeError("{} is not reported by /proc/self/status".format(field))
+
+
+def _run(variant, rows, text_length, results):
+    """Runs one variant and reports the peak RSS growth caused by the join."""
+    tabular_df, text_df = _make_frames(rows, text_length)
+    gc.collect()
+    _reset_peak_rss()
+    before = _rss_mb("VmRSS")
+    if variant == "baseline (before)":
+        joined = _baseline_build_tabText(tabular_df, "ticker", "date", text_df, "ticker", "date")
+    else:
+        joined = build_tabText(
+            tabular_df, "ticker", "date", text_df, "ticker", "date", low_memory="low" in variant
+        )
+    peak = _rss_mb("VmHWM")
+    results[variant] = (before, peak, len(joined))
+
+
+def main():
+    """Runs every variant and prints a table of peak RSS figures."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--text-length", type=int, default=2000)
+    args = parser.parse_args()
+    results = multiprocessing.Manager().dict()
+    variants = ["baseline (before)", "non-mutating (after)", "non-mutating low_memory (after)"]
+    for variant in variants:
+        process = multiprocessing.Process(
+            target=_run, args=(variant, args.rows, args.text_length, results)
+        )
+        process.start()
+        process.join()
+    print("{:<34}{:>14}{:>14}{:>16}".format("variant", "inputs MiB", "peak MiB", "join MiB"))
+    for variant in variants:
+        before, peak, _ = results[variant]
+        print("{:<34}{:>14.0f}{:>14.0f}{:>16.0f}".format(variant, before, peak, peak - before))
+
+
+if __name__ == "__main__":
+    main()
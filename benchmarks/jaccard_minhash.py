@@ -0,0 +1,96 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Compares the approximate MinHash Jaccard sentence scores with the exact ones.
+
+The accuracy is measured on the filing in ``tests/data/finance/processor_data.csv``.
+The speed is also measured on larger synthetic documents, whose sentences are sampled
+from the token frequencies and sentence lengths of the filing. Run it from the
+repository root:
+
+    python benchmarks/jaccard_minhash.py --sizes 10000 30000
+"""
+from __future__ import absolute_import
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from smjsindustry.finance.jaccard import (
+    approximate_jaccard_similarity_sums,
+    jaccard_similarity_sums,
+)
+from smjsindustry.finance.tokenizer import split_sentences, tokenize
+
+DATA_FILE = "tests/data/finance/processor_data.csv"
+SETTINGS = [(64, 16), (64, 32), (128, 32), (128, 64), (256, 64), (128, 128)]
+TOP_SENTENCES = 10
+
+
+def _timed(function, *args):
+    """Returns the result and the run time in seconds of a function call."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _synthetic_document(token_lists, size, seed=0):
+    """Samples ``size`` sentences from the token frequencies and lengths of a document."""
+    rng = np.random.default_rng(seed)
+    tokens, counts = np.unique(np.concatenate(token_lists), return_counts=True)
+    lengths = rng.choice([len(tokens_) for tokens_ in token_lists], size=size)
+    return [list(rng.choice(tokens, size=length, p=counts / counts.sum())) for length in lengths]
+
+
+def _compare(name, token_lists):
+    """Prints the run time and the accuracy of every setting against the exact scores."""
+    exact, exact_seconds = _timed(jaccard_similarity_sums, token_lists)
+    top = set(np.argsort(-exact, kind="stable")[:TOP_SENTENCES])
+    print("\n{} ({} sentences)".format(name, len(token_lists)))
+    print(
+        "{:<16}{:>10}{:>14}{:>14}{:>16}".format(
+            "setting", "seconds", "correlation", "rel. error", "top-10 overlap"
+        )
+    )
+    print("{:<16}{:>10.3f}{:>14}{:>14}{:>16}".format("exact", exact_seconds, "1", "0", "10/10"))
+    for num_perm, num_bands in SETTINGS:
+        estimate, seconds = _timed(
+            approximate_jaccard_similarity_sums, token_lists, num_perm, num_bands
+        )
+        overlap = len(top & set(np.argsort(-estimate, kind="stable")[:TOP_SENTENCES]))
+        print(
+            "{:<16}{:>10.3f}{:>14.4f}{:>14.4f}{:>16}".format(
+                "{}/{}".format(num_perm, num_bands),
+                seconds,
+                np.corrcoef(exact, estimate)[0, 1],
+                np.abs(estimate - exact).mean() / exact.mean(),
+                "{}/{}".format(overlap, TOP_SENTENCES),
+            )
+        )
+
+
+def main():
+    """Runs the comparison on the bundled filing and on synthetic documents."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10000])
+    args = parser.parse_args()
+    text = pd.read_csv(DATA_FILE)["text"][0]
+    token_lists = [tokenize(sentence) for sentence in split_sentences(text)]
+    _compare("processor_data.csv", token_lists)
+    for size in args.sizes:
+        _compare("synthetic", _synthetic_document(token_lists, size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Measures how the local k-medoids summarizer scales with the number of sentences.
+
+The documents are synthetic, with sentences sampled from the token frequencies and
+sentence lengths of the filing in ``tests/data/finance/processor_data.csv``. For every
+metric, the distance matrix, the BUILD initialization, and the FasterPAM swaps are timed
+separately. Run it from the repository root:
+
+    python benchmarks/kmedoids_scaling.py --sizes 100 1000 3000 10000
+"""
+from __future__ import absolute_import
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from smjsindustry.finance.constants import KMEDOIDS_SUMMARIZER_METRIC_VALUES
+from smjsindustry.finance.embedding import TfidfSvdEmbedding
+from smjsindustry.finance.kmedoids import initialize_medoids, kmedoids, pairwise_distances
+from smjsindustry.finance.tokenizer import split_sentences, tokenize
+
+DATA_FILE = "tests/data/finance/processor_data.csv"
+
+
+def _timed(function, *args, **kwargs):
+    """Returns the result and the run time in seconds of a function call."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _synthetic_document(token_lists, size, seed=0):
+    """Samples ``size`` sentences from the token frequencies and lengths of a document."""
+    rng = np.random.default_rng(seed)
+    tokens, counts = np.unique(np.concatenate(token_lists), return_counts=True)
+    lengths = rng.choice([len(tokens_) for tokens_ in token_lists], size=size)
+    return [list(rng.choice(tokens, size=length, p=counts / counts.sum())) for length in lengths]
+
+
+def main():
+    """Runs the k-medoids phases on synthetic documents of increasing sizes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 1000, 3000, 10000])
+    parser.add_argument("--n-clusters", type=int, default=10)
+    parser.add_argument("--vector-size", type=int, default=100)
+    args = parser.parse_args()
+    text = pd.read_csv(DATA_FILE)["text"][0]
+    token_lists = [tokenize(sentence) for sentence in split_sentences(text)]
+    print(
+        "{:>10}{:>14}{:>12}{:>12}{:>12}{:>12}{:>14}".format(
+            "sentences", "metric", "matrix MB", "distances", "build", "swap", "total cost"
+        )
+    )
+    for size in args.sizes:
+        vectors = TfidfSvdEmbedding(args.vector_size).embed(_synthetic_document(token_lists, size))
+        for metric in KMEDOIDS_SUMMARIZER_METRIC_VALUES:
+            distances, distance_seconds = _timed(pairwise_distances, vectors, metric)
+            _, build_seconds = _timed(initialize_medoids, distances, args.n_clusters, "build")
+            medoids, total_seconds = _timed(kmedoids, distances, args.n_clusters, init="build")
+            cost = distances[medoids].min(axis=0).sum(dtype=np.float64)
+            print(
+                "{:>10}{:>14}{:>12.1f}{:>12.3f}{:>12.3f}{:>12.3f}{:>14.2f}".format(
+                    size,
+                    metric,
+                    distances.nbytes / 2**20,
+                    distance_seconds,
+                    build_seconds,
+                    total_seconds - build_seconds,
+                    cost,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Reports the throughput of LocalSummarizer for an increasing number of processes.
+
+The documents are sections of the filing in ``tests/data/finance/processor_data.csv``.
+Run it from the repository root:
+
+    python benchmarks/summarizer_batch.py --documents 2000 --n-jobs 1 2 4 8
+"""
+from __future__ import absolute_import
+
+import argparse
+import time
+
+import pandas as pd
+
+from smjsindustry.finance.local_summarizer import LocalSummarizer
+from smjsindustry.finance.processor_config import JaccardSummarizerConfig
+from smjsindustry.finance.tokenizer import split_sentences
+
+DATA_FILE = "tests/data/finance/processor_data.csv"
+
+
+def main():
+    """Summarizes the same documents with every number of processes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--sentences", type=int, default=30)
+    parser.add_argument("--n-jobs", type=int, nargs="*", default=[1, 2, 4])
+    args = parser.parse_args()
+    sentences = split_sentences(pd.read_csv(DATA_FILE)["text"][0])
+    texts = [
+        " ".join(sentences[(i + j) % len(sentences)] for j in range(args.sentences))
+        for i in range(args.documents)
+    ]
+    dataframe = pd.DataFrame({"text": texts})
+    summarizer_config = JaccardSummarizerConfig(summary_size=3)
+    print("{:>8}{:>12}{:>16}{:>10}".format("n_jobs", "seconds", "documents/s", "speedup"))
+    baseline = None
+    for n_jobs in args.n_jobs:
+        start = time.perf_counter()
+        LocalSummarizer(n_jobs=n_jobs).summarize(summarizer_config, "text", dataframe)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(
+            "{:>8}{:>12.2f}{:>16.0f}{:>10.2f}".format(
+                n_jobs, seconds, len(texts) / seconds, baseline / seconds
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
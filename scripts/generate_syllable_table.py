@@ -0,0 +1,67 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Generates the syllable table of the readability module from the CMU Pronouncing Dictionary.
+
+The syllables of a word are the vowels of its first pronunciation, which carry a stress
+digit. Only the words of ASCII letters are kept, since those are the words the NLP scorer
+counts. The table keeps the license of the dictionary in its header. Get the dictionary
+from https://github.com/cmusphinx/cmudict and run it from the repository root:
+
+    python scripts/generate_syllable_table.py cmudict.dict LICENSE
+"""
+from __future__ import absolute_import
+
+import argparse
+import gzip
+import re
+
+OUTPUT_FILE = "src/smjsindustry/finance/syllables.txt.gz"
+_WORD_PATTERN = re.compile(r"^[a-z]+$")
+
+
+def _read_syllables(dictionary_path):
+    """Reads the syllables of the first pronunciation of every word of ASCII letters."""
+    syllables = {}
+    with open(dictionary_path, encoding="utf-8") as dictionary_file:
+        for line in dictionary_file:
+            word, *phones = line.split("#")[0].split()
+            # The alternative pronunciations are listed as "word(2)" after the first one,
+            # and interjections such as "hmm" have no vowel.
+            count = sum(phone[-1].isdigit() for phone in phones)
+            if _WORD_PATTERN.match(word) and word not in syllables and count > 0:
+                syllables[word] = count
+    return syllables
+
+
+def main():
+    """Writes the gzipped table of ``word syllables`` lines, after the license header."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("dictionary", help="the cmudict.dict file")
+    parser.add_argument("license", help="the LICENSE file of the dictionary")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+    syllables = _read_syllables(args.dictionary)
+    with open(args.license, encoding="utf-8") as license_file:
+        header = ["# Generated from the CMU Pronouncing Dictionary.", "#"]
+        header += [
+            "# " + line if line.strip() else "#" for line in license_file.read().splitlines()
+        ]
+    # A fixed mtime keeps the output identical between runs.
+    with gzip.GzipFile(args.output, "wb", mtime=0) as output_file:
+        lines = header + ["{} {}".format(word, syllables[word]) for word in sorted(syllables)]
+        output_file.write(("\n".join(lines) + "\n").encode("utf-8"))
+    print("Wrote {} words to {}".format(len(syllables), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -39,7 +39,9 @@ required_packages = [
 
 
 # Specific use case dependencies
-extras = {}
+extras = {
+    "local": ["scipy>=1.5.0"],
+}
 # Meta dependency groups
 extras["all"] = [item for group in extras.values() for item in group]
 # Tests specific dependencies (do not need to be included in 'all')
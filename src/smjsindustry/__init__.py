@@ -21,4 +21,10 @@ from smjsindustry.finance.processor_config import (  # noqa: F401
     KMedoidsSummarizerConfig,
     NLPScorerConfig,
 )
-from smjsindustry.finance.build_tabText import build_tabText  # noqa: F401
+from smjsindustry.finance.build_tabText import build_tabText, build_tabText_chunked  # noqa: F401
+from smjsindustry.finance.local_summarizer import (  # noqa: F401
+    JaccardSummarizer,
+    KMedoidsSummarizer,
+    LocalSummarizer,
+)
+from smjsindustry.finance.local_nlp_scorer import LocalNLPScorer  # noqa: F401
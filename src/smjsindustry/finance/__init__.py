@@ -27,4 +27,22 @@ from smjsindustry.finance.processor_config import (  # noqa: F401
     NLPScorerConfig,
     EDGARDataSetConfig,
 )
-from smjsindustry.finance.build_tabText import build_tabText  # noqa: F401
+from smjsindustry.finance.build_tabText import build_tabText, build_tabText_chunked  # noqa: F401
+from smjsindustry.finance.local_summarizer import (  # noqa: F401
+    JaccardSummarizer,
+    KMedoidsSummarizer,
+    LocalSummarizer,
+)
+from smjsindustry.finance.local_nlp_scorer import (  # noqa: F401
+    LocalNLPScorer,
+    WordListIndex,
+    word_list_index,
+)
+from smjsindustry.finance.embedding import (  # noqa: F401
+    SentenceEmbedding,
+    HashingEmbedding,
+    TfidfSvdEmbedding,
+    Doc2VecEmbedding,
+    CachedEmbedding,
+)
+from smjsindustry.finance.sec_parser import LocalSECFilingParser, iter_submission  # noqa: F401
@@ -13,11 +13,23 @@
 """The module that builds a TabText dataframe."""
 from __future__ import absolute_import
 
+import os
+import pickle
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
-from smjsindustry.finance.utils import get_freq_label
+from smjsindustry.finance.utils import get_freq_labels, get_freq_start_dates
 
 
 JUMPSTART_NORMALIZED_DATE = "jumpstart-normalized-date"
+_LEFT_POSITION = "jumpstart-left-position"
+_RIGHT_POSITION = "jumpstart-right-position"
+_SCHEMA_SAMPLE_ROWS = 1000
+_PART_FILE_PATTERN = re.compile(r"^part-\d+\.parquet$")
+ASOF_DIRECTIONS = ["backward", "forward", "nearest"]
 
 
 def build_tabText(
@@ -29,6 +41,11 @@ def build_tabText(
     text_date_column: str,
     how: str = "inner",
     freq: str = "Q",
+    low_memory: bool = False,
+    direction: str = None,
+    tolerance: Union[str, pd.Timedelta] = None,
+    n_jobs: int = 1,
+    preserve_order: bool = False,
 ) -> pd.DataFrame:
     """Builds a TabText dataframe by joining the columns in the tabular and text dataframes.
 
@@ -38,6 +55,20 @@ def build_tabText(
     according to the given frequency, the two dataframes can be merged using
     the key column and the normalized date column.
 
+    The normalized dates are computed as separate join keys, so neither input
+    dataframe is modified and the same dataframes can be shared between threads.
+
+    If ``direction`` is specified, an as-of join is performed instead: each tabular row
+    is joined with the text row of the same key whose date is the closest in the given
+    direction, even when the two dates fall in different ``freq`` periods. The dates
+    are first bucketed to the start of their ``freq`` period; use ``freq='D'`` to
+    match on the exact dates.
+
+    If ``n_jobs`` is not 1, both dataframes are hash-partitioned on their key column and
+    the dates of each partition are normalized and joined in a separate process. Only
+    the key and date columns are sent to the worker processes; the output columns are
+    gathered once from the joined row positions, as with ``low_memory=True``.
+
     Args:
         tabular_df (pandas.DataFrame): The tabular dataframe to be joined, requiring a date column.
         tabular_key (str): The tabular dataframe's key column to be joined on.
@@ -52,31 +83,673 @@ def build_tabText(
         freq (str): Specify how the date field should be joined,
             by year, quarter, month, week or day. Possible values:
             ``{'Y', 'Q', 'M', 'W', 'D'}`` (default: ``'Q'``).
+        low_memory (bool): Whether to join only the key columns first and then gather
+            every output column exactly once, instead of merging the full dataframes.
+            This avoids intermediate copies of large text columns (default: ``False``).
+        direction (str): Performs an as-of join that selects, for each tabular row,
+            the last text row dated on or before it (``'backward'``), the first text row
+            dated on or after it (``'forward'``), or the closest one (``'nearest'``).
+            Only ``how='left'`` and ``how='inner'`` are supported (default: None).
+        tolerance (Union[str, pandas.Timedelta]): The maximum distance between the
+            dates of the joined rows in an as-of join, for example ``'7D'`` (default: None).
+        n_jobs (int): The number of processes that join the partitions of the dataframes,
+            or -1 to use all CPU cores (default: 1, which joins in the current process).
+        preserve_order (bool): Whether a parallel join returns the rows in the same order
+            as the serial join. Otherwise the rows are grouped by partition (default: False).
 
     Returns:
         pandas.DataFrame: The joined dataframe object.
     """
+    if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise ValueError("n_jobs needs to be a positive integer or -1")
+    is_asof = direction is not None or tolerance is not None
+    if is_asof:
+        if direction not in ASOF_DIRECTIONS:
+            raise ValueError(
+                "direction needs to be one of {} for an as-of join".format(ASOF_DIRECTIONS)
+            )
+        if how not in ("left", "inner"):
+            raise ValueError("An as-of join only supports how='left' or how='inner'")
+        if not (tabular_date_column and text_date_column):
+            raise ValueError("An as-of join requires both tabular and text date columns")
+    if n_jobs != 1:
+        left_indexer, right_indexer, keys = _parallel_join_indexers(
+            tabular_df[tabular_key],
+            tabular_df[tabular_date_column] if tabular_date_column and text_date_column else None,
+            text_df[text_key],
+            text_df[text_date_column] if tabular_date_column and text_date_column else None,
+            how,
+            freq,
+            direction,
+            tolerance,
+            os.cpu_count() if n_jobs == -1 else n_jobs,
+            preserve_order,
+        )
+        return _take_joined(
+            tabular_df, tabular_key, left_indexer, text_df, text_key, right_indexer, keys
+        )
+    if is_asof:
+        left_indexer, right_indexer, keys = _asof_join_indexers(
+            tabular_df[tabular_key],
+            get_freq_start_dates(tabular_df[tabular_date_column], freq).to_numpy(),
+            text_df[text_key],
+            get_freq_start_dates(text_df[text_date_column], freq).to_numpy(),
+            how,
+            direction,
+            tolerance,
+        )
+        return _take_joined(
+            tabular_df, tabular_key, left_indexer, text_df, text_key, right_indexer, keys
+        )
     if tabular_date_column and text_date_column:
-        tabular_df[JUMPSTART_NORMALIZED_DATE] = tabular_df[tabular_date_column]
-        for i in range(len(tabular_df)):
-            date_value = tabular_df.loc[i, tabular_date_column]
-            freq_label = get_freq_label(date_value, freq)
-            tabular_df.loc[i, JUMPSTART_NORMALIZED_DATE] = freq_label
-        text_df[JUMPSTART_NORMALIZED_DATE] = text_df[text_date_column]
-        for i in range(len(text_df)):
-            date_value = text_df.loc[i, text_date_column]
-            freq_label = get_freq_label(date_value, freq)
-            text_df.loc[i, JUMPSTART_NORMALIZED_DATE] = freq_label
+        tabular_labels = get_freq_labels(tabular_df[tabular_date_column], freq).to_numpy()
+        text_labels = get_freq_labels(text_df[text_date_column], freq).to_numpy()
+        if low_memory:
+            left_indexer, right_indexer, keys = _join_indexers(
+                tabular_df[tabular_key], tabular_labels, text_df[text_key], text_labels, how
+            )
+            return _take_joined(
+                tabular_df, tabular_key, left_indexer, text_df, text_key, right_indexer, keys
+            )
+        label_column = _unused_column_name(tabular_df, text_df)
         joined = pd.merge(
-            tabular_df,
-            text_df,
-            left_on=[tabular_key, JUMPSTART_NORMALIZED_DATE],
-            right_on=[text_key, JUMPSTART_NORMALIZED_DATE],
+            tabular_df.assign(**{label_column: tabular_labels}),
+            text_df.assign(**{label_column: text_labels}),
+            left_on=[tabular_key, label_column],
+            right_on=[text_key, label_column],
             how=how,
         )
-        tabular_df.drop(columns=[JUMPSTART_NORMALIZED_DATE], inplace=True)
-        text_df.drop(columns=[JUMPSTART_NORMALIZED_DATE], inplace=True)
-        joined.drop(columns=[JUMPSTART_NORMALIZED_DATE], inplace=True)
+        del joined[label_column]
     else:
         joined = pd.merge(tabular_df, text_df, left_on=tabular_key, right_on=text_key, how=how)
     return joined
+
+
+def build_tabText_chunked(
+    tabular_df: pd.DataFrame,
+    tabular_key: str,
+    tabular_date_column: str,
+    text: Union[str, Iterable[pd.DataFrame]],
+    text_key: str,
+    text_date_column: str,
+    output_path: str,
+    how: str = "inner",
+    freq: str = "Q",
+    num_partitions: int = 64,
+    chunksize: int = 100000,
+    temp_dir: str = None,
+) -> int:
+    """Builds a TabText dataset from text data that does not fit in memory.
+
+    It joins like :func:`build_tabText`, but reads the text data in chunks.
+    The rows of both sides are hash-partitioned on their key and normalized date,
+    the text partitions are spilled to local disk, and the partitions are then
+    joined and written to ``output_path`` one at a time. Peak memory is bounded by
+    the tabular dataframe, one chunk and one text partition, so ``num_partitions``
+    should grow with the size of the text data.
+
+    Without a date column on both sides, the rows are partitioned and joined on
+    their key alone, as :func:`build_tabText` does.
+
+    The joined rows are grouped by partition, so their order differs from
+    the order of :func:`build_tabText`.
+
+    Args:
+        tabular_df (pandas.DataFrame): The tabular dataframe to be joined, requiring a date column.
+        tabular_key (str): The tabular dataframe's key column to be joined on.
+        tabular_date_column (str): The tabular dataframe's date column to be joined on,
+            in a format of ``"yyyy-mm-dd"``, ``"yyyy-mm"``, or ``"yyyy"``.
+        text (Union[str, Iterable[pandas.DataFrame]]): The text data to be joined, either
+            a path to a CSV or Parquet file, or an iterable of dataframe chunks.
+        text_key (str): The text data's key column to be joined on.
+        text_date_column (str): The text data's date column to be joined on,
+            in a format of ``"yyyy-mm-dd"``, ``"yyyy-mm"``, or ``"yyyy"``.
+        output_path (str): A ``.csv`` file the joined rows are appended to, or
+            a directory the joined partitions are written to as Parquet files. The part
+            files of an earlier run in the directory are removed.
+        how (str): The type of join to be performed; possible values:
+            ``{'left', 'right', 'outer', 'inner'}`` (default: ``'inner'``).
+        freq (str): Specify how the date field should be joined,
+            by year, quarter, month, week or day. Possible values:
+            ``{'Y', 'Q', 'M', 'W', 'D'}`` (default: ``'Q'``).
+        num_partitions (int): The number of hash partitions (default: 64).
+        chunksize (int): The number of rows per chunk read from a text file (default: 100000).
+        temp_dir (str): The directory for the spilled partitions (default: None, which
+            uses the system's temporary directory).
+
+    Returns:
+        int: The number of joined rows written.
+    """
+    if not isinstance(num_partitions, int) or num_partitions <= 0:
+        raise ValueError("num_partitions needs to be a positive integer")
+    if not (tabular_date_column and text_date_column):
+        tabular_date_column = text_date_column = None
+    tabular_partitions = pd.Series(
+        _hash_partitions(
+            tabular_df[tabular_key],
+            _freq_labels_or_none(tabular_df, tabular_date_column, freq),
+            num_partitions,
+        )
+    )
+    tabular_positions = tabular_partitions.groupby(tabular_partitions).indices
+    rows_written = 0
+    with tempfile.TemporaryDirectory(dir=temp_dir) as spill_dir:
+        spill_paths = [
+            os.path.join(spill_dir, "partition-{}.pkl".format(partition))
+            for partition in range(num_partitions)
+        ]
+        empty_text_df = pd.DataFrame(columns=[c for c in (text_key, text_date_column) if c])
+        sample_text_df = None
+        for chunk in _read_text_chunks(text, text_date_column, chunksize):
+            empty_text_df = chunk.iloc[:0]
+            if sample_text_df is None and len(chunk) > 0:
+                sample_text_df = chunk.head(_SCHEMA_SAMPLE_ROWS)
+            partitions = _hash_partitions(
+                chunk[text_key], _freq_labels_or_none(chunk, text_date_column, freq), num_partitions
+            )
+            for partition, rows in chunk.groupby(partitions, sort=False):
+                with open(spill_paths[partition], "ab") as spill_file:
+                    pickle.dump(rows, spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+        # An outer join of samples of both sides has the columns of every partition,
+        # with the dtypes that missing matches give them.
+        template = build_tabText(
+            tabular_df.head(_SCHEMA_SAMPLE_ROWS),
+            tabular_key,
+            tabular_date_column,
+            empty_text_df if sample_text_df is None else sample_text_df,
+            text_key,
+            text_date_column,
+            how="outer",
+            freq=freq,
+            low_memory=True,
+        )
+        writer = _JoinedWriter(output_path, template)
+        for partition in range(num_partitions):
+            tabular_part = tabular_df.take(
+                tabular_positions.get(partition, np.array([], dtype=np.intp))
+            )
+            text_part = _read_spilled(spill_paths[partition], empty_text_df)
+            if _is_empty_join(len(tabular_part), len(text_part), how):
+                continue
+            joined = build_tabText(
+                tabular_part,
+                tabular_key,
+                tabular_date_column,
+                text_part,
+                text_key,
+                text_date_column,
+                how=how,
+                freq=freq,
+                low_memory=True,
+            )
+            writer.write(joined)
+            rows_written += len(joined)
+    return rows_written
+
+
+def _unused_column_name(*dfs: pd.DataFrame) -> str:
+    """Finds a column name that none of the dataframes uses, for a temporary join column."""
+    columns = set().union(*(df.columns for df in dfs))
+    name = JUMPSTART_NORMALIZED_DATE
+    while name in columns:
+        name = "_" + name
+    return name
+
+
+def _freq_labels_or_none(
+    df: pd.DataFrame, date_column: Optional[str], freq: str
+) -> Optional[pd.Series]:
+    """Gets the frequency labels of a date column, or None for a join on the key alone."""
+    return get_freq_labels(df[date_column], freq) if date_column else None
+
+
+def _read_text_chunks(
+    text: Union[str, Iterable[pd.DataFrame]], text_date_column: str, chunksize: int
+) -> Iterator[pd.DataFrame]:
+    """Reads the text data in chunks from a CSV or Parquet file, or an iterable.
+
+    Args:
+        text (Union[str, Iterable[pandas.DataFrame]]): The path or the dataframe chunks.
+        text_date_column (str): The date column, which is read from a CSV file as strings,
+            or None.
+        chunksize (int): The number of rows per chunk read from a file.
+
+    Returns:
+        Iterator[pandas.DataFrame]: The text dataframe chunks.
+    """
+    if not isinstance(text, str):
+        return iter(text)
+    if text.endswith(".parquet"):
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        batches = pq.ParquetFile(text).iter_batches(batch_size=chunksize)
+        return (batch.to_pandas() for batch in batches)
+    dtype = {text_date_column: str} if text_date_column else None
+    return pd.read_csv(text, chunksize=chunksize, dtype=dtype)
+
+
+def _hash_partitions(
+    keys: pd.Series, labels: Optional[pd.Series], num_partitions: int
+) -> np.ndarray:
+    """Assigns rows to hash partitions on their key and normalized date.
+
+    The keys are hashed as strings, so a key read with different dtypes from different
+    chunks is assigned to the same partition.
+
+    Args:
+        keys (pandas.Series): The key column.
+        labels (pandas.Series): The normalized date column, or None to partition on the key.
+        num_partitions (int): The number of partitions.
+
+    Returns:
+        numpy.ndarray: The partition of every row.
+    """
+    columns = {"key": keys.astype(str).to_numpy()}
+    if labels is not None:
+        columns["date"] = labels.to_numpy()
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(columns), index=False)
+    return (hashes.to_numpy() % np.uint64(num_partitions)).astype(np.intp)
+
+
+def _read_spilled(path: str, empty_df: pd.DataFrame) -> pd.DataFrame:
+    """Reads the chunks spilled to a partition file back into one dataframe.
+
+    Args:
+        path (str): The partition file.
+        empty_df (pandas.DataFrame): An empty dataframe with the text columns, returned
+            when nothing was spilled to the partition.
+
+    Returns:
+        pandas.DataFrame: The text rows of the partition.
+    """
+    if not os.path.exists(path):
+        return empty_df
+    chunks = []
+    with open(path, "rb") as spill_file:
+        while True:
+            try:
+                chunks.append(pickle.load(spill_file))
+            except EOFError:
+                break
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _is_empty_join(tabular_rows: int, text_rows: int, how: str) -> bool:
+    """Checks whether joining a partition cannot produce any rows."""
+    if how == "inner":
+        return tabular_rows == 0 or text_rows == 0
+    if how == "left":
+        return tabular_rows == 0
+    if how == "right":
+        return text_rows == 0
+    return tabular_rows == 0 and text_rows == 0
+
+
+class _JoinedWriter:
+    """Writes joined partitions incrementally to a CSV file or a directory of Parquet files.
+
+    The Parquet files share one schema, taken from a template of the joined rows, so that
+    the directory can be read back as a dataset even where a partition has no matches and
+    its columns are all missing. Columns that are missing in the template too are written
+    as strings.
+
+    Args:
+        output_path (str): A ``.csv`` file or a directory for Parquet files.
+        template (pandas.DataFrame): Joined rows with the columns and dtypes of every partition.
+
+    """
+
+    def __init__(self, output_path: str, template: pd.DataFrame):
+        """Initializes a ``_JoinedWriter`` and creates or truncates the output."""
+        self._output_path = output_path
+        self._is_csv = output_path.endswith(".csv")
+        self._parts_written = 0
+        if self._is_csv:
+            open(output_path, "w").close()
+            return
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        os.makedirs(output_path, exist_ok=True)
+        for file_name in os.listdir(output_path):
+            if _PART_FILE_PATTERN.match(file_name):
+                os.remove(os.path.join(output_path, file_name))
+        schema = pa.Schema.from_pandas(template, preserve_index=False)
+        for index, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                schema = schema.set(index, field.with_type(pa.string()))
+        self._schema = schema
+
+    def write(self, joined: pd.DataFrame):
+        """Appends a joined partition to the output."""
+        if self._is_csv:
+            joined.to_csv(self._output_path, mode="a", header=self._parts_written == 0, index=False)
+        else:
+            import pyarrow as pa  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+            pq.write_table(
+                pa.Table.from_pandas(joined, schema=self._schema, preserve_index=False),
+                os.path.join(self._output_path, "part-{:05d}.parquet".format(self._parts_written)),
+            )
+        self._parts_written += 1
+
+
+def _parallel_join_indexers(
+    tabular_keys: pd.Series,
+    tabular_dates: Optional[pd.Series],
+    text_keys: pd.Series,
+    text_dates: Optional[pd.Series],
+    how: str,
+    freq: str,
+    direction: Optional[str],
+    tolerance: Union[str, pd.Timedelta],
+    n_jobs: int,
+    preserve_order: bool,
+) -> Tuple[np.ndarray, np.ndarray, pd.Series]:
+    """Joins the key and date columns partition by partition in a pool of processes.
+
+    Both sides are hash-partitioned on their key column, so all the rows of a key are
+    joined by the same process. Each process returns the row positions of its joined
+    rows in the full dataframes, which are concatenated without touching the other columns.
+
+    Args:
+        tabular_keys (pandas.Series): The tabular dataframe's key column.
+        tabular_dates (pandas.Series): The tabular dataframe's date column, or None to
+            join on the key column only.
+        text_keys (pandas.Series): The text dataframe's key column.
+        text_dates (pandas.Series): The text dataframe's date column, or None to
+            join on the key column only.
+        how (str): The type of join to be performed.
+        freq (str): The frequency the dates are normalized to.
+        direction (str): The direction of an as-of join, or None for an exact join.
+        tolerance (Union[str, pandas.Timedelta]): The tolerance of an as-of join.
+        n_jobs (int): The number of processes and partitions.
+        preserve_order (bool): Whether to sort the joined rows in the order of the serial join.
+
+    Returns:
+        tuple: The tabular and text row positions of every joined row, ``-1`` where
+        a side has no matching row, and the joined key column.
+    """
+    tabular_partitions = _split_by_key(tabular_keys, n_jobs)
+    text_partitions = _split_by_key(text_keys, n_jobs)
+    tasks = []
+    for tabular_positions, text_positions in zip(tabular_partitions, text_partitions):
+        tasks.append(
+            (
+                tabular_keys.iloc[tabular_positions],
+                None if tabular_dates is None else tabular_dates.iloc[tabular_positions],
+                tabular_positions,
+                text_keys.iloc[text_positions],
+                None if text_dates is None else text_dates.iloc[text_positions],
+                text_positions,
+                len(tabular_keys),
+                how,
+                freq,
+                direction,
+                tolerance,
+            )
+        )
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        results = list(executor.map(_join_partition, *zip(*tasks)))
+    left_indexers, right_indexers, keys, order_keys = zip(*results)
+    left_indexer = np.concatenate(left_indexers)
+    right_indexer = np.concatenate(right_indexers)
+    keys = pd.concat(keys, ignore_index=True)
+    if preserve_order:
+        order = np.lexsort((right_indexer, left_indexer, np.concatenate(order_keys)))
+        left_indexer = left_indexer[order]
+        right_indexer = right_indexer[order]
+        keys = keys.take(order).reset_index(drop=True)
+    return left_indexer, right_indexer, keys
+
+
+def _split_by_key(keys: pd.Series, num_partitions: int) -> list:
+    """Splits the row positions of a dataframe into hash partitions on its key column.
+
+    Args:
+        keys (pandas.Series): The key column.
+        num_partitions (int): The number of partitions.
+
+    Returns:
+        list: The ascending row positions of every partition.
+    """
+    hashes = pd.util.hash_pandas_object(keys.astype(str), index=False).to_numpy()
+    partitions = (hashes % np.uint64(num_partitions)).astype(np.intp)
+    positions = np.argsort(partitions, kind="stable")
+    bounds = np.searchsorted(partitions[positions], np.arange(num_partitions + 1))
+    return [positions[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _join_partition(
+    tabular_keys: pd.Series,
+    tabular_dates: Optional[pd.Series],
+    tabular_positions: np.ndarray,
+    text_keys: pd.Series,
+    text_dates: Optional[pd.Series],
+    text_positions: np.ndarray,
+    num_tabular_rows: int,
+    how: str,
+    freq: str,
+    direction: Optional[str],
+    tolerance: Union[str, pd.Timedelta],
+) -> Tuple[np.ndarray, np.ndarray, pd.Series, np.ndarray]:
+    """Joins one partition of the key and date columns in a worker process.
+
+    Besides the joined row positions, it returns the sort key that orders the rows of
+    the partition as the serial join does. :func:`pandas.merge` emits an inner or outer
+    join grouped by the first appearance of each key in the tabular rows and then
+    the text rows, a left or an as-of join in the order of the tabular rows, and
+    a right join in the order of the text rows.
+
+    Args:
+        tabular_keys (pandas.Series): The partition's tabular keys.
+        tabular_dates (pandas.Series): The partition's tabular dates, or None.
+        tabular_positions (numpy.ndarray): The positions of the partition's tabular rows.
+        text_keys (pandas.Series): The partition's text keys.
+        text_dates (pandas.Series): The partition's text dates, or None.
+        text_positions (numpy.ndarray): The positions of the partition's text rows.
+        num_tabular_rows (int): The number of rows of the full tabular dataframe.
+        how (str): The type of join to be performed.
+        freq (str): The frequency the dates are normalized to.
+        direction (str): The direction of an as-of join, or None for an exact join.
+        tolerance (Union[str, pandas.Timedelta]): The tolerance of an as-of join.
+
+    Returns:
+        tuple: The tabular and text row positions of every joined row in the full
+        dataframes, the joined key column and the sort key of every joined row.
+    """
+    if direction is not None or tolerance is not None:
+        left_indexer, right_indexer, keys = _asof_join_indexers(
+            tabular_keys,
+            get_freq_start_dates(tabular_dates, freq).to_numpy(),
+            text_keys,
+            get_freq_start_dates(text_dates, freq).to_numpy(),
+            how,
+            direction,
+            tolerance,
+        )
+        order_key = _to_positions(left_indexer, tabular_positions)
+    else:
+        if tabular_dates is None:
+            tabular_labels = np.zeros(len(tabular_keys), dtype=np.int8)
+            text_labels = np.zeros(len(text_keys), dtype=np.int8)
+        else:
+            tabular_labels = get_freq_labels(tabular_dates, freq).to_numpy()
+            text_labels = get_freq_labels(text_dates, freq).to_numpy()
+        left_indexer, right_indexer, keys = _join_indexers(
+            tabular_keys, tabular_labels, text_keys, text_labels, how
+        )
+        if how == "left":
+            order_key = _to_positions(left_indexer, tabular_positions)
+        elif how == "right":
+            order_key = _to_positions(right_indexer, text_positions)
+        else:
+            tabular_first = _first_positions(tabular_keys, tabular_labels, tabular_positions)
+            text_first = _first_positions(text_keys, text_labels, text_positions)
+            order_key = np.where(
+                left_indexer >= 0,
+                _to_positions(left_indexer, tabular_first),
+                num_tabular_rows + _to_positions(right_indexer, text_first),
+            )
+    return (
+        _to_positions(left_indexer, tabular_positions),
+        _to_positions(right_indexer, text_positions),
+        keys.reset_index(drop=True),
+        order_key,
+    )
+
+
+def _first_positions(keys: pd.Series, labels: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Returns, for every row, the first position of the rows with the same key and date."""
+    return (
+        pd.Series(positions)
+        .groupby([keys.to_numpy(), labels], sort=False, dropna=False)
+        .transform("min")
+        .to_numpy()
+    )
+
+
+def _to_positions(indexer: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Maps an indexer into a partition to positions, keeping ``-1`` for missing rows."""
+    mapped = np.full(len(indexer), -1, dtype=np.intp)
+    found = indexer >= 0
+    mapped[found] = positions[indexer[found]]
+    return mapped
+
+
+def _join_indexers(
+    tabular_keys: pd.Series,
+    tabular_labels: np.ndarray,
+    text_keys: pd.Series,
+    text_labels: np.ndarray,
+    how: str,
+) -> Tuple[np.ndarray, np.ndarray, pd.Series]:
+    """Joins the key columns only and returns the matching row positions of both sides.
+
+    Args:
+        tabular_keys (pandas.Series): The tabular dataframe's key column.
+        tabular_labels (numpy.ndarray): The tabular dataframe's normalized dates.
+        text_keys (pandas.Series): The text dataframe's key column.
+        text_labels (numpy.ndarray): The text dataframe's normalized dates.
+        how (str): The type of join to be performed.
+
+    Returns:
+        tuple: The tabular and text row positions of every joined row, ``-1`` where
+        a side has no matching row, and the joined key column.
+    """
+    left = pd.DataFrame(
+        {
+            tabular_keys.name: tabular_keys.to_numpy(),
+            JUMPSTART_NORMALIZED_DATE: tabular_labels,
+            _LEFT_POSITION: np.arange(len(tabular_labels)),
+        }
+    )
+    right = pd.DataFrame(
+        {
+            tabular_keys.name: text_keys.to_numpy(),
+            JUMPSTART_NORMALIZED_DATE: text_labels,
+            _RIGHT_POSITION: np.arange(len(text_labels)),
+        }
+    )
+    positions = pd.merge(left, right, on=[tabular_keys.name, JUMPSTART_NORMALIZED_DATE], how=how)
+    left_indexer = positions[_LEFT_POSITION].fillna(-1).to_numpy(dtype=np.intp)
+    right_indexer = positions[_RIGHT_POSITION].fillna(-1).to_numpy(dtype=np.intp)
+    return left_indexer, right_indexer, positions[tabular_keys.name]
+
+
+def _asof_join_indexers(
+    tabular_keys: pd.Series,
+    tabular_dates: np.ndarray,
+    text_keys: pd.Series,
+    text_dates: np.ndarray,
+    how: str,
+    direction: str,
+    tolerance: Union[str, pd.Timedelta],
+) -> Tuple[np.ndarray, np.ndarray, pd.Series]:
+    """Joins the key and date columns as of the dates and returns the matching row positions.
+
+    Both sides are sorted by date once and matched per key with :func:`pandas.merge_asof`,
+    so the cost is linear in the number of rows after the sort.
+
+    Args:
+        tabular_keys (pandas.Series): The tabular dataframe's key column.
+        tabular_dates (numpy.ndarray): The tabular dataframe's bucketed dates.
+        text_keys (pandas.Series): The text dataframe's key column.
+        text_dates (numpy.ndarray): The text dataframe's bucketed dates.
+        how (str): The type of join to be performed, ``'left'`` or ``'inner'``.
+        direction (str): Whether to search for prior, subsequent, or closest matches.
+        tolerance (Union[str, pandas.Timedelta]): The maximum distance between the
+            dates of the joined rows.
+
+    Returns:
+        tuple: The tabular and text row positions of every joined row, in the order of
+        the tabular rows and ``-1`` where a tabular row has no match, and the joined
+        key column.
+    """
+    left = pd.DataFrame(
+        {
+            tabular_keys.name: tabular_keys.to_numpy(),
+            JUMPSTART_NORMALIZED_DATE: tabular_dates,
+            _LEFT_POSITION: np.arange(len(tabular_dates)),
+        }
+    ).sort_values(JUMPSTART_NORMALIZED_DATE, kind="mergesort")
+    right = pd.DataFrame(
+        {
+            tabular_keys.name: text_keys.to_numpy(),
+            JUMPSTART_NORMALIZED_DATE: text_dates,
+            _RIGHT_POSITION: np.arange(len(text_dates)),
+        }
+    ).sort_values(JUMPSTART_NORMALIZED_DATE, kind="mergesort")
+    positions = pd.merge_asof(
+        left,
+        right,
+        on=JUMPSTART_NORMALIZED_DATE,
+        by=tabular_keys.name,
+        direction=direction,
+        tolerance=pd.Timedelta(tolerance) if tolerance is not None else None,
+    ).sort_values(_LEFT_POSITION, kind="mergesort")
+    if how == "inner":
+        positions = positions[positions[_RIGHT_POSITION].notna()]
+    left_indexer = positions[_LEFT_POSITION].to_numpy(dtype=np.intp)
+    right_indexer = positions[_RIGHT_POSITION].fillna(-1).to_numpy(dtype=np.intp)
+    return left_indexer, right_indexer, positions[tabular_keys.name]
+
+
+def _take_joined(
+    tabular_df: pd.DataFrame,
+    tabular_key: str,
+    left_indexer: np.ndarray,
+    text_df: pd.DataFrame,
+    text_key: str,
+    right_indexer: np.ndarray,
+    keys: pd.Series,
+) -> pd.DataFrame:
+    """Gathers the joined dataframe column by column from the row positions of both sides.
+
+    The columns are named as :func:`pandas.merge` names them: overlapping columns get
+    the ``_x`` and ``_y`` suffixes, and a key column shared by both sides appears once.
+
+    Args:
+        tabular_df (pandas.DataFrame): The tabular dataframe.
+        tabular_key (str): The tabular dataframe's key column.
+        left_indexer (numpy.ndarray): The tabular row position of every joined row.
+        text_df (pandas.DataFrame): The text dataframe.
+        text_key (str): The text dataframe's key column.
+        right_indexer (numpy.ndarray): The text row position of every joined row.
+        keys (pandas.Series): The joined key column.
+
+    Returns:
+        pandas.DataFrame: The joined dataframe object.
+    """
+    shared_key = tabular_key if tabular_key == text_key else None
+    overlap = (set(tabular_df.columns) & set(text_df.columns)) - {shared_key}
+    columns = {}
+    for df, indexer, suffix in ((tabular_df, left_indexer, "_x"), (text_df, right_indexer, "_y")):
+        for column in df.columns:
+            if column == shared_key:
+                if suffix == "_x":
+                    columns[column] = keys.to_numpy()
+                continue
+            name = "{}{}".format(column, suffix) if column in overlap else column
+            columns[name] = pd.api.extensions.take(df[column].array, indexer, allow_fill=True)
+    return pd.DataFrame(columns, copy=False)
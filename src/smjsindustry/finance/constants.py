@@ -42,6 +42,16 @@ SUPPORTED_SEC_FORMS = [
 KMEDOIDS_SUMMARIZER_METRIC_VALUES = ["euclidean", "cosine", "dot-product"]
 KMEDOIDS_SUMMARIZER_INIT_VALUES = ["random", "heuristic", "k-medoids++", "build"]
 IMAGE_CONFIG_FILE = "image_uri.json"
+SYLLABLE_TABLE_FILE = "syllables.txt.gz"
 REPOSITORY = "jumpstart-gecko"
 ECR_URI_TEMPLATE = "{account_id}.dkr.ecr.{region}.amazonaws.com/{repository}"
 CONTAINER_IMAGE_VERSION = "1.0.0"
+FREQ_LABEL_CACHE_SIZE = 65536
+STEM_CACHE_SIZE = 65536
+JACCARD_BLOCK_SIZE = 1024
+MINHASH_MAX_BUCKET_SIZE = 64
+KMEDOIDS_MAX_ITERATIONS = 300
+EMBEDDING_CACHE_CAPACITY = 100000
+NLP_SCORER_CHUNK_SIZE = 1000
+WORD_ROWS_CACHE_SIZE = 1048576
+SEC_PARSER_BATCH_SIZE = 1000
@@ -0,0 +1,415 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""The sentence embedding module of the local SageMaker JumpStart Industry summarizer.
+
+The following classes embed the tokenized sentences of a document for the local
+:class:`~smjsindustry.finance.local_summarizer.KMedoidsSummarizer`.
+"""
+from __future__ import absolute_import
+
+import contextlib
+import hashlib
+import os
+import zlib
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+from smjsindustry.finance.constants import EMBEDDING_CACHE_CAPACITY
+from smjsindustry.finance.utils import import_sparse
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class SentenceEmbedding(ABC):
+    """The interface of the sentence embedding backends of the local k-medoids summarizer.
+
+    The ``cacheable`` class attribute tells whether the vector of a sentence only depends
+    on its tokens, and not on the other sentences of its document, so that it can be
+    cached across documents by :class:`CachedEmbedding`.
+
+    Args:
+        vector_size (int): The embedding dimensions.
+
+    """
+
+    cacheable = False
+
+    def __init__(self, vector_size: int):
+        """Initializes a sentence embedding backend."""
+        if not isinstance(vector_size, int) or vector_size <= 0:
+            raise ValueError("vector_size needs to be a positive integer")
+        self._vector_size = vector_size
+
+    @property
+    def vector_size(self) -> int:
+        """Gets the value of the ``vector_size`` parameter."""
+        return self._vector_size
+
+    @abstractmethod
+    def embed(self, token_lists: List[List[str]]) -> np.ndarray:
+        """Embeds the sentences of a document.
+
+        Args:
+            token_lists (List[List[str]]): The tokens of every sentence.
+
+        Returns:
+            numpy.ndarray: A ``(sentences, vector_size)`` array of sentence vectors.
+        """
+        return None
+
+
+class HashingEmbedding(SentenceEmbedding):
+    """Embeds sentences with the hashing trick, without fitting anything to the document.
+
+    Every token is hashed to one of ``vector_size`` dimensions with a random sign, and
+    the vector of a sentence is the L2-normalized sum of its tokens. It is the fastest
+    backend and gives the same vector to the same sentence in every document.
+
+    Args:
+        vector_size (int): The embedding dimensions.
+
+    """
+
+    cacheable = True
+
+    def embed(self, token_lists: List[List[str]]) -> np.ndarray:
+        """Embeds the sentences of a document.
+
+        Args:
+            token_lists (List[List[str]]): The tokens of every sentence.
+
+        Returns:
+            numpy.ndarray: A ``(sentences, vector_size)`` array of sentence vectors.
+        """
+        vectors = np.zeros((len(token_lists), self._vector_size))
+        for row, tokens in enumerate(token_lists):
+            for token in tokens:
+                token_hash = zlib.crc32(token.encode("utf-8"))
+                sign = 1.0 if token_hash & 0x80000000 else -1.0
+                vectors[row, token_hash % self._vector_size] += sign
+        return _normalize(vectors)
+
+
+class TfidfSvdEmbedding(SentenceEmbedding):
+    """Embeds sentences with a truncated SVD of the TF-IDF matrix of their document.
+
+    This is latent semantic analysis fitted to a single document. The vectors are
+    L2-normalized, and have fewer than ``vector_size`` dimensions when the document
+    has fewer sentences or distinct tokens.
+
+    Args:
+        vector_size (int): The maximum embedding dimensions.
+
+    """
+
+    def embed(self, token_lists: List[List[str]]) -> np.ndarray:
+        """Embeds the sentences of a document.
+
+        Args:
+            token_lists (List[List[str]]): The tokens of every sentence.
+
+        Returns:
+            numpy.ndarray: A ``(sentences, dimensions)`` array of sentence vectors.
+        """
+        sparse = import_sparse()
+        vocabulary = {}
+        rows, columns = [], []
+        for row, tokens in enumerate(token_lists):
+            for token in tokens:
+                rows.append(row)
+                columns.append(vocabulary.setdefault(token, len(vocabulary)))
+        if not vocabulary:
+            return np.zeros((len(token_lists), 1))
+        counts = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=(len(token_lists), len(vocabulary))
+        )
+        document_frequencies = np.bincount(counts.indices, minlength=len(vocabulary))
+        idf = np.log((1 + len(token_lists)) / (1 + document_frequencies)) + 1
+        tfidf = counts.multiply(idf).tocsr()
+        dimensions = min(self._vector_size, *tfidf.shape)
+        if dimensions < min(tfidf.shape):
+            from scipy.sparse.linalg import svds  # pylint: disable=import-outside-toplevel
+
+            # A fixed start vector makes the truncated SVD deterministic.
+            _, _, components = svds(
+                tfidf, k=dimensions, v0=np.ones(min(tfidf.shape)), random_state=0
+            )
+        else:
+            _, _, components = np.linalg.svd(tfidf.toarray(), full_matrices=False)
+        # Projecting onto the singular vectors keeps the sentences without tokens at zero.
+        return _normalize(tfidf @ components[:dimensions].T)
+
+
+class Doc2VecEmbedding(SentenceEmbedding):
+    """Embeds sentences with a Doc2Vec model trained on their document, as the container does.
+
+    It requires `Gensim <https://radimrehurek.com/gensim/>`_, and is the slowest backend
+    because a model is trained for every document.
+
+    Args:
+        vector_size (int): The embedding dimensions.
+        epochs (int): The number of training epochs (default: 60).
+        seed (int): The seed of the model (default: 0).
+
+    """
+
+    def __init__(self, vector_size: int, epochs: int = 60, seed: int = 0):
+        """Initializes a ``Doc2VecEmbedding`` instance."""
+        super().__init__(vector_size)
+        self._epochs = epochs
+        self._seed = seed
+
+    @property
+    def epochs(self) -> int:
+        """Gets the value of the ``epochs`` parameter."""
+        return self._epochs
+
+    def embed(self, token_lists: List[List[str]]) -> np.ndarray:
+        """Embeds the sentences of a document.
+
+        Args:
+            token_lists (List[List[str]]): The tokens of every sentence.
+
+        Returns:
+            numpy.ndarray: A ``(sentences, vector_size)`` array of sentence vectors.
+        """
+        try:
+            # pylint: disable=import-outside-toplevel
+            from gensim.models.doc2vec import Doc2Vec, TaggedDocument
+        except ImportError as e:
+            raise ImportError("Doc2VecEmbedding requires gensim.") from e
+        documents = [TaggedDocument(tokens, [row]) for row, tokens in enumerate(token_lists)]
+        model = Doc2Vec(
+            documents,
+            vector_size=self._vector_size,
+            min_count=1,
+            epochs=self._epochs,
+            seed=self._seed,
+            workers=1,
+        )
+        return np.array([model.dv[row] for row in range(len(token_lists))])
+
+
+class CachedEmbedding(SentenceEmbedding):
+    """Caches the sentence vectors of another embedding backend in memory-mapped files.
+
+    Consecutive filings of an issuer repeat most of their boilerplate sentences, so
+    summarizing a new filing only embeds its new sentences. The vectors are keyed by
+    a hash of the tokens of the sentences, after the ``min_count`` filtering of the
+    summarizer, which depends on the whole document, so a ``min_count`` above 1 makes
+    fewer sentences match across filings. The vectors are stored as ``float32`` in
+    a directory named after the class and the parameters of the wrapped backend, under
+    ``directory``. When the cache is full, the least recently used vectors are evicted.
+
+    Only the backends whose ``cacheable`` attribute is True can be cached, such as
+    :class:`HashingEmbedding`. The vectors of :class:`TfidfSvdEmbedding` and
+    :class:`Doc2VecEmbedding` depend on the whole document. Several processes, such as
+    the workers of a :class:`~smjsindustry.finance.local_summarizer.LocalSummarizer`, can
+    share the cache: every call holds an exclusive lock on its files, which is not
+    available on Windows, and reloads the index of the cache if another process wrote to it.
+    A pickled ``CachedEmbedding`` reopens the files by their path.
+
+    Args:
+        embedding (SentenceEmbedding): The embedding backend whose vectors are cached.
+        directory (str): The directory of the cache files.
+        capacity (int): The maximum number of cached vectors, which is ignored when
+            the cache files already exist (default: EMBEDDING_CACHE_CAPACITY).
+
+    """
+
+    def __init__(
+        self,
+        embedding: SentenceEmbedding,
+        directory: str,
+        capacity: int = EMBEDDING_CACHE_CAPACITY,
+    ):
+        """Initializes a ``CachedEmbedding`` instance.
+
+        Raises:
+            TypeError: if ``embedding`` is not a ``SentenceEmbedding``.
+            ValueError:
+
+                - if ``embedding`` is not cacheable
+                - if ``capacity`` is not a positive integer
+
+        """
+        if not isinstance(embedding, SentenceEmbedding):
+            raise TypeError("CachedEmbedding requires embedding to be a SentenceEmbedding.")
+        if not embedding.cacheable:
+            raise ValueError(
+                f"{type(embedding).__name__} vectors depend on the document and cannot be cached."
+            )
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("capacity needs to be a positive integer")
+        super().__init__(embedding.vector_size)
+        parameters = repr(sorted(vars(embedding).items())).encode("utf-8")
+        self._embedding = embedding
+        self._directory = os.path.join(
+            directory,
+            "{}-{}".format(
+                type(embedding).__name__, hashlib.blake2b(parameters, digest_size=8).hexdigest()
+            ),
+        )
+        self._capacity = capacity
+        self._hits = 0
+        self._misses = 0
+        self._vectors = None
+        self._keys = None
+        self._ticks = None
+        self._slots = None
+        self._tick = None
+
+    @property
+    def embedding(self) -> SentenceEmbedding:
+        """Gets the embedding backend whose vectors are cached."""
+        return self._embedding
+
+    @property
+    def directory(self) -> str:
+        """Gets the directory of the cache files of the embedding backend."""
+        return self._directory
+
+    @property
+    def hits(self) -> int:
+        """Gets the number of sentences whose vector was found in the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Gets the number of sentences that were embedded by the wrapped backend."""
+        return self._misses
+
+    def __getstate__(self):
+        """Leaves the memory-mapped files out of the pickled state, they are reopened lazily."""
+        state = self.__dict__.copy()
+        state.update(_vectors=None, _keys=None, _ticks=None, _slots=None, _tick=None)
+        return state
+
+    def embed(self, token_lists: List[List[str]]) -> np.ndarray:
+        """Embeds the sentences of a document, reusing the cached vectors.
+
+        Args:
+            token_lists (List[List[str]]): The tokens of every sentence.
+
+        Returns:
+            numpy.ndarray: A ``(sentences, vector_size)`` ``float32`` array of sentence vectors.
+        """
+        keys = [_token_key(tokens) for tokens in token_lists]
+        with self._lock():
+            self._open()
+            # Another process wrote to the cache since the last call, so the index is stale.
+            if self._ticks.max() != self._tick:
+                self._load_slots()
+            vectors = self._embed(token_lists, keys, self._tick + 1)
+            self._tick = int(self._ticks.max())
+        return vectors
+
+    def _embed(self, token_lists: List[List[str]], keys: List[int], tick: int) -> np.ndarray:
+        """Embeds the sentences of a document with the open cache files, under the lock."""
+        found = [self._slots.get(key) for key in keys]
+        hit_slots = np.array([slot for slot in found if slot is not None], dtype=np.int64)
+        self._ticks[hit_slots] = tick
+        vectors = np.zeros((len(keys), self._vector_size), dtype=np.float32)
+        hits = [row for row, slot in enumerate(found) if slot is not None]
+        vectors[hits] = self._vectors[hit_slots]
+        # Repeated sentences of the document are embedded once.
+        missing = {}
+        for row, slot in enumerate(found):
+            if slot is None:
+                missing.setdefault(keys[row], []).append(row)
+        self._hits += len(hits)
+        self._misses += sum(len(rows) for rows in missing.values())
+        if not missing:
+            return vectors
+        missing_keys = list(missing)
+        embedded = self._embedding.embed([token_lists[missing[key][0]] for key in missing_keys])
+        for key, vector in zip(missing_keys, embedded):
+            vectors[missing[key]] = vector
+        self._store(missing_keys, embedded.astype(np.float32), tick, len(np.unique(hit_slots)))
+        return vectors
+
+    @contextlib.contextmanager
+    def _lock(self):
+        """Holds an exclusive lock on the cache files until the context exits."""
+        os.makedirs(self._directory, exist_ok=True)
+        with open(os.path.join(self._directory, "lock"), "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _open(self):
+        """Opens the cache files, creating them if they do not exist."""
+        if self._vectors is not None:
+            return
+        paths = [
+            os.path.join(self._directory, name) for name in ("vectors.npy", "keys.npy", "ticks.npy")
+        ]
+        if all(os.path.exists(path) for path in paths):
+            self._vectors, self._keys, self._ticks = (
+                np.lib.format.open_memmap(path, mode="r+") for path in paths
+            )
+        else:
+            self._vectors = np.lib.format.open_memmap(
+                paths[0], mode="w+", dtype=np.float32, shape=(self._capacity, self._vector_size)
+            )
+            self._keys = np.lib.format.open_memmap(
+                paths[1], mode="w+", dtype=np.uint64, shape=(self._capacity,)
+            )
+            # A slot whose tick is 0 is empty.
+            self._ticks = np.lib.format.open_memmap(
+                paths[2], mode="w+", dtype=np.int64, shape=(self._capacity,)
+            )
+        self._load_slots()
+
+    def _load_slots(self):
+        """Indexes the slots of the cached vectors by their key."""
+        used = np.flatnonzero(self._ticks)
+        self._slots = dict(zip(self._keys[used].tolist(), used.tolist()))
+        self._tick = int(self._ticks.max())
+
+    def _store(self, keys: List[int], vectors: np.ndarray, tick: int, num_hits: int):
+        """Writes new vectors to the empty or least recently used slots of the cache.
+
+        The slots of the vectors read by the same call have the newest tick and are kept,
+        so at most ``capacity - num_hits`` vectors are written.
+        """
+        count = min(len(keys), len(self._ticks) - num_hits)
+        if count <= 0:
+            return
+        slots = np.argpartition(self._ticks, count - 1)[:count]
+        evicted = self._ticks[slots] > 0
+        for key in self._keys[slots[evicted]].tolist():
+            del self._slots[key]
+        self._vectors[slots] = vectors[:count]
+        self._keys[slots] = keys[:count]
+        self._ticks[slots] = tick
+        self._slots.update(zip(keys[:count], slots.tolist()))
+        for array in (self._vectors, self._keys, self._ticks):
+            array.flush()
+
+
+def _token_key(tokens: List[str]) -> int:
+    """Hashes the tokens of a sentence to a 64-bit cache key."""
+    digest = hashlib.blake2b("\x1f".join(tokens).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scales the non-zero rows of a matrix to a unit L2 norm."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
@@ -0,0 +1,346 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""The k-medoids clustering module of the local SageMaker JumpStart Industry summarizer."""
+from __future__ import absolute_import
+
+import math
+
+import numpy as np
+
+from smjsindustry.finance.constants import (
+    KMEDOIDS_MAX_ITERATIONS,
+    KMEDOIDS_SUMMARIZER_INIT_VALUES,
+    KMEDOIDS_SUMMARIZER_METRIC_VALUES,
+)
+
+# The minimum decrease of the total distance for which two medoids are swapped.
+_SWAP_TOLERANCE = 1e-6
+# The number of rows of the (n, n) distance matrix processed at a time.
+_BLOCK_SIZE = 1024
+
+
+def pairwise_distances(vectors: np.ndarray, metric: str) -> np.ndarray:
+    """Computes the distances between all the pairs of vectors as a ``float32`` matrix.
+
+    The matrix is computed in place from a single matrix product, so it is the only
+    ``(n, n)`` array allocated, and it is shared by the initialization and swap phases
+    of :func:`kmedoids`.
+
+    Args:
+        vectors (numpy.ndarray): A ``(n, dimensions)`` array of vectors.
+        metric (str): ``'euclidean'``, ``'cosine'`` for one minus the cosine similarity,
+            or ``'dot-product'`` for the largest dot product minus the dot product.
+
+    Returns:
+        numpy.ndarray: A symmetric ``(n, n)`` ``float32`` array of distances with
+        a zero diagonal.
+    """
+    if metric not in KMEDOIDS_SUMMARIZER_METRIC_VALUES:
+        raise ValueError(f"{metric} not valid.")
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if metric == "cosine":
+        norms = np.linalg.norm(vectors, axis=1)
+        vectors = vectors / np.where(norms > 0, norms, 1)[:, None]
+    distances = vectors @ vectors.T
+    if metric == "euclidean":
+        squared_norms = np.einsum("ij,ij->i", vectors, vectors)
+        distances *= -2
+        distances += squared_norms[:, None]
+        distances += squared_norms[None, :]
+        np.maximum(distances, 0, out=distances)
+        np.sqrt(distances, out=distances)
+    elif metric == "cosine":
+        np.subtract(1, distances, out=distances)
+        np.maximum(distances, 0, out=distances)
+    else:
+        np.subtract(distances.max(), distances, out=distances)
+    _symmetrize(distances)
+    np.fill_diagonal(distances, 0)
+    return distances
+
+
+def _symmetrize(distances: np.ndarray):
+    """Averages a square matrix with its transpose in place, a block of rows at a time.
+
+    Rounding can leave the distance matrix slightly asymmetric, and ``distances += distances.T``
+    would copy the whole matrix because the operands overlap.
+    """
+    for start in range(0, distances.shape[0], _BLOCK_SIZE):
+        stop = start + _BLOCK_SIZE
+        rows = distances[start:stop, start:]
+        rows += distances[start:, start:stop].T
+        rows /= 2
+        distances[start:, start:stop] = rows.T
+
+
+def kmedoids(
+    distances: np.ndarray,
+    n_clusters: int,
+    init: str = "heuristic",
+    max_iter: int = KMEDOIDS_MAX_ITERATIONS,
+    random_state: int = 0,
+) -> np.ndarray:
+    """Clusters points around medoids with the FasterPAM swap algorithm.
+
+    After the initialization, every non-medoid point is considered in turn as a
+    replacement of the medoid whose removal costs the least with it, and the swap is
+    made as soon as it reduces the total distance of the points to their closest
+    medoids. Each candidate is evaluated in ``O(n)`` from the distances of every point
+    to its closest and second closest medoids, instead of ``O(k n)`` per medoid as in
+    PAM, so a pass over all the candidates takes ``O(n ** 2)``. The passes stop when
+    none of the candidates improves the clustering.
+
+    Args:
+        distances (numpy.ndarray): A symmetric ``(n, n)`` array of distances.
+        n_clusters (int): The number of clusters, at most ``n``.
+        init (str): The medoid initialization method, one of ``'random'``, ``'heuristic'``
+            for the points with the smallest sums of distances, ``'k-medoids++'``, or
+            ``'build'`` for the greedy BUILD step of PAM (default: ``'heuristic'``).
+        max_iter (int): The maximum number of passes over the candidates
+            (default: KMEDOIDS_MAX_ITERATIONS).
+        random_state (int): The seed of the random initializations (default: 0).
+
+    Returns:
+        numpy.ndarray: The positions of the ``n_clusters`` medoids, in ascending order.
+    """
+    medoids = initialize_medoids(distances, n_clusters, init, random_state)
+    if n_clusters == 1:
+        # The single medoid is the point with the smallest sum of distances.
+        return np.array([np.argmin(distances.sum(axis=1, dtype=np.float64))])
+    if n_clusters == distances.shape[0]:
+        return np.sort(medoids)
+    nearest, nearest_distances, second_distances = _nearest_medoids(distances, medoids)
+    removal_losses = np.bincount(
+        nearest, weights=second_distances - nearest_distances, minlength=n_clusters
+    )
+    last_swap = -1
+    for _ in range(max_iter):
+        for candidate in range(distances.shape[0]):
+            if candidate == last_swap:
+                # A full pass over the candidates has not found any better swap.
+                return np.sort(medoids)
+            if medoids[nearest[candidate]] == candidate:
+                continue
+            candidate_distances = distances[candidate]
+            closer = candidate_distances < nearest_distances
+            # The points that move to the candidate, whichever medoid is removed.
+            shared_change = np.sum(candidate_distances[closer] - nearest_distances[closer])
+            # The points whose medoid is removed and that move to the candidate do not
+            # move to their second closest medoid, and the other points whose medoid is
+            # removed move to the candidate if it is closer than their second closest.
+            changes = removal_losses + np.bincount(
+                nearest[closer],
+                weights=nearest_distances[closer] - second_distances[closer],
+                minlength=n_clusters,
+            )
+            between = ~closer & (candidate_distances < second_distances)
+            changes += np.bincount(
+                nearest[between],
+                weights=candidate_distances[between] - second_distances[between],
+                minlength=n_clusters,
+            )
+            removed = int(np.argmin(changes))
+            if changes[removed] + shared_change < -_SWAP_TOLERANCE:
+                medoids[removed] = candidate
+                nearest, nearest_distances, second_distances = _nearest_medoids(distances, medoids)
+                removal_losses = np.bincount(
+                    nearest, weights=second_distances - nearest_distances, minlength=n_clusters
+                )
+                last_swap = candidate
+        if last_swap == -1:
+            break
+    return np.sort(medoids)
+
+
+def clara(
+    vectors: np.ndarray,
+    n_clusters: int,
+    metric: str,
+    sample_size: int,
+    num_samples: int = 5,
+    init: str = "heuristic",
+    max_iter: int = KMEDOIDS_MAX_ITERATIONS,
+    random_state: int = 0,
+) -> np.ndarray:
+    """Clusters points around medoids found on random samples of the points (CLARA).
+
+    Every sample of ``sample_size`` points is clustered with :func:`kmedoids`, and all
+    the points are then assigned to the medoids of the sample, a block of rows at a time,
+    to measure their total distance. The medoids with the smallest total distance are
+    kept, and are added to the following samples. The largest distance matrix has
+    ``sample_size ** 2`` entries instead of ``n ** 2``.
+
+    Args:
+        vectors (numpy.ndarray): A ``(n, dimensions)`` array of vectors.
+        n_clusters (int): The number of clusters, at most ``sample_size``.
+        metric (str): ``'euclidean'``, ``'cosine'``, or ``'dot-product'``.
+        sample_size (int): The number of points clustered in every sample.
+        num_samples (int): The number of samples (default: 5).
+        init (str): The medoid initialization method of every sample (default: ``'heuristic'``).
+        max_iter (int): The maximum number of passes over the candidates of every sample
+            (default: KMEDOIDS_MAX_ITERATIONS).
+        random_state (int): The seed of the samples and of the random initializations
+            (default: 0).
+
+    Returns:
+        numpy.ndarray: The positions of the ``n_clusters`` medoids, in ascending order.
+    """
+    num_points = vectors.shape[0]
+    if not 0 < n_clusters <= min(sample_size, num_points):
+        raise ValueError("n_clusters needs to be between 1 and the sample size")
+    if sample_size >= num_points:
+        return kmedoids(
+            pairwise_distances(vectors, metric), n_clusters, init, max_iter, random_state
+        )
+    rng = np.random.RandomState(random_state)
+    best_medoids, best_cost = np.array([], dtype=np.intp), np.inf
+    for _ in range(num_samples):
+        others = np.setdiff1d(np.arange(num_points), best_medoids)
+        sample = np.sort(
+            np.concatenate(
+                [
+                    best_medoids,
+                    rng.choice(others, size=sample_size - len(best_medoids), replace=False),
+                ]
+            )
+        )
+        distances = pairwise_distances(vectors[sample], metric)
+        medoids = sample[kmedoids(distances, n_clusters, init, max_iter, random_state)]
+        del distances
+        cost = _assignment_cost(vectors, vectors[medoids], metric)
+        if cost < best_cost:
+            best_medoids, best_cost = medoids, cost
+    return best_medoids
+
+
+def max_sample_size(max_memory_mb: int) -> int:
+    """Computes the largest number of points that :func:`clara` clusters within a memory budget.
+
+    The budget covers the ``float32`` distance matrix of a sample and the temporary
+    arrays of its blocks of rows, but not the vectors themselves.
+
+    Args:
+        max_memory_mb (int): The memory budget in megabytes.
+
+    Returns:
+        int: The largest sample size within the budget.
+    """
+    # The matrix takes 4 * size ** 2 bytes, and up to three blocks of rows are alive at a time.
+    block_entries = 1.5 * _BLOCK_SIZE
+    return int(math.sqrt(block_entries**2 + max_memory_mb * 2**20 / 4) - block_entries)
+
+
+def _assignment_cost(vectors: np.ndarray, medoid_vectors: np.ndarray, metric: str) -> float:
+    """Sums the distances of the points to their closest medoids, a block of rows at a time.
+
+    The ``'dot-product'`` distances are the negative dot products, which differ from those
+    of :func:`pairwise_distances` by a constant, so the costs of different medoids compare
+    the same way.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    medoid_vectors = np.asarray(medoid_vectors, dtype=np.float32)
+    if metric == "cosine":
+        medoid_norms = np.linalg.norm(medoid_vectors, axis=1)
+        medoid_vectors = medoid_vectors / np.where(medoid_norms > 0, medoid_norms, 1)[:, None]
+    medoid_squared_norms = np.einsum("ij,ij->i", medoid_vectors, medoid_vectors)
+    cost = 0.0
+    for start in range(0, vectors.shape[0], _BLOCK_SIZE):
+        block = vectors[start : start + _BLOCK_SIZE]
+        products = block @ medoid_vectors.T
+        if metric == "euclidean":
+            squared_norms = np.einsum("ij,ij->i", block, block)
+            distances = squared_norms[:, None] + medoid_squared_norms[None, :] - 2 * products
+            distances = np.sqrt(np.maximum(distances, 0))
+        elif metric == "cosine":
+            norms = np.linalg.norm(block, axis=1)
+            distances = np.maximum(1 - products / np.where(norms > 0, norms, 1)[:, None], 0)
+        else:
+            distances = -products
+        cost += distances.min(axis=1).sum(dtype=np.float64)
+    return cost
+
+
+def _nearest_medoids(distances: np.ndarray, medoids: np.ndarray):
+    """Finds the closest and second closest medoid of every point, with at least two medoids.
+
+    Args:
+        distances (numpy.ndarray): A symmetric ``(n, n)`` array of distances.
+        medoids (numpy.ndarray): The positions of the medoids.
+
+    Returns:
+        tuple: The cluster of the closest medoid of every point, and the distances to
+        the closest and the second closest medoids.
+    """
+    medoid_distances = distances[medoids].astype(np.float64)
+    order = np.argpartition(medoid_distances, 1, axis=0)[:2]
+    columns = np.arange(distances.shape[0])
+    nearest = order[0]
+    nearest_distances = medoid_distances[nearest, columns]
+    second_distances = medoid_distances[order[1], columns]
+    # A medoid is the closest medoid of itself, even when medoids are duplicate points.
+    nearest[medoids] = np.arange(len(medoids))
+    return nearest, nearest_distances, second_distances
+
+
+def initialize_medoids(
+    distances: np.ndarray, n_clusters: int, init: str, random_state: int = 0
+) -> np.ndarray:
+    """Chooses the initial medoids.
+
+    Args:
+        distances (numpy.ndarray): A symmetric ``(n, n)`` array of distances.
+        n_clusters (int): The number of medoids, at most ``n``.
+        init (str): ``'random'``, ``'heuristic'``, ``'k-medoids++'``, or ``'build'``.
+        random_state (int): The seed of the random initializations (default: 0).
+
+    Returns:
+        numpy.ndarray: The positions of the initial medoids.
+    """
+    if init not in KMEDOIDS_SUMMARIZER_INIT_VALUES:
+        raise ValueError(f"{init} not valid.")
+    num_points = distances.shape[0]
+    if not 0 < n_clusters <= num_points:
+        raise ValueError("n_clusters needs to be between 1 and the number of points")
+    rng = np.random.RandomState(random_state)
+    if init == "random":
+        return rng.choice(num_points, size=n_clusters, replace=False)
+    if init == "heuristic":
+        return np.argsort(distances.sum(axis=1, dtype=np.float64), kind="stable")[:n_clusters]
+    if init == "k-medoids++":
+        medoids = [rng.randint(num_points)]
+        closest = distances[medoids[0]].copy()
+        for _ in range(1, n_clusters):
+            weights = closest**2
+            if weights.sum() > 0:
+                weights[medoids] = 0
+                medoid = rng.choice(num_points, p=weights / weights.sum())
+            else:
+                medoid = rng.choice(np.setdiff1d(np.arange(num_points), medoids))
+            medoids.append(medoid)
+            np.minimum(closest, distances[medoid], out=closest)
+        return np.array(medoids)
+    medoids = [int(np.argmin(distances.sum(axis=1, dtype=np.float64)))]
+    closest = distances[medoids[0]].copy()
+    gains = np.empty(num_points)
+    for _ in range(1, n_clusters):
+        # The decrease of the total distance if every point were added as a medoid,
+        # computed in blocks of rows to avoid another (n, n) array.
+        for start in range(0, num_points, _BLOCK_SIZE):
+            block = closest[None, :] - distances[start : start + _BLOCK_SIZE]
+            np.maximum(block, 0, out=block)
+            gains[start : start + _BLOCK_SIZE] = block.sum(axis=1, dtype=np.float64)
+        gains[medoids] = -1
+        medoid = int(np.argmax(gains))
+        medoids.append(medoid)
+        np.minimum(closest, distances[medoid], out=closest)
+    return np.array(medoids)
@@ -0,0 +1,437 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""The local NLP scorer module of SageMaker JumpStart Industry.
+
+The scorer in this module runs in the current Python process instead of
+a SageMaker Processing job, which suits interactive analysis of dataframes.
+"""
+from __future__ import absolute_import
+
+import logging
+import time
+import weakref
+from collections import deque
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from smjsindustry.finance.constants import NLP_SCORER_CHUNK_SIZE, WORD_ROWS_CACHE_SIZE
+from smjsindustry.finance.nlp_score_type import NLPSCORE_NO_WORD_LIST, NLPScoreType
+from smjsindustry.finance.processor_config import NLPScorerConfig
+from smjsindustry.finance.readability import COMPLEX_WORD_SYLLABLES, count_syllables, gunning_fog
+from smjsindustry.finance.tokenizer import is_token, split_sentences, split_words, stem, tokenize
+from smjsindustry.finance.utils import import_sparse
+
+logger = logging.getLogger()
+
+# The compiled word list index of every live NLPScorerConfig.
+_INDEXES = weakref.WeakKeyDictionary()
+
+
+class WordListIndex:
+    """The shared index of the stemmed words and phrases of the word lists of an ``NLPScorerConfig``.
+
+    Every entry of the word lists is tokenized and stemmed like the documents. Every
+    distinct token of the entries is mapped to a row of a ``(tokens + 1, score types)``
+    membership matrix of the single-token entries, so the tokens of a document are looked
+    up once for all the score types. Row 0 stands for the tokens that are not in any entry.
+    The rows of the distinct words of the documents are memoized, so every word is stemmed
+    once.
+
+    The ``readability`` score type needs no word list. Its Gunning-Fog index is computed
+    from the number of words, sentences and complex words of every document, where the
+    number of syllables of every distinct word is counted once and memoized with its row,
+    so it costs about as much as the score of a word list.
+
+    All the entries, including the multi-token phrases such as ``"going concern"``, are
+    also compiled into a single Aho-Corasick automaton over the token rows. The automaton
+    only scans the runs of consecutive tokens that are all part of some phrase, so the cost
+    of a document does not grow with the number of phrases, and the other tokens are scored
+    with the membership matrix.
+
+    Args:
+        score_config (NLPScorerConfig): The config whose word lists are indexed.
+
+    """
+
+    def __init__(self, score_config: NLPScorerConfig):
+        """Initializes a ``WordListIndex`` instance.
+
+        Raises:
+            TypeError: if ``score_config`` is not an ``NLPScorerConfig``.
+            ValueError: if a score type other than ``readability`` has no word list, because
+                the default word lists and the Vader sentiment lexicon are only available
+                in the processing job.
+        """
+        if not isinstance(score_config, NLPScorerConfig):
+            raise TypeError("WordListIndex requires an NLPScorerConfig.")
+        score_types = score_config.get_config()["score_types"]
+        self._score_names = list(score_types)
+        self._rows = {}
+        self._readability_column = None
+        phrases = []
+        for column, (score_name, word_list) in enumerate(score_types.items()):
+            if score_name == NLPScoreType.READABILITY:
+                self._readability_column = column
+                continue
+            if score_name in NLPSCORE_NO_WORD_LIST or not word_list:
+                raise ValueError(
+                    "The local NLP scorer requires a word_list for the {} score type.".format(
+                        score_name
+                    )
+                )
+            for entry in word_list:
+                tokens = tokenize(entry)
+                if not tokens:
+                    logger.warning(
+                        "Skipping %r of the %s word list, which has no token.", entry, score_name
+                    )
+                    continue
+                rows = tuple(self._rows.setdefault(token, len(self._rows) + 1) for token in tokens)
+                phrases.append((rows, column))
+        self._memberships = np.zeros((len(self._rows) + 1, len(score_types)))
+        self._phrase_tokens = np.zeros(len(self._rows) + 1, dtype=bool)
+        for rows, column in phrases:
+            if len(rows) == 1:
+                self._memberships[rows[0], column] = 1
+            else:
+                self._phrase_tokens[list(rows)] = True
+        self._automaton = _PhraseAutomaton(phrases, len(score_types))
+        self._word_rows = _WordRows(self._rows, self._readability_column is not None)
+
+    @property
+    def score_names(self) -> List[str]:
+        """Gets the names of the score types, in the order of the score columns."""
+        return self._score_names
+
+    def document_term_matrix(self, texts: Iterable[str]):
+        """Counts the tokens of the entries of the word lists in every document.
+
+        Args:
+            texts (Iterable[str]): The documents.
+
+        Returns:
+            scipy.sparse.csr_matrix: A ``(documents, tokens + 1)`` matrix with the count
+            of every token of the index in every document, and the count of the other
+            tokens in column 0, so the row sums are the numbers of tokens of the documents.
+        """
+        documents, rows, valid, _ = self._token_rows(texts)
+        return self._document_term_matrix(documents, rows, len(valid))
+
+    def score(self, texts: Iterable[str]) -> np.ndarray:
+        """Scores documents against all the word lists in a single pass over their tokens.
+
+        The score of a document for a score type is the fraction of its tokens, after
+        the removal of stop words and stemming, that are part of an occurrence of an entry
+        of the word list. The single-token entries of all the score types are scored with
+        one product of the sparse document-term matrix and the token-by-score-type
+        indicator matrix, and the phrases with the automaton. The ``readability`` score is
+        the Gunning-Fog index of the document.
+
+        Args:
+            texts (Iterable[str]): The documents.
+
+        Returns:
+            numpy.ndarray: A ``(documents, score types)`` array of scores, with NaN for
+            the documents that are not strings and 0 for those without tokens.
+        """
+        documents, rows, valid, readability = self._token_rows(texts)
+        matrix = self._document_term_matrix(documents, rows, len(valid))
+        scores = matrix @ self._memberships
+        if self._automaton.max_length > 1:
+            # Phrases only occur in runs of consecutive tokens of multi-token entries, whose
+            # tokens are scored by the automaton instead of the indicator matrix.
+            in_phrases = self._phrase_tokens[rows]
+            pairs = in_phrases[:-1] & in_phrases[1:] & (documents[:-1] == documents[1:])
+            starts = np.flatnonzero(pairs & ~np.concatenate([[False], pairs[:-1]]))
+            stops = np.flatnonzero(pairs & ~np.concatenate([pairs[1:], [False]])) + 2
+            for start, stop in zip(starts.tolist(), stops.tolist()):
+                scores[documents[start]] += self._automaton.cover(rows[start:stop].tolist())
+            runs = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.add.at(runs, starts, 1)
+            np.add.at(runs, stops, -1)
+            in_runs = np.cumsum(runs[:-1]) > 0
+            scores -= (
+                self._document_term_matrix(documents[in_runs], rows[in_runs], len(valid))
+                @ self._memberships
+            )
+        scores /= np.maximum(np.asarray(matrix.sum(axis=1)).ravel(), 1)[:, None]
+        if readability is not None:
+            scores[:, self._readability_column] = readability
+        scores[~valid] = np.nan
+        return scores
+
+    def _token_rows(self, texts: Iterable[str]):
+        """Splits documents into the index rows of their tokens.
+
+        Returns:
+            tuple: The document and the row of every token, in the order of the documents,
+            whether every document is a string, and the Gunning-Fog index of every document
+            if the index scores readability, otherwise None.
+        """
+        codes = []
+        word_counts = []
+        sentence_counts = []
+        valid = []
+        for text in texts:
+            valid.append(isinstance(text, str))
+            words = split_words(text) if valid[-1] else []
+            codes.extend(map(self._word_rows.__getitem__, words))
+            word_counts.append(len(words))
+            if self._readability_column is not None:
+                sentence_counts.append(len(split_sentences(text)) if valid[-1] else 0)
+        codes = np.array(codes, dtype=np.int64)
+        documents = np.repeat(np.arange(len(valid)), word_counts)
+        readability = None
+        if self._readability_column is not None:
+            # The readability counts all the words, including the stop words.
+            complex_word_counts = np.bincount(documents, weights=codes & 1, minlength=len(valid))
+            readability = gunning_fog(word_counts, sentence_counts, complex_word_counts)
+        rows = codes >> 1
+        # The stop words are not tokens and have the row -1.
+        tokens = rows >= 0
+        return documents[tokens], rows[tokens], np.array(valid, dtype=bool), readability
+
+    def _document_term_matrix(self, documents: np.ndarray, rows: np.ndarray, num_documents: int):
+        """Builds the sparse document-term matrix of the rows of the tokens of documents."""
+        sparse = import_sparse()
+        return sparse.csr_matrix(
+            (np.ones(len(rows)), (documents, rows)),
+            shape=(num_documents, len(self._phrase_tokens)),
+        )
+
+
+def word_list_index(score_config: NLPScorerConfig) -> WordListIndex:
+    """Gets the ``WordListIndex`` of an ``NLPScorerConfig``, compiling it on first use.
+
+    The index is cached for as long as the config is alive, so scoring several dataframes
+    with the same config compiles its word lists once.
+
+    Args:
+        score_config (NLPScorerConfig): The config whose word lists are indexed.
+
+    Returns:
+        WordListIndex: The index of the word lists of the config.
+    """
+    index = _INDEXES.get(score_config)
+    if index is None:
+        index = WordListIndex(score_config)
+        _INDEXES[score_config] = index
+    return index
+
+
+class _PhraseAutomaton:
+    """An Aho-Corasick automaton over the token rows of the entries of the word lists.
+
+    Args:
+        phrases (List[Tuple[Tuple[int], int]]): The token rows and the score column of
+            every entry.
+        num_columns (int): The number of score types.
+
+    """
+
+    def __init__(self, phrases, num_columns: int):
+        """Builds the trie of the entries, and its failure links in breadth-first order."""
+        self._num_columns = num_columns
+        self._transitions = [{}]
+        self._outputs = [[]]
+        self.max_length = max((len(rows) for rows, _ in phrases), default=0)
+        for rows, column in phrases:
+            state = 0
+            for row in rows:
+                if row not in self._transitions[state]:
+                    self._transitions.append({})
+                    self._outputs.append([])
+                    self._transitions[state][row] = len(self._transitions) - 1
+                state = self._transitions[state][row]
+            self._outputs[state].append((len(rows), column))
+        self._failures = [0] * len(self._transitions)
+        queue = deque(self._transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for row, child in self._transitions[state].items():
+                failure = self._failures[state]
+                while failure and row not in self._transitions[failure]:
+                    failure = self._failures[failure]
+                self._failures[child] = self._transitions[failure].get(row, 0)
+                # The entries that end at a state include those of its failure state.
+                self._outputs[child].extend(self._outputs[self._failures[child]])
+                queue.append(child)
+
+    def cover(self, rows: List[int]) -> np.ndarray:
+        """Counts the tokens of a run that are part of an occurrence of an entry.
+
+        Args:
+            rows (List[int]): The token rows of a run of tokens.
+
+        Returns:
+            numpy.ndarray: The number of covered tokens for every score type.
+        """
+        # The bits of the covered positions of every score type.
+        covered = [0] * self._num_columns
+        state = 0
+        for position, row in enumerate(rows):
+            while state and row not in self._transitions[state]:
+                state = self._failures[state]
+            state = self._transitions[state].get(row, 0)
+            for length, column in self._outputs[state]:
+                covered[column] |= ((1 << length) - 1) << (position + 1 - length)
+        return np.array([bin(bits).count("1") for bits in covered])
+
+
+class LocalNLPScorer:
+    """Calculates NLP scores in-process for the word lists of an ``NLPScorerConfig``.
+
+    It is the in-process counterpart of :class:`~smjsindustry.finance.processor.NLPScorer`
+    and launches no processing job. Every document is tokenized once, and its tokens are
+    looked up in a :class:`WordListIndex` shared by all the score types, which is compiled
+    once per config. The score of a document for a score type is the fraction of its tokens
+    that are part of an occurrence of a word or phrase of the word list, after the removal
+    of stop words and the stemming of the documents and the word lists.
+
+    The ``readability`` score is the Gunning-Fog index of the document, with the syllables
+    of the words counted by :func:`~smjsindustry.finance.readability.count_syllables`.
+    The default word lists and the Vader sentiment lexicon of the processing job are not
+    available locally, so every other score type of the config needs a non-empty
+    ``word_list``.
+
+    """
+
+    def calculate(
+        self,
+        score_config: NLPScorerConfig,
+        text_column_name: str,
+        dataframe: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """Calculates the NLP scores of the text column of a dataframe.
+
+        Args:
+            score_config (NLPScorerConfig): The config for the NLP scorer.
+            text_column_name (str): The name for column containing text to be scored.
+            dataframe (pandas.DataFrame): The dataframe containing the text to be scored.
+
+        Returns:
+            pandas.DataFrame: A copy of the dataframe with a column of scores named after
+            every score type of the config.
+
+        Raises:
+            TypeError: if ``score_config`` is not an ``NLPScorerConfig``.
+            ValueError: if a score type of the config other than ``readability`` has no
+                word list.
+        """
+        index = word_list_index(score_config)
+        scores = self.calculate_batch(score_config, dataframe[text_column_name])
+        return dataframe.assign(
+            **{name: scores[:, column] for column, name in enumerate(index.score_names)}
+        )
+
+    def calculate_batch(self, score_config: NLPScorerConfig, texts: Iterable[str]) -> np.ndarray:
+        """Calculates the NLP scores of a batch of documents as an array.
+
+        The documents are tokenized into a sparse document-term matrix once, and the scores
+        of all the score types are computed from it at the same time, without the overhead
+        of a dataframe.
+
+        Args:
+            score_config (NLPScorerConfig): The config for the NLP scorer.
+            texts (Iterable[str]): The documents.
+
+        Returns:
+            numpy.ndarray: A ``(documents, score types)`` array of scores, with the columns
+            in the order of the score types of the config.
+
+        Raises:
+            TypeError: if ``score_config`` is not an ``NLPScorerConfig``.
+            ValueError: if a score type of the config other than ``readability`` has no
+                word list.
+        """
+        return word_list_index(score_config).score(texts)
+
+    def calculate_file(
+        self,
+        score_config: NLPScorerConfig,
+        text_column_name: str,
+        input_file_path: str,
+        output_file_path: str,
+        chunksize: int = NLP_SCORER_CHUNK_SIZE,
+    ) -> int:
+        """Calculates the NLP scores of a CSV file that may not fit in memory.
+
+        The input file is read ``chunksize`` rows at a time, and every chunk is scored and
+        appended with its score columns to the output CSV file, so the peak memory depends
+        on the size of a chunk but not on the size of the file. The progress is logged
+        in rows per second after every chunk.
+
+        Args:
+            score_config (NLPScorerConfig): The config for the NLP scorer.
+            text_column_name (str): The name for column containing text to be scored.
+            input_file_path (str): The path of the input CSV file.
+            output_file_path (str): The path of the output CSV file, which is overwritten.
+            chunksize (int): The number of rows scored at a time
+                (default: NLP_SCORER_CHUNK_SIZE).
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            TypeError: if ``score_config`` is not an ``NLPScorerConfig``.
+            ValueError:
+
+                - if a score type of the config other than ``readability`` has no word list
+                - if ``chunksize`` (int) is not a positive integer
+
+        """
+        if not isinstance(chunksize, int) or chunksize <= 0:
+            raise ValueError("chunksize needs to be a positive integer")
+        word_list_index(score_config)
+        rows_written = 0
+        start = time.perf_counter()
+        with open(output_file_path, "w", newline="") as output_file:
+            for chunk in pd.read_csv(input_file_path, chunksize=chunksize):
+                scored = self.calculate(score_config, text_column_name, chunk)
+                scored.to_csv(output_file, header=rows_written == 0, index=False)
+                rows_written += len(scored)
+                logger.info(
+                    "Scored %d rows of %s (%.0f rows/sec)",
+                    rows_written,
+                    input_file_path,
+                    rows_written / max(time.perf_counter() - start, 1e-9),
+                )
+        return rows_written
+
+
+class _WordRows(dict):
+    """Memoizes the codes of lower-cased words.
+
+    The code of a word is twice its membership matrix row, with -1 for the stop words, plus
+    1 if the word is complex, so a single lookup per word serves all the score types.
+    """
+
+    def __init__(self, rows, readability: bool = False):
+        """Initializes a ``_WordRows`` instance from the rows of the stemmed words."""
+        super().__init__()
+        self._rows = rows
+        self._readability = readability
+
+    def __missing__(self, word: str) -> int:
+        """Stems a word seen for the first time and encodes its row."""
+        if len(self) >= WORD_ROWS_CACHE_SIZE:
+            # Keeps the memory bounded when streaming large files with many rare words.
+            self.clear()
+        row = self._rows.get(stem(word), 0) if is_token(word) else -1
+        code = 2 * row
+        if self._readability and count_syllables(word) >= COMPLEX_WORD_SYLLABLES:
+            code += 1
+        self[word] = code
+        return code
@@ -0,0 +1,484 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""The local summarizer module of SageMaker JumpStart Industry.
+
+The summarizers in this module run in the current Python process instead of
+a SageMaker Processing job, which suits small batches of documents.
+"""
+from __future__ import absolute_import
+
+import heapq
+import logging
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+
+from smjsindustry.finance.embedding import (
+    Doc2VecEmbedding,
+    SentenceEmbedding,
+    TfidfSvdEmbedding,
+)
+from smjsindustry.finance.jaccard import (
+    approximate_jaccard_similarity_sums,
+    jaccard_similarity_sums,
+)
+from smjsindustry.finance.kmedoids import clara, kmedoids, max_sample_size, pairwise_distances
+from smjsindustry.finance.processor_config import (
+    JaccardSummarizerConfig,
+    KMedoidsSummarizerConfig,
+)
+from smjsindustry.finance.tokenizer import split_sentences, stem_vocabulary, tokenize
+
+logger = logging.getLogger()
+
+
+class JaccardSummarizer:
+    """Summarizes documents in-process with the Jaccard algorithm.
+
+    The sentences of a document are scored by their average Jaccard similarity to
+    the other sentences of the document, and the top scoring sentences are returned
+    in their original order. See
+    :class:`~smjsindustry.finance.processor_config.JaccardSummarizerConfig` for the algorithm.
+
+    Args:
+        summarizer_config (JaccardSummarizerConfig): The config of the summarizer.
+            Exactly one of its ``summary_size``, ``summary_percentage``, ``max_tokens``
+            and ``cutoff`` parameters selects the summary sentences:
+
+            - ``summary_size``: the ``summary_size`` top scoring sentences.
+            - ``summary_percentage``: the ``int(summary_percentage * n)`` top scoring
+              sentences of a document with ``n`` sentences.
+            - ``max_tokens``: the top scoring sentences, skipping any sentence that would
+              make the summary exceed ``max_tokens`` white-space separated tokens.
+            - ``cutoff``: the sentences whose score is at least ``cutoff``.
+
+    """
+
+    def __init__(self, summarizer_config: JaccardSummarizerConfig):
+        """Initializes a ``JaccardSummarizer`` instance.
+
+        Raises:
+            TypeError: if ``summarizer_config`` is not a ``JaccardSummarizerConfig``.
+        """
+        if not isinstance(summarizer_config, JaccardSummarizerConfig):
+            raise TypeError("JaccardSummarizer requires a JaccardSummarizerConfig.")
+        self._config = summarizer_config
+        self._vocabulary = (
+            stem_vocabulary(summarizer_config.vocabulary)
+            if summarizer_config.vocabulary is not None
+            else None
+        )
+
+    @property
+    def config(self) -> JaccardSummarizerConfig:
+        """Gets the ``JaccardSummarizerConfig`` of the summarizer."""
+        return self._config
+
+    def summarize(self, text: str) -> str:
+        """Summarizes a document.
+
+        Args:
+            text (str): The document to be summarized.
+
+        Returns:
+            str: The summary sentences of the document, joined by spaces.
+        """
+        if not isinstance(text, str):
+            return ""
+        sentences = split_sentences(text)
+        selected = self.select_sentences(sentences)
+        return " ".join(sentences[i] for i in selected)
+
+    def score_sentences(self, sentences: List[str]) -> np.ndarray:
+        """Scores sentences by their average Jaccard similarity to the other sentences.
+
+        If the config is ``approximate``, the similarities are estimated with MinHash
+        and locality-sensitive hashing.
+
+        Args:
+            sentences (List[str]): The sentences of a document.
+
+        Returns:
+            numpy.ndarray: The score of every sentence, in the range of 0 to 1.
+        """
+        token_lists = [tokenize(sentence, self._vocabulary) for sentence in sentences]
+        if self._config.approximate:
+            scores = approximate_jaccard_similarity_sums(
+                token_lists, self._config.num_perm, self._config.num_bands
+            )
+        else:
+            scores = jaccard_similarity_sums(token_lists)
+        if len(sentences) > 1:
+            scores /= len(sentences) - 1
+        return scores
+
+    def select_sentences(self, sentences: List[str]) -> List[int]:
+        """Selects the summary sentences of a document.
+
+        Args:
+            sentences (List[str]): The sentences of a document.
+
+        Returns:
+            List[int]: The positions of the summary sentences, in ascending order.
+        """
+        scores = self.score_sentences(sentences)
+        token_counts = [len(sentence.split()) for sentence in sentences]
+        config = self._config
+        if config.summary_size:
+            return select_by_centrality(scores, token_counts, max_sentences=config.summary_size)
+        if config.summary_percentage:
+            return select_by_centrality(
+                scores,
+                token_counts,
+                max_sentences=int(config.summary_percentage * len(sentences)),
+            )
+        if config.max_tokens:
+            return select_by_centrality(scores, token_counts, max_tokens=config.max_tokens)
+        return select_by_centrality(scores, token_counts, min_score=config.cutoff)
+
+
+def select_by_centrality(
+    scores: np.ndarray,
+    token_counts: List[int],
+    max_sentences: int = None,
+    max_tokens: int = None,
+    min_score: float = None,
+) -> List[int]:
+    """Selects sentences greedily in the order of their scores until a stopping rule is met.
+
+    The sentences are popped from a heap ordered by score, with ties broken by position,
+    so the selection takes ``O(n + k log n)`` for ``k`` selected sentences. A sentence
+    whose token count exceeds the remaining ``max_tokens`` budget is skipped, and the
+    selection stops once the budget is smaller than the shortest remaining sentence.
+
+    Args:
+        scores (numpy.ndarray): The score of every sentence.
+        token_counts (List[int]): The number of tokens of every sentence.
+        max_sentences (int): The maximum number of sentences to select (default: None).
+        max_tokens (int): The maximum total number of tokens of the selected
+            sentences (default: None).
+        min_score (float): The minimum score of a selected sentence (default: None).
+
+    Returns:
+        List[int]: The positions of the selected sentences, in ascending order.
+    """
+    heap = [(-score, position) for position, score in enumerate(scores.tolist())]
+    heapq.heapify(heap)
+    # A lazy min-heap of the token counts of the sentences that have not been popped yet.
+    shortest = [(count, position) for position, count in enumerate(token_counts)]
+    heapq.heapify(shortest)
+    popped = set()
+    budget = max_tokens
+    selected = []
+    while heap:
+        if max_sentences is not None and len(selected) >= max_sentences:
+            break
+        if budget is not None:
+            while shortest and shortest[0][1] in popped:
+                heapq.heappop(shortest)
+            if not shortest or budget < shortest[0][0]:
+                break
+        score, position = heapq.heappop(heap)
+        if min_score is not None and -score < min_score:
+            break
+        popped.add(position)
+        if budget is not None:
+            if token_counts[position] > budget:
+                continue
+            budget -= token_counts[position]
+        selected.append(position)
+    return sorted(selected)
+
+
+class KMedoidsSummarizer:
+    """Summarizes documents in-process with the k-medoids algorithm.
+
+    The sentences of a document are embedded, clustered into ``summary_size`` clusters
+    with k-medoids, and the medoid sentences are returned in their original order. See
+    :class:`~smjsindustry.finance.processor_config.KMedoidsSummarizerConfig` for the algorithm.
+
+    The sentence embedding is pluggable. By default, the sentences are embedded with
+    a truncated SVD of their TF-IDF matrix with ``vector_size`` dimensions, which needs no
+    training. :class:`~smjsindustry.finance.embedding.Doc2VecEmbedding` trains a Doc2Vec
+    model like the processing job does, with its own ``vector_size`` and ``epochs``:
+    the ``epochs`` of the config is not used, so build it as
+    ``Doc2VecEmbedding(config.vector_size, config.epochs)`` to match the job. A warning
+    is logged when they differ from the config.
+    :class:`~smjsindustry.finance.embedding.HashingEmbedding` is the fastest backend.
+    Tokens that occur fewer than ``min_count`` times in a document are ignored
+    with every backend. Wrapping a ``HashingEmbedding`` in a
+    :class:`~smjsindustry.finance.embedding.CachedEmbedding` keeps its sentence vectors
+    on disk, so the sentences repeated across the filings of an issuer are embedded once.
+
+    With ``sampling`` enabled in the config, the documents whose ``float32`` distance
+    matrix would not fit in ``max_memory_mb`` are summarized with CLARA: ``num_samples``
+    random samples of the sentences, as large as the budget allows, are clustered, and
+    the medoids that are closest to all the sentences are kept. The summaries have the
+    same number of sentences as with the exact algorithm.
+
+    Args:
+        summarizer_config (KMedoidsSummarizerConfig): The config of the summarizer.
+        embedding (SentenceEmbedding): The sentence embedding backend (default: None,
+            which uses a ``TfidfSvdEmbedding`` with the ``vector_size`` of the config).
+        random_state (int): The seed of the random medoid initializations (default: 0).
+
+    """
+
+    def __init__(
+        self,
+        summarizer_config: KMedoidsSummarizerConfig,
+        embedding: SentenceEmbedding = None,
+        random_state: int = 0,
+    ):
+        """Initializes a ``KMedoidsSummarizer`` instance.
+
+        Raises:
+            TypeError:
+
+                - if ``summarizer_config`` is not a ``KMedoidsSummarizerConfig``
+                - if ``embedding`` is not None and not a ``SentenceEmbedding``
+
+        """
+        if not isinstance(summarizer_config, KMedoidsSummarizerConfig):
+            raise TypeError("KMedoidsSummarizer requires a KMedoidsSummarizerConfig.")
+        if embedding is None:
+            embedding = TfidfSvdEmbedding(summarizer_config.vector_size)
+        if not isinstance(embedding, SentenceEmbedding):
+            raise TypeError("KMedoidsSummarizer requires embedding to be a SentenceEmbedding.")
+        if isinstance(embedding, Doc2VecEmbedding) and (
+            embedding.vector_size != summarizer_config.vector_size
+            or embedding.epochs != summarizer_config.epochs
+        ):
+            logger.warning(
+                "The Doc2VecEmbedding has vector_size %d and epochs %d, while the config has "
+                "vector_size %d and epochs %d; the embedding's are used.",
+                embedding.vector_size,
+                embedding.epochs,
+                summarizer_config.vector_size,
+                summarizer_config.epochs,
+            )
+        self._config = summarizer_config
+        self._embedding = embedding
+        self._random_state = random_state
+
+    @property
+    def config(self) -> KMedoidsSummarizerConfig:
+        """Gets the ``KMedoidsSummarizerConfig`` of the summarizer."""
+        return self._config
+
+    @property
+    def embedding(self) -> SentenceEmbedding:
+        """Gets the sentence embedding backend of the summarizer."""
+        return self._embedding
+
+    def summarize(self, text: str) -> str:
+        """Summarizes a document.
+
+        Args:
+            text (str): The document to be summarized.
+
+        Returns:
+            str: The summary sentences of the document, joined by spaces.
+        """
+        if not isinstance(text, str):
+            return ""
+        sentences = split_sentences(text)
+        selected = self.select_sentences(sentences)
+        return " ".join(sentences[i] for i in selected)
+
+    def embed_sentences(self, sentences: List[str]) -> np.ndarray:
+        """Embeds the sentences of a document, ignoring the tokens rarer than ``min_count``.
+
+        Args:
+            sentences (List[str]): The sentences of a document.
+
+        Returns:
+            numpy.ndarray: The vector of every sentence.
+        """
+        token_lists = [tokenize(sentence) for sentence in sentences]
+        if self._config.min_count > 1:
+            counts = Counter(token for tokens in token_lists for token in tokens)
+            token_lists = [
+                [token for token in tokens if counts[token] >= self._config.min_count]
+                for tokens in token_lists
+            ]
+        return self._embedding.embed(token_lists)
+
+    def select_sentences(self, sentences: List[str]) -> List[int]:
+        """Selects the medoid sentences of a document.
+
+        Args:
+            sentences (List[str]): The sentences of a document.
+
+        Returns:
+            List[int]: The positions of the summary sentences, in ascending order.
+        """
+        if len(sentences) <= self._config.summary_size:
+            return list(range(len(sentences)))
+        if self._config.summary_size == 0:
+            return []
+        vectors = self.embed_sentences(sentences)
+        sample_size = max_sample_size(self._config.max_memory_mb)
+        if self._config.sampling and len(sentences) > sample_size:
+            medoids = clara(
+                vectors,
+                self._config.summary_size,
+                self._config.metric,
+                sample_size,
+                num_samples=self._config.num_samples,
+                init=self._config.init,
+                random_state=self._random_state,
+            )
+            return medoids.tolist()
+        distances = pairwise_distances(vectors, self._config.metric)
+        medoids = kmedoids(
+            distances,
+            self._config.summary_size,
+            init=self._config.init,
+            random_state=self._random_state,
+        )
+        return medoids.tolist()
+
+
+class LocalSummarizer:
+    """Summarizes the documents of a dataframe in a pool of local processes.
+
+    It is the in-process counterpart of :class:`~smjsindustry.finance.processor.Summarizer`
+    for batches of short-to-medium documents, such as one filing section per row. The rows
+    are dispatched to the worker processes in chunks, so the inter-process communication
+    is paid once per chunk rather than once per document, and every worker builds its
+    summarizer once.
+
+    The k-medoids summarizers embed the sentences with ``embedding``, which every worker
+    receives a copy of. A :class:`~smjsindustry.finance.embedding.CachedEmbedding` is
+    reopened by its path in every worker, so the whole batch shares its cache, but the
+    ``hits`` and ``misses`` of the workers are not reported back.
+
+    Args:
+        n_jobs (int): The number of worker processes, or -1 to use all CPU cores
+            (default: 1, which summarizes in the current process).
+        chunksize (int): The number of documents sent to a worker at a time (default: None,
+            which splits the documents into four chunks per worker).
+        embedding (SentenceEmbedding): The sentence embedding backend of the k-medoids
+            summarizers (default: None, which uses the default of
+            :class:`~smjsindustry.finance.local_summarizer.KMedoidsSummarizer`).
+
+    """
+
+    def __init__(self, n_jobs: int = 1, chunksize: int = None, embedding: SentenceEmbedding = None):
+        """Initializes a ``LocalSummarizer`` instance.
+
+        Raises:
+            TypeError: if ``embedding`` is not None and not a ``SentenceEmbedding``.
+            ValueError:
+
+                - if ``n_jobs`` (int) is not a positive integer or -1
+                - if ``chunksize`` (int) is not None and not a positive integer
+
+        """
+        if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+            raise ValueError("n_jobs needs to be a positive integer or -1")
+        if chunksize is not None and (not isinstance(chunksize, int) or chunksize <= 0):
+            raise ValueError("chunksize needs to be a positive integer")
+        if embedding is not None and not isinstance(embedding, SentenceEmbedding):
+            raise TypeError("LocalSummarizer requires embedding to be a SentenceEmbedding.")
+        self._n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        self._chunksize = chunksize
+        self._embedding = embedding
+
+    def summarize(
+        self,
+        summarizer_config: Union[JaccardSummarizerConfig, KMedoidsSummarizerConfig],
+        text_column_name: str,
+        dataframe: pd.DataFrame,
+        new_summary_column_name: str = "summary",
+    ) -> pd.DataFrame:
+        """Summarizes the text column of a dataframe.
+
+        Args:
+            summarizer_config (Union[JaccardSummarizerConfig, KMedoidsSummarizerConfig]):
+                The config for the JaccardSummarizer or KMedoidsSummarizer.
+            text_column_name (str): The name for column containing text to be summarized.
+            dataframe (pandas.DataFrame): The dataframe containing the text to be summarized.
+            new_summary_column_name (str): The column name for the summary in the given
+                dataframe (default: ``"summary"``).
+
+        Returns:
+            pandas.DataFrame: A copy of the dataframe with the summaries, in the order of
+            its rows, in the ``new_summary_column_name`` column.
+
+        Raises:
+            TypeError:
+
+                - if ``summarizer_config`` is not a supported summarizer config
+                - if the summarizer has an ``embedding`` and ``summarizer_config`` is not
+                  a ``KMedoidsSummarizerConfig``
+
+        """
+        texts = dataframe[text_column_name].tolist()
+        summarizer = _create_summarizer(summarizer_config, self._embedding)
+        if self._n_jobs == 1 or len(texts) <= 1:
+            summaries = [summarizer.summarize(text) for text in texts]
+        else:
+            chunksize = self._chunksize or max(1, math.ceil(len(texts) / (4 * self._n_jobs)))
+            with ProcessPoolExecutor(
+                max_workers=self._n_jobs,
+                initializer=_initialize_worker,
+                initargs=(summarizer_config, self._embedding),
+            ) as executor:
+                summaries = list(executor.map(_summarize_in_worker, texts, chunksize=chunksize))
+        return dataframe.assign(**{new_summary_column_name: summaries})
+
+
+# The summarizer of a worker process of a LocalSummarizer.
+_worker_summarizer = None
+
+
+def _create_summarizer(
+    summarizer_config: Union[JaccardSummarizerConfig, KMedoidsSummarizerConfig],
+    embedding: SentenceEmbedding = None,
+) -> Union[JaccardSummarizer, KMedoidsSummarizer]:
+    """Creates the local summarizer for a summarizer config.
+
+    Raises:
+        TypeError: if ``summarizer_config`` is not a supported summarizer config, or
+            ``embedding`` is given for a config that is not a ``KMedoidsSummarizerConfig``.
+    """
+    if isinstance(summarizer_config, KMedoidsSummarizerConfig):
+        return KMedoidsSummarizer(summarizer_config, embedding=embedding)
+    if embedding is not None:
+        raise TypeError(
+            "LocalSummarizer only supports an embedding with a KMedoidsSummarizerConfig."
+        )
+    if isinstance(summarizer_config, JaccardSummarizerConfig):
+        return JaccardSummarizer(summarizer_config)
+    raise TypeError("LocalSummarizer does not support {}.".format(type(summarizer_config).__name__))
+
+
+def _initialize_worker(
+    summarizer_config: Union[JaccardSummarizerConfig, KMedoidsSummarizerConfig],
+    embedding: SentenceEmbedding,
+):
+    """Creates the summarizer of a worker process once."""
+    global _worker_summarizer  # pylint: disable=global-statement
+    _worker_summarizer = _create_summarizer(summarizer_config, embedding)
+
+
+def _summarize_in_worker(text: str) -> str:
+    """Summarizes a document with the summarizer of the worker process."""
+    return _worker_summarizer.summarize(text)
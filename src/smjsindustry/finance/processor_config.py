@@ -96,6 +96,19 @@ class JaccardSummarizerConfig(FinanceProcessorConfig):
         max_tokens (int): The max number of tokens in the summary (default: 0).
         cutoff (float): The similarity cut off (default: 0.0).
         vocabulary (Set[str]): A set of sentiment words (default: None).
+        approximate (bool): Whether the local
+            :class:`~smjsindustry.finance.local_summarizer.JaccardSummarizer` estimates the
+            similarities with MinHash signatures and locality-sensitive hashing instead of
+            computing them exactly. This trades some accuracy for speed on documents with
+            tens of thousands of sentences. The processing job always computes the exact
+            similarities (default: False).
+        num_perm (int): The number of MinHash permutations of an approximate
+            summarizer. More permutations give less noisy similarities and are slower
+            (default: 128; 256 with 64 bands is about twice as slow and more accurate).
+        num_bands (int): The number of locality-sensitive hashing bands of an approximate
+            summarizer. It must divide ``num_perm``. More bands compare more of the similar
+            sentence pairs exactly and are slower; beyond ``num_perm / 4`` bands they
+            rarely help (default: 32).
 
     """
 
@@ -106,6 +119,9 @@ class JaccardSummarizerConfig(FinanceProcessorConfig):
         max_tokens: int = 0,
         cutoff: float = 0.0,
         vocabulary: Set[str] = None,
+        approximate: bool = False,
+        num_perm: int = 128,
+        num_bands: int = 32,
     ):
         """Initializes a ``JaccardSummarizerConfig`` instance.
 
@@ -118,6 +134,9 @@ class JaccardSummarizerConfig(FinanceProcessorConfig):
                 - if ``cutoff`` (float) is not a float
                 - if ``vocabulary`` (Set[str]) is not None and not a set Or any item
                      in the set is not a string
+                - if ``approximate`` (bool) is not a boolean
+                - if ``num_perm`` (int) is not an integer
+                - if ``num_bands`` (int) is not an integer
 
             ValueError:
 
@@ -125,6 +144,8 @@ class JaccardSummarizerConfig(FinanceProcessorConfig):
                 - if ``summary_percentage`` (float) is not in the range of 0 to 1
                 - if ``max_tokens`` (int) is not a non-negative integer
                 - if ``cutoff`` (float) is not in the range of 0 to 1
+                - if ``num_perm`` (int) is not a positive integer
+                - if ``num_bands`` (int) is not a positive divisor of ``num_perm``
 
         """
         super().__init__(JACCARD_SUMMARIZER)
@@ -166,11 +187,26 @@ class JaccardSummarizerConfig(FinanceProcessorConfig):
                 raise TypeError(
                     "JaccardSummarizerConfig requires vocabulary to be a set of strings."
                 )
+        if not isinstance(approximate, bool):
+            raise TypeError("JaccardSummarizerConfig requires approximate to be a boolean.")
+        if not isinstance(num_perm, int):
+            raise TypeError("JaccardSummarizerConfig requires num_perm to be an integer.")
+        if num_perm <= 0:
+            raise ValueError("JaccardSummarizerConfig requires num_perm to be a positive integer.")
+        if not isinstance(num_bands, int):
+            raise TypeError("JaccardSummarizerConfig requires num_bands to be an integer.")
+        if num_bands <= 0 or num_perm % num_bands:
+            raise ValueError(
+                "JaccardSummarizerConfig requires num_bands to be a positive divisor of num_perm."
+            )
         self._summary_size = summary_size
         self._summary_percentage = summary_percentage
         self._max_tokens = max_tokens
         self._cutoff = cutoff
         self._vocabulary = vocabulary
+        self._approximate = approximate
+        self._num_perm = num_perm
+        self._num_bands = num_bands
 
     def get_config(self) -> Dict[str, Union[str, int, float, Set[str]]]:
         """Returns the config to be passed to a SageMaker JumpStart Industry Summarizer instance."""
@@ -208,6 +244,21 @@ class JaccardSummarizerConfig(FinanceProcessorConfig):
         """Gets the value of the ``vocabulary`` parameter."""
         return self._vocabulary
 
+    @property
+    def approximate(self) -> bool:
+        """Gets the value of the ``approximate`` parameter."""
+        return self._approximate
+
+    @property
+    def num_perm(self) -> int:
+        """Gets the value of the ``num_perm`` parameter."""
+        return self._num_perm
+
+    @property
+    def num_bands(self) -> int:
+        """Gets the value of the ``num_bands`` parameter."""
+        return self._num_bands
+
 
 class KMedoidsSummarizerConfig(FinanceProcessorConfig):
     """Configuration class for ``KMedoidsSummarizer``.
@@ -257,6 +308,13 @@ class KMedoidsSummarizerConfig(FinanceProcessorConfig):
             Possible values are ``'random'``, ``'heuristic'``,
             ``'k-medoids++'``, ``'build'``
             (default: ``'heuristic'``).
+        sampling (bool): Whether the local
+            :class:`~smjsindustry.finance.local_summarizer.KMedoidsSummarizer` clusters
+            random samples of the sentences of the documents whose distance matrix would
+            exceed ``max_memory_mb`` (default: False). The processing job ignores it.
+        num_samples (int): The number of samples clustered in the sampling mode (default: 5).
+        max_memory_mb (int): The memory budget of the distance matrices in megabytes in
+            the sampling mode (default: 256).
 
     """
 
@@ -268,6 +326,9 @@ class KMedoidsSummarizerConfig(FinanceProcessorConfig):
         epochs: int = 60,
         metric: str = "euclidean",
         init: str = "heuristic",
+        sampling: bool = False,
+        num_samples: int = 5,
+        max_memory_mb: int = 256,
     ):
         """Initializes a ``KMedoidsSummarizerConfig`` instance.
 
@@ -280,6 +341,9 @@ class KMedoidsSummarizerConfig(FinanceProcessorConfig):
                 - if ``epochs`` (int) is not an integer
                 - if ``metric`` (str) is not a string
                 - if ``init`` (str) is not a string
+                - if ``sampling`` (bool) is not a boolean
+                - if ``num_samples`` (int) is not an integer
+                - if ``max_memory_mb`` (int) is not an integer
 
             ValueError:
 
@@ -289,6 +353,8 @@ class KMedoidsSummarizerConfig(FinanceProcessorConfig):
                 - if ``epochs`` (int) is not a positive integer
                 - if ``metric`` (str) is not from KMEDOIDS_SUMMARIZER_METRIC_VALUES
                 - if ``init`` (str) is not from KMEDOIDS_SUMMARIZER_INIT_VALUES
+                - if ``num_samples`` (int) is not a positive integer
+                - if ``max_memory_mb`` (int) is not a positive integer
 
         """
         super().__init__(KMEDOIDS_SUMMARIZER)
@@ -322,12 +388,29 @@ class KMedoidsSummarizerConfig(FinanceProcessorConfig):
             raise TypeError("KMedoidsSummarizerConfig requires init to be a string.")
         if init not in KMEDOIDS_SUMMARIZER_INIT_VALUES:
             raise ValueError(f"{init} not valid.")
+        if not isinstance(sampling, bool):
+            raise TypeError("KMedoidsSummarizerConfig requires sampling to be a boolean.")
+        if not isinstance(num_samples, int):
+            raise TypeError("KMedoidsSummarizerConfig requires num_samples to be an integer.")
+        if num_samples <= 0:
+            raise ValueError(
+                "KMedoidsSummarizerConfig requires num_samples to be a positive integer."
+            )
+        if not isinstance(max_memory_mb, int):
+            raise TypeError("KMedoidsSummarizerConfig requires max_memory_mb to be an integer.")
+        if max_memory_mb <= 0:
+            raise ValueError(
+                "KMedoidsSummarizerConfig requires max_memory_mb to be a positive integer."
+            )
         self._summary_size = summary_size
         self._vector_size = vector_size
         self._min_count = min_count
         self._epochs = epochs
         self._metric = metric
         self._init = init
+        self._sampling = sampling
+        self._num_samples = num_samples
+        self._max_memory_mb = max_memory_mb
 
     def get_config(self) -> Dict[str, Union[str, int]]:
         """Returns the config to be passed to a SageMaker JumpStart Industry Summarizer instance."""
@@ -371,6 +454,21 @@ class KMedoidsSummarizerConfig(FinanceProcessorConfig):
         """Gets the value of the ``init`` parameter."""
         return self._init
 
+    @property
+    def sampling(self) -> bool:
+        """Gets the value of the ``sampling`` parameter."""
+        return self._sampling
+
+    @property
+    def num_samples(self) -> int:
+        """Gets the value of the ``num_samples`` parameter."""
+        return self._num_samples
+
+    @property
+    def max_memory_mb(self) -> int:
+        """Gets the value of the ``max_memory_mb`` parameter."""
+        return self._max_memory_mb
+
 
 class NLPScorerConfig(FinanceProcessorConfig):
     """Config class for :class:`~smjsindustry.finance.processor.NLPScorer`.
@@ -0,0 +1,115 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""The readability module of the local SageMaker JumpStart Industry NLP scorer.
+
+It counts the syllables of English words and computes the Gunning-Fog index.
+The syllables are looked up in a table generated from the CMU Pronouncing Dictionary
+by ``scripts/generate_syllable_table.py``.
+"""
+from __future__ import absolute_import
+
+import gzip
+import os
+import re
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+
+from smjsindustry.finance.constants import STEM_CACHE_SIZE, SYLLABLE_TABLE_FILE
+
+# The number of syllables from which a word is complex in the Gunning-Fog index.
+COMPLEX_WORD_SYLLABLES = 3
+
+_VOWEL_GROUP_PATTERN = re.compile(r"[aeiouy]+")
+# The vowel pairs that are pronounced as two syllables, such as in "radio", "medium",
+# "actual" and "easier", but not in "nation", "financial" or "equal".
+_SPLIT_VOWELS_PATTERN = re.compile(r"[^aeioucgstx]i[aou]|(?<![aeiouq])ua|ie(?:r|st)$")
+# The final e, es and ed that are silent, such as in "income", "rates" and "based",
+# but not in "table", "prices", "changes" or "reported".
+_SILENT_SUFFIX_PATTERN = re.compile(
+    r"(?:[^aeiouyl]|[aeiouy]l)e$|(?:[^aeiouylsxzcg]|[aeiouy]l)es$|[^aeioutdy]ed$"
+)
+# The silent e before a suffix, such as in "management" and "completely".
+_SILENT_INNER_E_PATTERN = re.compile(r"[aeiouy][^aeiouy]e(?:ment|ly|ness|ful)s?$")
+
+
+@lru_cache(maxsize=None)
+def syllable_table() -> Dict[str, int]:
+    """Loads the syllables of the English vocabulary, once per process.
+
+    The table has the syllables of the first pronunciation of the about 117,000 words of
+    ASCII letters of the CMU Pronouncing Dictionary.
+
+    Returns:
+        Dict[str, int]: The number of syllables of every lower-cased word of the table.
+    """
+    table = {}
+    path = os.path.join(os.path.dirname(__file__), SYLLABLE_TABLE_FILE)
+    with gzip.open(path, "rt", encoding="utf-8") as table_file:
+        for line in table_file:
+            if not line.startswith("#"):
+                word, syllables = line.split()
+                table[word] = int(syllables)
+    return table
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """Counts the syllables of a lower-cased English word.
+
+    The words of :func:`syllable_table` are looked up. The syllables of the other words,
+    such as company names and acronyms, are estimated from their vowel groups, with
+    corrections for silent final ``e``, ``es`` and ``ed``, a silent ``e`` before suffixes
+    such as ``ment``, and vowel pairs that are pronounced separately, such as in ``radio``.
+
+    Args:
+        word (str): A lower-cased word of ASCII letters.
+
+    Returns:
+        int: The number of syllables, at least 1.
+    """
+    syllables = syllable_table().get(word)
+    if syllables is not None:
+        return syllables
+    syllables = len(_VOWEL_GROUP_PATTERN.findall(word))
+    syllables += len(_SPLIT_VOWELS_PATTERN.findall(word))
+    if syllables > 1 and _SILENT_SUFFIX_PATTERN.search(word):
+        syllables -= 1
+    if syllables > 1 and _SILENT_INNER_E_PATTERN.search(word):
+        syllables -= 1
+    return max(syllables, 1)
+
+
+def gunning_fog(
+    word_counts: np.ndarray, sentence_counts: np.ndarray, complex_word_counts: np.ndarray
+) -> np.ndarray:
+    """Computes the Gunning-Fog index of documents from their token statistics.
+
+    The index is ``0.4 * (words / sentences + 100 * complex words / words)``, where the
+    complex words have at least ``COMPLEX_WORD_SYLLABLES`` syllables.
+
+    Args:
+        word_counts (numpy.ndarray): The number of words of every document.
+        sentence_counts (numpy.ndarray): The number of sentences of every document.
+        complex_word_counts (numpy.ndarray): The number of complex words of every document.
+
+    Returns:
+        numpy.ndarray: The index of every document, 0 for the documents without words.
+    """
+    word_counts = np.asarray(word_counts, dtype=np.float64)
+    words = np.maximum(word_counts, 1)
+    index = 0.4 * (
+        word_counts / np.maximum(sentence_counts, 1) + 100 * np.asarray(complex_word_counts) / words
+    )
+    return np.where(word_counts > 0, index, 0.0)
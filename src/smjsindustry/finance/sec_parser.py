@@ -0,0 +1,897 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""The local SEC filing parser module of SageMaker JumpStart Industry.
+
+The parser in this module reads EDGAR full-submission files in the current Python
+process instead of a SageMaker Processing job.
+"""
+from __future__ import absolute_import
+
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from smjsindustry.finance.constants import SEC_PARSER_BATCH_SIZE
+
+logger = logging.getLogger()
+
+# The columns of the dataframes of parsed filings, which match those of the DataLoader.
+SEC_FILING_COLUMNS = ["ticker", "form_type", "accession_number", "filing_date", "text"]
+# The columns of the header indexes of submission files.
+SEC_HEADER_INDEX_COLUMNS = [
+    "accession_number",
+    "form_type",
+    "filing_date",
+    "cik",
+    "company_name",
+    "fiscal_year_end",
+    "file_path",
+]
+
+_HEADER_START_TAGS = (b"<SEC-HEADER>", b"<IMS-HEADER>")
+_HEADER_END_TAGS = (b"</SEC-HEADER>", b"</IMS-HEADER>")
+_DOCUMENT_FIELD_TAGS = {
+    b"<TYPE>": "type",
+    b"<SEQUENCE>": "sequence",
+    b"<FILENAME>": "filename",
+    b"<DESCRIPTION>": "description",
+}
+# A header field such as "ACCESSION NUMBER:\t\t0000949377-21-000112", or a header tag
+# such as "<ACCEPTANCE-DATETIME>20210430163407".
+_HEADER_FIELD_PATTERN = re.compile(r"^\s*(?:<([A-Z0-9-]+)>|([A-Z0-9 ()/&.,-]+):)\s*(.*?)\s*$")
+# The lines of the SGML markup of the plain text documents, such as "<PAGE>".
+_SGML_LINE_PATTERN = re.compile(r"^\s*</?(?:PAGE|TABLE|CAPTION|S|C|FN)>\s*$", re.IGNORECASE)
+_LINE_BREAKS_PATTERN = re.compile(r"\s*\n\s*")
+_SPACES_PATTERN = re.compile(r"[ \t\r\f\v\xa0]+")
+# The HTML elements that start a new line of text.
+_BLOCK_TAGS = frozenset(
+    "address article aside blockquote br caption dd div dl dt footer h1 h2 h3 h4 h5 h6 header "
+    "hr li ol p pre section table tbody td th thead tr ul".split()
+)
+_SKIPPED_TAGS = frozenset(["head", "script", "style", "title"])
+_MANIFEST_FILE_NAME = "_manifest.json"
+# The header fields of the header indexes, by column.
+_HEADER_INDEX_FIELDS = {
+    b"ACCESSION NUMBER": "accession_number",
+    b"CONFORMED SUBMISSION TYPE": "form_type",
+    b"FILED AS OF DATE": "filing_date",
+    b"CENTRAL INDEX KEY": "cik",
+    b"COMPANY CONFORMED NAME": "company_name",
+    b"FISCAL YEAR END": "fiscal_year_end",
+}
+_HEADER_INDEX_PATTERN = re.compile(
+    rb"^[ \t]*(" + b"|".join(_HEADER_INDEX_FIELDS) + rb"):[ \t]*(.*?)[ \t\r]*$", re.MULTILINE
+)
+# The number of bytes read at a time until the end of a header, which fits most headers.
+_HEADER_READ_SIZE = 16384
+_PART_FILE_PATTERN = re.compile(r"^part-(\d+)\.(?:csv|parquet)$")
+
+
+def iter_submission(lines: Iterable[bytes]) -> Iterator[Tuple[Dict[str, str], Dict[str, str]]]:
+    """Parses the lines of an EDGAR full-submission file incrementally.
+
+    The ``<SEC-HEADER>`` of the submission is parsed first, then every ``<DOCUMENT>`` is
+    converted to plain text and yielded as soon as its ``</DOCUMENT>`` line is read, so
+    only the text of one document is held in memory at a time. The HTML documents are
+    converted to plain text, and the uuencoded documents, such as images and PDF files,
+    are skipped line by line without being decoded.
+
+    Args:
+        lines (Iterable[bytes]): The lines of the submission, such as a file opened in
+            binary mode.
+
+    Yields:
+        Tuple[Dict[str, str], Dict[str, str]]: The header and a document of the submission.
+        The header maps the lower-cased field names, such as ``"accession_number"``,
+        ``"conformed_submission_type"``, ``"filed_as_of_date"`` and
+        ``"central_index_key"``, to the value of their first occurrence. The document has
+        the ``"type"``, ``"sequence"``, ``"filename"``, ``"description"`` and ``"text"``
+        keys, with an empty text for the uuencoded documents.
+    """
+    header = {}
+    document = None
+    text = None
+    in_header = False
+    for line in lines:
+        if text is not None:
+            if line.startswith(b"</TEXT>"):
+                document["text"] = text.close()
+                text = None
+            else:
+                text.feed(line)
+        elif in_header:
+            if line.startswith(_HEADER_END_TAGS):
+                in_header = False
+            else:
+                _parse_header_line(line, header)
+        elif line.startswith(b"<DOCUMENT>"):
+            document = _new_document()
+        elif line.startswith(b"</DOCUMENT>"):
+            if document is not None:
+                yield header, document
+            document = None
+        elif line.startswith(b"<TEXT>"):
+            if document is not None:
+                text = _DocumentText()
+        elif line.startswith(_HEADER_START_TAGS):
+            in_header = True
+        elif document is not None:
+            _parse_document_line(line, document)
+
+
+class LocalSECFilingParser:
+    """Parses EDGAR full-submission files in-process.
+
+    It is the in-process counterpart of
+    :class:`~smjsindustry.finance.processor.SECXMLFilingParser` and launches no
+    processing job. Every submission file is memory-mapped, and only the documents of the
+    requested types are decoded, so in a submission of hundreds of megabytes, most of which
+    are usually uuencoded images and exhibits, the skipped documents are never read into
+    memory. The documents are parsed like those of :func:`iter_submission`.
+
+    The submissions of a directory are parsed by a pool of worker processes, one
+    submission per task, with a bounded number of tasks in flight.
+
+    Args:
+        n_jobs (int): The number of worker processes, or -1 to use all CPU cores
+            (default: 1, which parses in the current process).
+
+    """
+
+    def __init__(self, n_jobs: int = 1):
+        """Initializes a ``LocalSECFilingParser`` instance.
+
+        Raises:
+            ValueError: if ``n_jobs`` (int) is not a positive integer or -1.
+        """
+        if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+            raise ValueError("n_jobs needs to be a positive integer or -1")
+        self._n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+
+    def iter_documents(
+        self, file_path: str, document_types: Optional[List[str]] = None
+    ) -> Iterator[Tuple[Dict[str, str], Dict[str, str]]]:
+        """Parses the documents of an EDGAR full-submission file one at a time.
+
+        The file is memory-mapped, and the boundaries of its documents are located by
+        a byte-level search for their tags. Only the documents of the requested types are
+        decoded, and the text of the other documents is never read into memory.
+
+        Args:
+            file_path (str): The path of the submission file.
+            document_types (List[str]): The types of the documents to parse, such as
+                ``["10-K", "EX-21.1"]``, or None for all the documents (default: None).
+
+        Yields:
+            Tuple[Dict[str, str], Dict[str, str]]: The header and a document of the
+            submission, as yielded by :func:`iter_submission`.
+        """
+        with _MappedSubmission(file_path) as submission:
+            for document in submission.documents(document_types):
+                yield submission.header, document
+
+    def parse_file(
+        self, file_path: str, document_types: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """Parses an EDGAR full-submission file into a row of the parsed filings.
+
+        Args:
+            file_path (str): The path of the submission file.
+            document_types (List[str]): The types of the documents whose text is the text
+                of the filing, or None for the type of the submission, such as the ``10-K``
+                document of a ``10-K`` submission without the exhibits. If no document has
+                the type of the submission, such as a ``497K`` document in a submission of
+                type ``497K/A``, the first document is used and a warning is logged
+                (default: None).
+
+        Returns:
+            Dict[str, str]: The ``SEC_FILING_COLUMNS`` values of the filing. The ticker
+            is the central index key (CIK) of the filer, because the submissions do not
+            contain the ticker of the company.
+
+        Raises:
+            ValueError: if the file has no SEC header.
+        """
+        with _MappedSubmission(file_path) as submission:
+            header = submission.header
+            if "accession_number" not in header:
+                raise ValueError("{} is not an EDGAR full-submission file.".format(file_path))
+            if document_types is not None:
+                texts = [document["text"] for document in submission.documents(document_types)]
+                return _filing_row(header, texts)
+            submission_type = header.get("conformed_submission_type")
+            texts = [document["text"] for document in submission.documents([submission_type])]
+            if not texts:
+                # The first document of a submission is its main document.
+                document = next(submission.documents(), None)
+                if document is not None:
+                    logger.warning(
+                        "%s has no %s document, using its first document of type %s",
+                        file_path,
+                        submission_type,
+                        document["type"],
+                    )
+                    texts = [document["text"]]
+        return _filing_row(header, texts)
+
+    def parse(
+        self, input_data_path: str, document_types: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Parses EDGAR full-submission files into a dataframe.
+
+        Args:
+            input_data_path (str): The path of a submission file, or of a directory
+                whose ``.txt`` submission files, including those of its subdirectories,
+                are to be parsed.
+            document_types (List[str]): The types of the documents whose text is the text
+                of a filing, or None for the type of its submission, as in :meth:`parse_file`
+                (default: None).
+
+        Returns:
+            pandas.DataFrame: A dataframe with a row of the ``SEC_FILING_COLUMNS`` columns
+            for every submission, in the order of the files, directory by directory.
+
+        Raises:
+            ValueError: if a file has no SEC header.
+        """
+        rows = []
+        for _, row, error in self._parse_files(_submission_files(input_data_path), document_types):
+            if error is not None:
+                raise error
+            rows.append(row)
+        return pd.DataFrame(rows, columns=SEC_FILING_COLUMNS)
+
+    def parse_directory(
+        self,
+        input_data_path: str,
+        output_file_path: str,
+        document_types: Optional[List[str]] = None,
+        batch_size: int = SEC_PARSER_BATCH_SIZE,
+    ) -> Dict[str, str]:
+        """Parses a directory of EDGAR full-submission files into a CSV or Parquet file.
+
+        The parsed filings are written ``batch_size`` rows at a time, as a row group of
+        a Parquet file or rows appended to a CSV file, so the memory in use depends on the
+        batch size and the number of workers but not on the number of files. A file that
+        fails to parse is logged and skipped instead of stopping the other files.
+
+        Args:
+            input_data_path (str): The path of a directory whose ``.txt`` submission files,
+                including those of its subdirectories, are to be parsed.
+            output_file_path (str): The path of the output ``.csv`` or ``.parquet`` file,
+                which is overwritten.
+            document_types (List[str]): The types of the documents whose text is the text
+                of a filing, or None for the type of its submission, as in :meth:`parse_file`
+                (default: None).
+            batch_size (int): The number of rows written at a time
+                (default: SEC_PARSER_BATCH_SIZE).
+
+        Returns:
+            Dict[str, str]: The error message of every file that failed to parse, by path.
+
+        Raises:
+            ValueError:
+
+                - if ``output_file_path`` (str) is not a ``.csv`` or ``.parquet`` file
+                - if ``batch_size`` (int) is not a positive integer
+
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size needs to be a positive integer")
+        writer = _FilingWriter(output_file_path)
+        failures = {}
+        rows = []
+        rows_written = 0
+        try:
+            for file_path, row, error in self._parse_files(
+                _submission_files(input_data_path), document_types
+            ):
+                if error is not None:
+                    logger.warning("Failed to parse %s: %s", file_path, error)
+                    failures[file_path] = str(error)
+                    continue
+                rows.append(row)
+                if len(rows) == batch_size:
+                    writer.write(rows)
+                    rows_written += len(rows)
+                    rows = []
+            writer.write(rows)
+            rows_written += len(rows)
+        finally:
+            writer.close()
+        logger.info(
+            "Parsed %d filings of %s, %d failed", rows_written, input_data_path, len(failures)
+        )
+        return failures
+
+    def update_directory(
+        self,
+        input_data_path: str,
+        output_path: str,
+        file_format: str = "parquet",
+        document_types: Optional[List[str]] = None,
+        batch_size: int = SEC_PARSER_BATCH_SIZE,
+        manifest_file_path: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Parses the new and changed submission files of a directory into part files.
+
+        The output is a directory of ``part-NNNNN`` CSV or Parquet files of at most
+        ``batch_size`` parsed filings, and a JSON manifest that maps the accession number
+        of every parsed filing to the path, the BLAKE2b hash, the modification time and
+        the size of its file, and to the part file of its row. On every run, a file whose
+        modification time and size are those of the manifest is skipped without being
+        read, and a file whose hash is in the manifest is skipped after being hashed. The
+        other files are parsed into new part files, and the previous rows of their
+        accession numbers, and those of the files that were removed, are deleted from
+        the part files that contain them. A re-run therefore only reads the files and
+        rewrites the part files affected by the changes.
+
+        A file that fails to parse is logged and skipped, and keeps the row and the
+        manifest entry of its last successful parse, so it is parsed again on the next run.
+
+        Args:
+            input_data_path (str): The path of a directory whose ``.txt`` submission files,
+                including those of its subdirectories, are to be parsed.
+            output_path (str): The directory of the part files, which is created if needed.
+            file_format (str): The format of the part files, ``"csv"`` or ``"parquet"``
+                (default: ``"parquet"``).
+            document_types (List[str]): The types of the documents whose text is the text
+                of a filing, or None for the type of its submission, as in :meth:`parse_file`
+                (default: None).
+            batch_size (int): The maximum number of rows of a part file
+                (default: SEC_PARSER_BATCH_SIZE).
+            manifest_file_path (str): The path of the manifest (default: None, which
+                keeps the manifest in ``_manifest.json`` of ``output_path``).
+
+        Returns:
+            Dict[str, str]: The error message of every file that failed to parse, by path.
+
+        Raises:
+            ValueError:
+
+                - if ``file_format`` (str) is not ``"csv"`` or ``"parquet"``
+                - if ``batch_size`` (int) is not a positive integer
+
+        """
+        if file_format not in ("csv", "parquet"):
+            raise ValueError("file_format needs to be csv or parquet")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size needs to be a positive integer")
+        os.makedirs(output_path, exist_ok=True)
+        if manifest_file_path is None:
+            manifest_file_path = os.path.join(output_path, _MANIFEST_FILE_NAME)
+        manifest = {}
+        if os.path.exists(manifest_file_path):
+            with open(manifest_file_path) as manifest_file:
+                manifest = json.load(manifest_file)
+        previous_outputs = {accession: entry["output"] for accession, entry in manifest.items()}
+        by_path = {entry["file_path"]: accession for accession, entry in manifest.items()}
+        by_hash = {entry["hash"]: accession for accession, entry in manifest.items()}
+
+        unchanged = set()
+        changed = {}
+        for file_path in _submission_files(input_data_path):
+            stat = os.stat(file_path)
+            accession = by_path.get(file_path)
+            if accession is not None and (
+                manifest[accession]["mtime_ns"] == stat.st_mtime_ns
+                and manifest[accession]["size"] == stat.st_size
+            ):
+                unchanged.add(accession)
+                continue
+            digest = _file_hash(file_path)
+            accession = by_hash.get(digest)
+            if accession is not None:
+                # The file was touched or moved, but its content was already parsed.
+                manifest[accession].update(
+                    file_path=file_path, mtime_ns=stat.st_mtime_ns, size=stat.st_size
+                )
+                unchanged.add(accession)
+                continue
+            changed[file_path] = {
+                "file_path": file_path,
+                "hash": digest,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+            }
+
+        failures = {}
+        parsed = set()
+        rows = []
+        part_numbers = [
+            int(match.group(1))
+            for match in map(_PART_FILE_PATTERN.match, os.listdir(output_path))
+            if match is not None
+        ]
+        part_number = max(part_numbers, default=-1)
+        for file_path, row, error in self._parse_files(changed, document_types):
+            if error is not None:
+                logger.warning("Failed to parse %s: %s", file_path, error)
+                failures[file_path] = str(error)
+                if file_path in by_path:
+                    unchanged.add(by_path[file_path])
+                continue
+            rows.append(row)
+            parsed.add(row["accession_number"])
+            manifest[row["accession_number"]] = changed[file_path]
+            if len(rows) == batch_size:
+                part_number += 1
+                _write_part(output_path, part_number, file_format, rows, manifest)
+                rows = []
+        if rows:
+            part_number += 1
+            _write_part(output_path, part_number, file_format, rows, manifest)
+
+        stale = {}
+        for accession, part_name in previous_outputs.items():
+            if accession in parsed or accession not in unchanged:
+                stale.setdefault(part_name, set()).add(accession)
+            if accession not in parsed and accession not in unchanged:
+                del manifest[accession]
+        for part_name, accessions in stale.items():
+            _remove_rows(os.path.join(output_path, part_name), accessions)
+
+        temporary_path = manifest_file_path + ".tmp"
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temporary_path, manifest_file_path)
+        logger.info(
+            "Parsed %d new or changed filings of %s, %d unchanged, %d failed",
+            len(parsed),
+            input_data_path,
+            len(unchanged),
+            len(failures),
+        )
+        return failures
+
+    def index_headers(
+        self, input_data_path: str, output_file_path: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Indexes the SEC headers of submission files without parsing their documents.
+
+        Every file is read in blocks of 16 KB until the end of its ``<SEC-HEADER>``, which
+        usually fits in the first block, and only the indexed fields of the header are
+        extracted, so the cost of a file does not depend on the size of its documents.
+        The files are read by the worker processes in chunks of paths.
+
+        The index is a columnar dataframe, which can be saved as a Parquet file and
+        queried with the filters of :func:`pandas.read_parquet`, for example
+        ``pd.read_parquet(path, filters=[("form_type", "==", "10-K")])``.
+
+        Args:
+            input_data_path (str): The path of a submission file, or of a directory
+                whose ``.txt`` submission files, including those of its subdirectories,
+                are to be indexed.
+            output_file_path (str): The path of a ``.csv`` or ``.parquet`` file to save the
+                index to, which is overwritten (default: None, which does not save it).
+
+        Returns:
+            pandas.DataFrame: A dataframe with a row of the ``SEC_HEADER_INDEX_COLUMNS``
+            columns for every file with an SEC header, in the order of the files. The
+            ``form_type`` column is categorical and the ``filing_date`` column holds
+            dates. The files without an SEC header are logged and skipped.
+
+        Raises:
+            ValueError: if ``output_file_path`` (str) is not a ``.csv`` or ``.parquet`` file.
+        """
+        if output_file_path is not None and not output_file_path.endswith((".csv", ".parquet")):
+            raise ValueError("output_file_path needs to be a .csv or .parquet file")
+        file_paths = list(_submission_files(input_data_path))
+        if self._n_jobs == 1 or len(file_paths) <= 1:
+            rows = [_read_header_row(file_path) for file_path in file_paths]
+        else:
+            chunksize = max(1, math.ceil(len(file_paths) / (4 * self._n_jobs)))
+            with ProcessPoolExecutor(max_workers=self._n_jobs) as executor:
+                rows = list(executor.map(_read_header_row, file_paths, chunksize=chunksize))
+        index = pd.DataFrame.from_records(
+            [row for row in rows if row is not None], columns=SEC_HEADER_INDEX_COLUMNS
+        )
+        skipped = len(rows) - len(index)
+        if skipped:
+            logger.warning("Skipped %d files of %s without an SEC header", skipped, input_data_path)
+        index["form_type"] = index["form_type"].astype("category")
+        index["filing_date"] = pd.to_datetime(
+            index["filing_date"], format="%Y%m%d", errors="coerce"
+        )
+        if output_file_path is not None:
+            if output_file_path.endswith(".parquet"):
+                index.to_parquet(output_file_path, index=False)
+            else:
+                index.to_csv(output_file_path, index=False)
+        return index
+
+    def _parse_files(
+        self, file_paths: Iterable[str], document_types: Optional[List[str]]
+    ) -> Iterator[Tuple[str, Optional[Dict[str, str]], Optional[Exception]]]:
+        """Parses files in order, in the worker processes if there are several.
+
+        At most two tasks per worker are in flight, so the parsed rows waiting to be
+        consumed are bounded.
+
+        Yields:
+            tuple: The path, the row or None, and the error or None of every file.
+        """
+        if self._n_jobs == 1:
+            for file_path in file_paths:
+                yield (file_path,) + _parse_in_worker(file_path, document_types)
+            return
+        with ProcessPoolExecutor(max_workers=self._n_jobs) as executor:
+            pending = deque()
+            for file_path in file_paths:
+                pending.append(
+                    (file_path, executor.submit(_parse_in_worker, file_path, document_types))
+                )
+                if len(pending) >= 2 * self._n_jobs:
+                    file_path, future = pending.popleft()
+                    yield (file_path,) + future.result()
+            while pending:
+                file_path, future = pending.popleft()
+                yield (file_path,) + future.result()
+
+
+def _parse_in_worker(
+    file_path: str, document_types: Optional[List[str]]
+) -> Tuple[Optional[Dict[str, str]], Optional[Exception]]:
+    """Parses a submission file, returning its error instead of raising it."""
+    try:
+        return LocalSECFilingParser().parse_file(file_path, document_types), None
+    except Exception as error:  # pylint: disable=broad-except
+        return None, error
+
+
+def _read_header_row(file_path: str) -> Optional[Tuple[str, ...]]:
+    """Reads the indexed header fields of a submission file, stopping at the header's end.
+
+    Returns:
+        tuple: The ``SEC_HEADER_INDEX_COLUMNS`` values of the file, or None if the file
+        has no SEC header.
+    """
+    with open(file_path, "rb") as file:
+        data = file.read(_HEADER_READ_SIZE)
+        if not any(tag in data for tag in _HEADER_START_TAGS):
+            return None
+        end = -1
+        while True:
+            end = max(data.find(tag) for tag in _HEADER_END_TAGS)
+            if end >= 0 or b"<DOCUMENT>" in data:
+                break
+            block = file.read(_HEADER_READ_SIZE)
+            if not block:
+                break
+            data += block
+    fields = {}
+    for name, value in _HEADER_INDEX_PATTERN.findall(data if end < 0 else data[:end]):
+        fields.setdefault(_HEADER_INDEX_FIELDS[name], value)
+    if "accession_number" not in fields:
+        return None
+    return tuple(
+        _decode(fields.get(column, b"")) if column != "file_path" else file_path
+        for column in SEC_HEADER_INDEX_COLUMNS
+    )
+
+
+def _file_hash(file_path: str) -> str:
+    """Hashes the content of a file with BLAKE2b, reading it one megabyte at a time."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_part(
+    output_path: str,
+    part_number: int,
+    file_format: str,
+    rows: List[Dict[str, str]],
+    manifest: Dict[str, dict],
+):
+    """Writes rows to a new part file and records it as their output in the manifest."""
+    part_name = "part-{:05d}.{}".format(part_number, file_format)
+    writer = _FilingWriter(os.path.join(output_path, part_name))
+    try:
+        writer.write(rows)
+    finally:
+        writer.close()
+    for row in rows:
+        manifest[row["accession_number"]]["output"] = part_name
+
+
+def _remove_rows(part_file_path: str, accession_numbers: set):
+    """Removes the rows of accession numbers from a part file, or the file if it empties."""
+    if not os.path.exists(part_file_path):
+        return
+    if part_file_path.endswith(".parquet"):
+        part = pd.read_parquet(part_file_path)
+    else:
+        part = pd.read_csv(part_file_path, dtype=str, keep_default_na=False)
+    part = part[~part["accession_number"].isin(accession_numbers)]
+    if part.empty:
+        os.remove(part_file_path)
+        return
+    # The part file is replaced at once, so an interrupted rewrite does not lose its rows.
+    # Its underscore prefix keeps readers of the directory as a dataset from picking it up.
+    directory, part_name = os.path.split(part_file_path)
+    temporary_path = os.path.join(directory, "_" + part_name)
+    writer = _FilingWriter(temporary_path)
+    try:
+        writer.write(part.to_dict("records"))
+    finally:
+        writer.close()
+    os.replace(temporary_path, part_file_path)
+
+
+class _FilingWriter:
+    """Writes parsed filings in batches to a CSV file or the row groups of a Parquet file.
+
+    Args:
+        output_file_path (str): A ``.csv`` or ``.parquet`` file.
+
+    """
+
+    def __init__(self, output_file_path: str):
+        """Initializes a ``_FilingWriter`` and creates or truncates the output.
+
+        Raises:
+            ValueError: if ``output_file_path`` is not a ``.csv`` or ``.parquet`` file.
+        """
+        self._output_file_path = output_file_path
+        self._writer = None
+        if output_file_path.endswith(".parquet"):
+            import pyarrow as pa  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+            self._schema = pa.schema([(column, pa.string()) for column in SEC_FILING_COLUMNS])
+            self._writer = pq.ParquetWriter(output_file_path, self._schema)
+        elif output_file_path.endswith(".csv"):
+            pd.DataFrame(columns=SEC_FILING_COLUMNS).to_csv(output_file_path, index=False)
+        else:
+            raise ValueError("output_file_path needs to be a .csv or .parquet file")
+
+    def write(self, rows: List[Dict[str, str]]):
+        """Appends a batch of rows to the output, as a row group of a Parquet file."""
+        if not rows:
+            return
+        batch = pd.DataFrame(rows, columns=SEC_FILING_COLUMNS)
+        if self._writer is None:
+            batch.to_csv(self._output_file_path, mode="a", header=False, index=False)
+        else:
+            import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+            self._writer.write_table(
+                pa.Table.from_pandas(batch, schema=self._schema, preserve_index=False)
+            )
+
+    def close(self):
+        """Closes the Parquet file, writing its footer."""
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _MappedSubmission:
+    """A memory-mapped EDGAR full-submission file, whose header is parsed on opening.
+
+    Args:
+        file_path (str): The path of the submission file.
+
+    """
+
+    def __init__(self, file_path: str):
+        """Initializes a ``_MappedSubmission`` instance without opening the file."""
+        self._file_path = file_path
+        self._file = None
+        self._data = b""
+        self._position = 0
+        self.header = {}
+
+    def __enter__(self):
+        """Maps the file into memory and parses its header."""
+        self._file = open(self._file_path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        for start_tag, end_tag in zip(_HEADER_START_TAGS, _HEADER_END_TAGS):
+            start = self._data.find(start_tag)
+            if start >= 0:
+                start = self._data.find(b"\n", start) + 1
+                end = self._data.find(end_tag, start)
+                self._position = end if end >= 0 else start
+                # The header is small, so its lines are copied.
+                for line in self._data[start : self._position].splitlines():
+                    _parse_header_line(line, self.header)
+                break
+        return self
+
+    def __exit__(self, *args):
+        """Unmaps and closes the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def documents(self, document_types: Optional[List[str]] = None) -> Iterator[Dict[str, str]]:
+        """Parses the documents of the requested types, skipping the others unread.
+
+        Args:
+            document_types (List[str]): The types of the documents to parse, or None for
+                all the documents (default: None).
+
+        Yields:
+            Dict[str, str]: The documents of the requested types, in the order of the file.
+        """
+        data = self._data
+        start = _find_line(data, b"<DOCUMENT>", self._position, len(data))
+        while start >= 0:
+            end = _find_line(data, b"</DOCUMENT>", start, len(data))
+            if end < 0:
+                end = len(data)
+            text_start = _find_line(data, b"<TEXT>", start, end)
+            fields_end = text_start if text_start >= 0 else end
+            document = _new_document()
+            for line in data[start:fields_end].splitlines():
+                _parse_document_line(line, document)
+            if document_types is None or document["type"] in document_types:
+                if text_start >= 0:
+                    text_end = _find_line(data, b"</TEXT>", text_start, end)
+                    # Only the text of the requested documents is copied out of the map.
+                    lines = data[
+                        data.find(b"\n", text_start) + 1 : end if text_end < 0 else text_end
+                    ]
+                    text = _DocumentText()
+                    for line in lines.splitlines(keepends=True):
+                        text.feed(line)
+                    document["text"] = text.close()
+                yield document
+            start = _find_line(data, b"<DOCUMENT>", end, len(data))
+
+
+class _DocumentText:
+    """Accumulates the plain text of the lines of a ``<TEXT>`` element."""
+
+    def __init__(self):
+        """Initializes a ``_DocumentText`` instance before the first line of a text."""
+        self._html = None
+        self._lines = []
+        self._skipped = False
+
+    def feed(self, line: bytes):
+        """Adds a line of the text, detecting the format of the text on its first line."""
+        if self._skipped:
+            return
+        if self._html is None and not self._lines:
+            stripped = line.lstrip()
+            if not stripped:
+                return
+            if stripped.startswith((b"begin ", b"<PDF>")):
+                self._skipped = True
+                return
+            if stripped.startswith(b"<"):
+                self._html = _HTMLText()
+        if self._html is not None:
+            self._html.feed(_decode(line))
+        elif not _SGML_LINE_PATTERN.match(_decode(line)):
+            self._lines.append(_decode(line))
+
+    def close(self) -> str:
+        """Returns the plain text, with its white space normalized."""
+        if self._html is not None:
+            self._html.close()
+            text = "".join(self._html.pieces)
+        else:
+            text = "".join(self._lines)
+        text = _SPACES_PATTERN.sub(" ", text)
+        return _LINE_BREAKS_PATTERN.sub("\n", text).strip()
+
+
+class _HTMLText(HTMLParser):
+    """Collects the text of an HTML document, with a line break after every block."""
+
+    def __init__(self):
+        """Initializes a ``_HTMLText`` instance."""
+        super().__init__(convert_charrefs=True)
+        self.pieces = []
+        self._skipped_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        """Starts a new line at the blocks, and skips the text of the head and scripts."""
+        if tag in _SKIPPED_TAGS:
+            self._skipped_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.pieces.append("\n")
+
+    def handle_endtag(self, tag):
+        """Ends the line of a block, or the skipping of the head or a script."""
+        if tag in _SKIPPED_TAGS:
+            self._skipped_depth = max(self._skipped_depth - 1, 0)
+        elif tag in _BLOCK_TAGS:
+            self.pieces.append("\n")
+
+    def handle_data(self, data):
+        """Collects the text outside the head and the scripts, as a line of white space."""
+        if not self._skipped_depth:
+            self.pieces.append(data.replace("\n", " "))
+
+
+def _new_document() -> Dict[str, str]:
+    """Creates a document without fields or text."""
+    return dict.fromkeys(["type", "sequence", "filename", "description", "text"], "")
+
+
+def _parse_document_line(line: bytes, document: Dict[str, str]):
+    """Sets the field of a document from a line such as ``<TYPE>10-K``, if it has one."""
+    for tag, field in _DOCUMENT_FIELD_TAGS.items():
+        if line.startswith(tag):
+            document[field] = _decode(line[len(tag) :]).strip()
+            break
+
+
+def _find_line(data, tag: bytes, start: int, end: int) -> int:
+    """Finds the first line of a submission between two offsets that starts with a tag.
+
+    Returns:
+        int: The offset of the tag, or -1 if no line starts with it.
+    """
+    if data[start : start + len(tag)] == tag and (start == 0 or data[start - 1 : start] == b"\n"):
+        return start
+    position = data.find(b"\n" + tag, start, end)
+    return position + 1 if position >= 0 else -1
+
+
+def _decode(line: bytes) -> str:
+    """Decodes a line of a submission, replacing the invalid UTF-8 bytes."""
+    return line.decode("utf-8", errors="replace")
+
+
+def _parse_header_line(line: bytes, header: Dict[str, str]):
+    """Adds the field of a header line to the header, unless it is already there."""
+    match = _HEADER_FIELD_PATTERN.match(_decode(line))
+    if match is None:
+        return
+    name = (match.group(1) or match.group(2)).strip().lower()
+    value = match.group(3)
+    if value:
+        header.setdefault(re.sub(r"[^a-z0-9]+", "_", name).strip("_"), value)
+
+
+def _filing_row(header: Dict[str, str], texts: List[str]) -> Dict[str, str]:
+    """Builds the ``SEC_FILING_COLUMNS`` values of a submission from its header and texts."""
+    filing_date = header.get("filed_as_of_date", "")
+    if re.fullmatch(r"\d{8}", filing_date):
+        filing_date = "{}-{}-{}".format(filing_date[:4], filing_date[4:6], filing_date[6:])
+    return {
+        "ticker": header.get("central_index_key", ""),
+        "form_type": header.get("conformed_submission_type", ""),
+        "accession_number": header["accession_number"],
+        "filing_date": filing_date,
+        "text": "\n".join(texts),
+    }
+
+
+def _submission_files(input_data_path: str) -> Iterator[str]:
+    """Walks the submission files of a file or directory path, sorted directory by directory."""
+    if not os.path.isdir(input_data_path):
+        yield input_data_path
+        return
+    for directory, subdirectories, names in os.walk(input_data_path):
+        subdirectories.sort()
+        for name in sorted(names):
+            if name.endswith(".txt"):
+                yield os.path.join(directory, name)
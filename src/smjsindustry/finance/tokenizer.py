@@ -0,0 +1,347 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""The text preprocessing module for the local SageMaker JumpStart Industry engines.
+
+It splits documents into sentences, tokenizes sentences into words, removes stop words,
+and stems the remaining words with the Porter stemmer, in the same way as the
+processing containers do, without depending on NLTK.
+"""
+from __future__ import absolute_import
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Set
+
+from smjsindustry.finance.constants import STEM_CACHE_SIZE
+
+# The English stop words of NLTK's stopwords corpus.
+STOP_WORDS = frozenset(
+    """
+    i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself
+    yourselves he him his himself she she's her hers herself it it's its itself they them
+    their theirs themselves what which who whom this that that'll these those am is are was
+    were be been being have has had having do does did doing a an the and but if or because
+    as until while of at by for with about against between into through during before after
+    above below to from up down in out on off over under again further then once here there
+    when where why how all any both each few more most other some such no nor not only own
+    same so than too very s t can will just don don't should should've now d ll m o re ve y
+    ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven
+    haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn
+    shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+    """.split()
+)
+
+# Abbreviations whose trailing period does not end a sentence.
+_ABBREVIATIONS = frozenset(
+    """
+    mr mrs ms dr prof sr jr st inc corp co ltd llc plc no nos vs etc fig approx dept est
+    jan feb mar apr jun jul aug sep sept oct nov dec u.s u.k e.g i.e
+    """.split()
+)
+# The number of characters before the end of a sentence that can hold an abbreviation.
+_ABBREVIATION_WINDOW = 16
+_SENTENCE_END_PATTERN = re.compile(r"[.!?]+[\"'”’)\]]*\s+(?=[\"'“‘(\[]*[A-Z0-9])")
+_LAST_WORD_PATTERN = re.compile(r"([A-Za-z.]+)[.!?]+[\"'”’)\]]*\s+$")
+# Maps the UTF-8 bytes of a lower-cased text to themselves for the ASCII letters and to
+# spaces otherwise, which splits words like the pattern [A-Za-z]+ but faster.
+_WORD_BYTES = bytes(byte if ord("a") <= byte <= ord("z") else ord(" ") for byte in range(256))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits a document into sentences.
+
+    A sentence ends with a period, a question mark or an exclamation mark followed by
+    white space and an upper-case letter or a digit, unless the period follows a single
+    letter or a common abbreviation such as ``Inc.`` or ``U.S.``.
+
+    Args:
+        text (str): The document.
+
+    Returns:
+        List[str]: The non-empty sentences of the document, with their white space trimmed.
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END_PATTERN.finditer(text):
+        end = match.end()
+        if "." in match.group():
+            # The abbreviations are short, so only the end of the last word is searched.
+            last_word = _LAST_WORD_PATTERN.search(
+                text, max(start, match.start() - _ABBREVIATION_WINDOW), end
+            )
+            if last_word is not None:
+                word = last_word.group(1).lower().rstrip(".")
+                if len(word) == 1 or word in _ABBREVIATIONS:
+                    continue
+        sentences.append(text[start:end].strip())
+        start = end
+    sentences.append(text[start:].strip())
+    return [sentence for sentence in sentences if sentence]
+
+
+def tokenize(sentence: str, vocabulary: Set[str] = None) -> List[str]:
+    """Tokenizes a sentence into stemmed words.
+
+    Numbers, punctuation and white space are removed, the words are lower-cased,
+    stop words are dropped, and the remaining words are stemmed.
+
+    Args:
+        sentence (str): The sentence.
+        vocabulary (Set[str]): If specified, only the words whose stems are the stems
+            of the vocabulary words are kept (default: None).
+
+    Returns:
+        List[str]: The stemmed words of the sentence.
+    """
+    tokens = [stem(word) for word in split_words(sentence) if is_token(word)]
+    if vocabulary is not None:
+        tokens = [token for token in tokens if token in vocabulary]
+    return tokens
+
+
+def split_words(text: str) -> List[str]:
+    """Splits a text into lower-cased words, removing numbers, punctuation and white space.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        List[str]: The words of the text, including the stop words.
+    """
+    return text.lower().encode("utf-8").translate(_WORD_BYTES).decode("ascii").split()
+
+
+def is_token(word: str) -> bool:
+    """Tells whether :func:`tokenize` keeps a lower-cased word, which is not a stop word.
+
+    Args:
+        word (str): A word returned by :func:`split_words`.
+
+    Returns:
+        bool: False for the stop words and the single characters.
+    """
+    return word not in STOP_WORDS and len(word) > 1
+
+
+def stem_vocabulary(words: Iterable[str]) -> Set[str]:
+    """Stems a vocabulary so it can be compared with the output of :func:`tokenize`.
+
+    Args:
+        words (Iterable[str]): The vocabulary words.
+
+    Returns:
+        Set[str]: The stems of the vocabulary words.
+    """
+    return {stem(word.lower()) for word in words}
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word: str) -> str:
+    """Stems a lower-case word with the Porter stemming algorithm.
+
+    Args:
+        word (str): The lower-case word.
+
+    Returns:
+        str: The stem of the word.
+    """
+    if len(word) <= 2:
+        return word
+    word = _step1a(word)
+    word = _step1b(word)
+    word = _step1c(word)
+    word = _step2(word)
+    word = _step3(word)
+    word = _step4(word)
+    word = _step5(word)
+    return word
+
+
+def _is_consonant(word: str, i: int) -> bool:
+    """Checks whether the letter at position ``i`` is a consonant."""
+    letter = word[i]
+    if letter in "aeiou":
+        return False
+    if letter == "y":
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+
+def _measure(stem_: str) -> int:
+    """Returns the number of vowel-consonant sequences ``m`` of ``[C](VC){m}[V]``."""
+    measure = 0
+    previous_is_vowel = False
+    for i in range(len(stem_)):
+        is_vowel = not _is_consonant(stem_, i)
+        if previous_is_vowel and not is_vowel:
+            measure += 1
+        previous_is_vowel = is_vowel
+    return measure
+
+
+def _has_vowel(stem_: str) -> bool:
+    """Checks whether a stem contains a vowel."""
+    return any(not _is_consonant(stem_, i) for i in range(len(stem_)))
+
+
+def _ends_double_consonant(word: str) -> bool:
+    """Checks whether a word ends with a double consonant."""
+    return len(word) >= 2 and word[-1] == word[-2] and _is_consonant(word, len(word) - 1)
+
+
+def _ends_cvc(word: str) -> bool:
+    """Checks whether a word ends with consonant-vowel-consonant, the last not w, x or y."""
+    return (
+        len(word) >= 3
+        and _is_consonant(word, len(word) - 3)
+        and not _is_consonant(word, len(word) - 2)
+        and _is_consonant(word, len(word) - 1)
+        and word[-1] not in "wxy"
+    )
+
+
+def _replace_suffix(word: str, rules, min_measure: int) -> str:
+    """Replaces the first matching suffix if the remaining stem has a large enough measure."""
+    for suffix, replacement in rules:
+        if word.endswith(suffix):
+            stem_ = word[: len(word) - len(suffix)]
+            if _measure(stem_) > min_measure:
+                return stem_ + replacement
+            return word
+    return word
+
+
+def _step1a(word: str) -> str:
+    """Removes plurals."""
+    if word.endswith("sses"):
+        return word[:-2]
+    if word.endswith("ies"):
+        return word[:-2]
+    if word.endswith("ss"):
+        return word
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def _step1b(word: str) -> str:
+    """Removes ``-ed`` and ``-ing``."""
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            return word[:-1]
+        return word
+    for suffix in ("ed", "ing"):
+        if word.endswith(suffix) and _has_vowel(word[: -len(suffix)]):
+            word = word[: -len(suffix)]
+            if word.endswith(("at", "bl", "iz")):
+                return word + "e"
+            if _ends_double_consonant(word) and word[-1] not in "lsz":
+                return word[:-1]
+            if _measure(word) == 1 and _ends_cvc(word):
+                return word + "e"
+            return word
+    return word
+
+
+def _step1c(word: str) -> str:
+    """Turns a terminal ``y`` into ``i`` when there is another vowel in the stem."""
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        return word[:-1] + "i"
+    return word
+
+
+_STEP2_RULES = (
+    ("ational", "ate"),
+    ("tional", "tion"),
+    ("enci", "ence"),
+    ("anci", "ance"),
+    ("izer", "ize"),
+    ("abli", "able"),
+    ("alli", "al"),
+    ("entli", "ent"),
+    ("eli", "e"),
+    ("ousli", "ous"),
+    ("ization", "ize"),
+    ("ation", "ate"),
+    ("ator", "ate"),
+    ("alism", "al"),
+    ("iveness", "ive"),
+    ("fulness", "ful"),
+    ("ousness", "ous"),
+    ("aliti", "al"),
+    ("iviti", "ive"),
+    ("biliti", "ble"),
+)
+_STEP3_RULES = (
+    ("icate", "ic"),
+    ("ative", ""),
+    ("alize", "al"),
+    ("iciti", "ic"),
+    ("ical", "ic"),
+    ("ful", ""),
+    ("ness", ""),
+)
+_STEP4_SUFFIXES = (
+    "al",
+    "ance",
+    "ence",
+    "er",
+    "ic",
+    "able",
+    "ible",
+    "ant",
+    "ement",
+    "ment",
+    "ent",
+    "ion",
+    "ou",
+    "ism",
+    "ate",
+    "iti",
+    "ous",
+    "ive",
+    "ize",
+)
+
+
+def _step2(word: str) -> str:
+    """Maps double suffixes to single ones."""
+    return _replace_suffix(word, _STEP2_RULES, 0)
+
+
+def _step3(word: str) -> str:
+    """Removes or simplifies ``-ic-``, ``-full``, ``-ness`` and similar suffixes."""
+    return _replace_suffix(word, _STEP3_RULES, 0)
+
+
+def _step4(word: str) -> str:
+    """Removes ``-ant``, ``-ence`` and similar suffixes from stems with a measure above 1."""
+    for suffix in sorted(_STEP4_SUFFIXES, key=len, reverse=True):
+        if word.endswith(suffix):
+            stem_ = word[: -len(suffix)]
+            if _measure(stem_) > 1 and (suffix != "ion" or stem_.endswith(("s", "t"))):
+                return stem_
+            return word
+    return word
+
+
+def _step5(word: str) -> str:
+    """Removes a final ``-e`` and reduces a final ``-ll``."""
+    if word.endswith("e"):
+        stem_ = word[:-1]
+        measure = _measure(stem_)
+        if measure > 1 or (measure == 1 and not _ends_cvc(stem_)):
+            word = stem_
+    if _measure(word) > 1 and _ends_double_consonant(word) and word.endswith("l"):
+        word = word[:-1]
+    return word
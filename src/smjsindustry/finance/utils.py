@@ -16,6 +16,7 @@ from __future__ import absolute_import
 import re
 import os
 import json
+from functools import lru_cache
 from typing import Callable
 import pandas as pd
 from smjsindustry.finance.constants import (
@@ -23,8 +24,17 @@ from smjsindustry.finance.constants import (
     ECR_URI_TEMPLATE,
     REPOSITORY,
     CONTAINER_IMAGE_VERSION,
+    FREQ_LABEL_CACHE_SIZE,
 )
 
+_YEAR_MONTH_DAY_PATTERN = re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$")
+_YEAR_MONTH_PATTERN = re.compile(r"^\d{4}-\d{1,2}(-\d{1,2})?$")
+_YEAR_PATTERN = re.compile(r"^\d{4}(-\d{1,2}){0,2}$")
+_WEEK_LABEL_PATTERN = re.compile(r"^\d{4}W\d{1,2}$")
+_MONTH_LABEL_PATTERN = re.compile(r"^\d{4}M\d{1,2}$")
+_QUARTER_LABEL_PATTERN = re.compile(r"^\d{4}Q\d{1,2}$")
+_YEAR_LABEL_PATTERN = re.compile(r"^\d{4}$")
+
 
 def _get_freq_label_by_day(date_value: str) -> str:
     """Gets frequency label for the date value which is aggregated by day.
@@ -35,7 +45,7 @@ def _get_freq_label_by_day(date_value: str) -> str:
     Returns:
         str: The date value aggregated by day.
     """
-    if not bool(re.match(r"^\d{4}-\d{1,2}-\d{1,2}$", date_value)):
+    if not bool(_YEAR_MONTH_DAY_PATTERN.match(date_value)):
         raise ValueError("Date needs to be in yyyy-mm-dd format when freq is D")
     return date_value
 
@@ -49,9 +59,9 @@ def _get_freq_label_by_week(date_value: str) -> str:
     Returns:
         str: The date value aggregated by week.
     """
-    if bool(re.match(r"^\d{4}W\d{1,2}$", date_value)):
+    if bool(_WEEK_LABEL_PATTERN.match(date_value)):
         return date_value
-    if not bool(re.match(r"^\d{4}-\d{1,2}-\d{1,2}$", date_value)):
+    if not bool(_YEAR_MONTH_DAY_PATTERN.match(date_value)):
         raise ValueError("Date needs to be in yyyy-mm-dd format when freq is W")
     ts = pd.Timestamp(date_value)
     return "{}W{}".format(ts.year, ts.week)
@@ -66,9 +76,9 @@ def _get_freq_label_by_month(date_value: str) -> str:
     Returns:
         str: The date value aggregated by month.
     """
-    if bool(re.match(r"^\d{4}M\d{1,2}$", date_value)):
+    if bool(_MONTH_LABEL_PATTERN.match(date_value)):
         return date_value
-    if not bool(re.match(r"^\d{4}-\d{1,2}(-\d{1,2})?$", date_value)):
+    if not bool(_YEAR_MONTH_PATTERN.match(date_value)):
         raise ValueError("Date needs to be in yyyy-mm-dd or yyyy-mm format when freq is M")
     ts = pd.Timestamp(date_value)
     return "{}M{}".format(ts.year, ts.month)
@@ -83,9 +93,9 @@ def _get_freq_label_by_quarter(date_value: str) -> str:
     Returns:
         str: The date value aggregated by quarter.
     """
-    if bool(re.match(r"^\d{4}Q\d{1,2}$", date_value)):
+    if bool(_QUARTER_LABEL_PATTERN.match(date_value)):
         return date_value
-    if not bool(re.match(r"^\d{4}-\d{1,2}(-\d{1,2})?$", date_value)):
+    if not bool(_YEAR_MONTH_PATTERN.match(date_value)):
         raise ValueError("Date needs to be in yyyy-mm-dd or yyyy-mm format when freq is Q")
     ts = pd.Timestamp(date_value)
     return "{}Q{}".format(ts.year, ts.quarter)
@@ -100,9 +110,9 @@ def _get_freq_label_by_year(date_value: str) -> str:
     Returns:
         str: The date value aggregated by year.
     """
-    if bool(re.match(r"^\d{4}$", date_value)):
+    if bool(_YEAR_LABEL_PATTERN.match(date_value)):
         return date_value
-    if not bool(re.match(r"^\d{4}(-\d{1,2}){0,2}$", date_value)):
+    if not bool(_YEAR_PATTERN.match(date_value)):
         raise ValueError("Date needs to be in yyyy-mm-dd, yyyy-mm or yyyy format when freq is Y")
     ts = pd.Timestamp(date_value)
     return str(ts.year)
@@ -117,9 +127,26 @@ FREQ_LABEL_MAP = {
 }
 
 
+@lru_cache(maxsize=FREQ_LABEL_CACHE_SIZE)
+def _get_cached_freq_label(date_value: str, freq: str) -> str:
+    """Gets frequency label for a validated frequency, memoized on ``(date_value, freq)``.
+
+    Args:
+        date_value (str): The date value.
+        freq (str): The upper-case frequency value.
+
+    Returns:
+        str: The date value aggregated by the frequency.
+    """
+    return FREQ_LABEL_MAP[freq](date_value.upper())
+
+
 def get_freq_label(date_value: str, freq: str) -> Callable:
     """Gets frequency label for the date value.
 
+    Labels are memoized in a bounded LRU cache keyed on ``(date_value, freq)``,
+    since the same dates repeat across many rows. See :func:`freq_label_cache_info`.
+
     Args:
         date_value (str): The date value.
         freq (str): The frequency value specifies how the date field should be aggregated,
@@ -134,7 +161,156 @@ def get_freq_label(date_value: str, freq: str) -> Callable:
         raise ValueError("frequency {} not supported".format(freq))
     if not isinstance(date_value, str):
         raise Exception("The date column needs to be string")
-    return FREQ_LABEL_MAP[freq](date_value.upper())
+    return _get_cached_freq_label(date_value, freq)
+
+
+def freq_label_cache_info():
+    """Gets the statistics of the :func:`get_freq_label` cache.
+
+    Returns:
+        functools._CacheInfo: The ``hits``, ``misses``, ``maxsize`` and ``currsize``
+        of the cache.
+    """
+    return _get_cached_freq_label.cache_info()
+
+
+def clear_freq_label_cache():
+    """Clears the :func:`get_freq_label` cache and its statistics."""
+    _get_cached_freq_label.cache_clear()
+
+
+# For each frequency: the pattern of an already aggregated label (if any), the pattern of
+# an accepted date value, and the error raised when a value matches neither.
+FREQ_LABEL_PATTERNS = {
+    "D": (None, _YEAR_MONTH_DAY_PATTERN, "yyyy-mm-dd"),
+    "W": (_WEEK_LABEL_PATTERN, _YEAR_MONTH_DAY_PATTERN, "yyyy-mm-dd"),
+    "M": (_MONTH_LABEL_PATTERN, _YEAR_MONTH_PATTERN, "yyyy-mm-dd or yyyy-mm"),
+    "Q": (_QUARTER_LABEL_PATTERN, _YEAR_MONTH_PATTERN, "yyyy-mm-dd or yyyy-mm"),
+    "Y": (_YEAR_LABEL_PATTERN, _YEAR_PATTERN, "yyyy-mm-dd, yyyy-mm or yyyy"),
+}
+
+
+def _to_datetime(date_values: pd.Series) -> pd.Series:
+    """Converts validated ``yyyy[-mm[-dd]]`` strings to datetimes in one vectorized call.
+
+    Args:
+        date_values (pandas.Series): The date values, already validated against
+            the frequency's date pattern.
+
+    Returns:
+        pandas.Series: The datetime values; a missing month or day defaults to ``1``.
+    """
+    # "$" in the validation patterns also matches before a trailing newline.
+    date_values = date_values.str.rstrip("\n")
+    missing_parts = date_values.str.count("-").map({0: "-1-1", 1: "-1", 2: ""})
+    try:
+        return pd.to_datetime(date_values + missing_parts, format="%Y-%m-%d")
+    except ValueError:
+        # An impossible date such as "2021-02-30" raises the error of the per-value
+        # conversion of get_freq_label.
+        for date_value in date_values:
+            pd.Timestamp(date_value)
+        raise
+
+
+def get_freq_labels(date_values: pd.Series, freq: str) -> pd.Series:
+    """Gets frequency labels for a column of date values.
+
+    It is the column-wise counterpart of :func:`get_freq_label`. The column is factorized
+    first, so the unique dates are validated with ``Series.str.match`` and converted with
+    ``pandas.to_datetime`` once each, and the labels are mapped back to every row.
+    The labels and errors are the same as calling :func:`get_freq_label` per value.
+
+    Args:
+        date_values (pandas.Series): The date values.
+        freq (str): The frequency value specifies how the date field should be aggregated,
+            by year, quarter, month, week, day. Available values:
+            ``{'Y', 'Q', 'M', 'W', 'D'}``.
+
+    Returns:
+        pandas.Series: The frequency labels, indexed like ``date_values``.
+    """
+    freq = freq.upper()
+    if freq not in FREQ_LABEL_MAP:
+        raise ValueError("frequency {} not supported".format(freq))
+    if date_values.empty:
+        # An empty column read from a file has no values to tell it is a string column.
+        return pd.Series([], index=date_values.index, dtype=object)
+    if pd.api.types.infer_dtype(date_values, skipna=False) not in ("string", "empty"):
+        raise Exception("The date column needs to be string")
+    codes, unique_values = pd.factorize(date_values.astype(object))
+    unique_labels = _get_unique_freq_labels(pd.Series(unique_values, dtype=object), freq)
+    return pd.Series(unique_labels.to_numpy().take(codes), index=date_values.index)
+
+
+def get_freq_start_dates(date_values: pd.Series, freq: str) -> pd.Series:
+    """Gets the start date of the frequency period each date value falls in.
+
+    The date values are validated like :func:`get_freq_labels`, except that
+    frequency labels such as ``"2020Q2"`` are not accepted.
+
+    Args:
+        date_values (pandas.Series): The date values.
+        freq (str): The frequency value specifies how the date field should be aggregated,
+            by year, quarter, month, week, day. Available values:
+            ``{'Y', 'Q', 'M', 'W', 'D'}``.
+
+    Returns:
+        pandas.Series: The datetimes of the period starts, indexed like ``date_values``.
+            Weeks start on Monday, like the ISO weeks of :func:`get_freq_label`.
+    """
+    freq = freq.upper()
+    if freq not in FREQ_LABEL_MAP:
+        raise ValueError("frequency {} not supported".format(freq))
+    if date_values.empty:
+        return pd.Series([], index=date_values.index, dtype="datetime64[ns]")
+    if pd.api.types.infer_dtype(date_values, skipna=False) not in ("string", "empty"):
+        raise Exception("The date column needs to be string")
+    codes, unique_values = pd.factorize(date_values.astype(object))
+    unique_values = pd.Series(unique_values, dtype=object)
+    _, date_pattern, date_format = FREQ_LABEL_PATTERNS[freq]
+    if not unique_values.str.match(date_pattern).all():
+        raise ValueError("Date needs to be in {} format when freq is {}".format(date_format, freq))
+    unique_dates = _to_datetime(unique_values)
+    if freq != "D":
+        unique_dates = unique_dates.dt.to_period(freq).dt.start_time
+    return pd.Series(unique_dates.to_numpy().take(codes), index=date_values.index)
+
+
+def _get_unique_freq_labels(date_values: pd.Series, freq: str) -> pd.Series:
+    """Gets frequency labels for distinct date values with vectorized string operations.
+
+    Args:
+        date_values (pandas.Series): The distinct date values.
+        freq (str): The upper-case frequency value.
+
+    Returns:
+        pandas.Series: The frequency labels, indexed like ``date_values``.
+    """
+    date_values = date_values.str.upper()
+    label_pattern, date_pattern, date_format = FREQ_LABEL_PATTERNS[freq]
+    is_label = (
+        date_values.str.match(label_pattern)
+        if label_pattern
+        else pd.Series(False, index=date_values.index)
+    )
+    is_date = ~is_label & date_values.str.match(date_pattern)
+    if not (is_label | is_date).all():
+        raise ValueError("Date needs to be in {} format when freq is {}".format(date_format, freq))
+    labels = date_values.copy()
+    if freq == "D" or not is_date.any():
+        return labels
+    timestamps = _to_datetime(date_values[is_date]).dt
+    years = timestamps.year.astype(str)
+    if freq == "W":
+        labels[is_date] = years + "W" + timestamps.isocalendar().week.astype(str)
+    elif freq == "M":
+        labels[is_date] = years + "M" + timestamps.month.astype(str)
+    elif freq == "Q":
+        labels[is_date] = years + "Q" + timestamps.quarter.astype(str)
+    else:
+        labels[is_date] = years
+    return labels
 
 
 def load_image_uri_config():
@@ -161,3 +337,22 @@ def retrieve_image(region):
     account_id = config[region]
     repository = "{}:{}".format(REPOSITORY, CONTAINER_IMAGE_VERSION)
     return ECR_URI_TEMPLATE.format(account_id=account_id, region=region, repository=repository)
+
+
+def import_sparse():
+    """Imports ``scipy.sparse``, which is an optional dependency of the local engines.
+
+    Returns:
+        module: The ``scipy.sparse`` module.
+
+    Raises:
+        ImportError: if scipy is not installed.
+    """
+    try:
+        import scipy.sparse  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError(
+            "The local summarizers and NLP scorer require scipy. "
+            "Install it with 'pip install smjsindustry[local]'."
+        ) from e
+    return scipy.sparse
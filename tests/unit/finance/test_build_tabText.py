@@ -14,7 +14,8 @@
 from __future__ import absolute_import
 
 import pandas as pd
-from smjsindustry import build_tabText
+import pytest
+from smjsindustry import build_tabText, build_tabText_chunked
 
 
 def test_build_tabText_by_quarter():
@@ -76,3 +77,355 @@ def test_build_tabText_by_year():
     assert set(joined.columns) == set(["ticker1", "date1", "ticker2", "date2", "doc", "price"])
     assert joined.loc[0, "doc"] == text_df.loc[0, "doc"]
     assert joined.loc[1, "doc"] == text_df.loc[1, "doc"]
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+@pytest.mark.parametrize("text_key", ["ticker", "ticker2"])
+def test_build_tabText_does_not_modify_inputs(how, text_key):
+    tabular_df = pd.DataFrame(
+        {
+            "ticker": ["ticker1", "ticker2", "ticker3", "ticker2"],
+            "date": ["2019-01-01", "2020-01-01", "2021-01-01", "2020-03-01"],
+            "price": [2000.00, 100.00, 50.00, 110.00],
+            "doc": ["tabular1", "tabular2", "tabular3", "tabular4"],
+        }
+    )
+    text_df = pd.DataFrame(
+        {
+            text_key: ["ticker1", "ticker2", "ticker4", "ticker2"],
+            "date": ["2019-02-01", "2020-02-02", "2020-02-02", "2020-01-05"],
+            "doc": ["doc1", "doc2", "doc3", "doc4"],
+            "count": pd.array([1, None, 3, 4], dtype="Int64"),
+        }
+    )
+    expected_tabular_df = tabular_df.copy()
+    expected_text_df = text_df.copy()
+
+    joined = build_tabText(tabular_df, "ticker", "date", text_df, text_key, "date", how=how)
+    low_memory_joined = build_tabText(
+        tabular_df, "ticker", "date", text_df, text_key, "date", how=how, low_memory=True
+    )
+    pd.testing.assert_frame_equal(tabular_df, expected_tabular_df)
+    pd.testing.assert_frame_equal(text_df, expected_text_df)
+    pd.testing.assert_frame_equal(low_memory_joined, joined)
+    assert "jumpstart-normalized-date" not in joined.columns
+    assert joined["doc_y"].isin(text_df["doc"]).all() == (how in ("inner", "right"))
+
+
+@pytest.mark.parametrize("how", ["inner", "outer"])
+def test_build_tabText_with_reserved_column_names(how):
+    tabular_df = pd.DataFrame(
+        {
+            "ticker": ["ticker1", "ticker2"],
+            "date": ["2019-01-01", "2020-01-01"],
+            "key_1": [1, 2],
+            "jumpstart-normalized-date": ["a", "b"],
+        }
+    )
+    text_df = pd.DataFrame(
+        {"ticker": ["ticker1", "ticker3"], "date": ["2019-02-01", "2020-02-02"], "doc": ["x", "y"]}
+    )
+
+    joined = build_tabText(tabular_df, "ticker", "date", text_df, "ticker", "date", how=how)
+
+    assert list(joined.columns) == [
+        "ticker",
+        "date_x",
+        "key_1",
+        "jumpstart-normalized-date",
+        "date_y",
+        "doc",
+    ]
+    assert joined["doc"].tolist()[0] == "x"
+    pd.testing.assert_frame_equal(
+        build_tabText(
+            tabular_df, "ticker", "date", text_df, "ticker", "date", how=how, low_memory=True
+        ),
+        joined,
+    )
+
+
+@pytest.mark.parametrize(
+    "direction, tolerance, freq, expected_docs",
+    [
+        ("backward", None, "D", [None, "8-K", None, "10-Q"]),
+        ("forward", "7D", "D", ["8-K", None, None, None]),
+        ("nearest", "7D", "D", ["8-K", None, None, None]),
+        ("nearest", None, "D", ["8-K", "10-Q/A", "10-Q", "10-Q"]),
+        ("backward", None, "Q", [None, "8-K", None, "10-Q"]),
+        ("forward", None, "Q", ["8-K", "8-K", "10-Q", "10-Q"]),
+    ],
+)
+def test_build_tabText_asof(direction, tolerance, freq, expected_docs):
+    tabular_df = pd.DataFrame(
+        {
+            "ticker": ["ticker1", "ticker1", "ticker2", "ticker2"],
+            "date": ["2020-03-31", "2020-06-30", "2020-03-31", "2020-06-30"],
+            "price": [2000.00, 2100.00, 100.00, 110.00],
+        }
+    )
+    text_df = pd.DataFrame(
+        {
+            "ticker": ["ticker1", "ticker2", "ticker1"],
+            "date": ["2020-04-02", "2020-05-15", "2020-07-20"],
+            "doc": ["8-K", "10-Q", "10-Q/A"],
+        }
+    )
+
+    joined = build_tabText(
+        tabular_df,
+        "ticker",
+        "date",
+        text_df,
+        "ticker",
+        "date",
+        how="left",
+        freq=freq,
+        direction=direction,
+        tolerance=tolerance,
+    )
+    assert joined["price"].tolist() == tabular_df["price"].tolist()
+    assert joined["doc"].where(joined["doc"].notna(), None).tolist() == expected_docs
+
+    inner = build_tabText(
+        tabular_df, "ticker", "date", text_df, "ticker", "date", freq=freq, direction=direction
+    )
+    assert inner["doc"].notna().all()
+
+
+def test_build_tabText_asof_invalid_arguments():
+    tabular_df = pd.DataFrame({"ticker": ["ticker1"], "date": ["2020-03-31"]})
+    text_df = pd.DataFrame({"ticker": ["ticker1"], "date": ["2020-04-02"], "doc": ["doc1"]})
+    with pytest.raises(ValueError, match="direction needs to be one of"):
+        build_tabText(tabular_df, "ticker", "date", text_df, "ticker", "date", direction="up")
+    with pytest.raises(ValueError, match="direction needs to be one of"):
+        build_tabText(tabular_df, "ticker", "date", text_df, "ticker", "date", tolerance="7D")
+    with pytest.raises(ValueError, match="only supports how='left' or how='inner'"):
+        build_tabText(
+            tabular_df,
+            "ticker",
+            "date",
+            text_df,
+            "ticker",
+            "date",
+            how="outer",
+            direction="nearest",
+        )
+
+
+def _tabtext_frames():
+    tabular_df = pd.DataFrame(
+        {
+            "ticker": ["ticker{}".format(i % 7) for i in range(60)],
+            "date": ["20{:02d}-{:02d}-01".format(10 + i // 28, 1 + i % 4 * 3) for i in range(60)],
+            "price": [float(i) for i in range(60)],
+        }
+    ).drop_duplicates(["ticker", "date"])
+    text_df = pd.DataFrame(
+        {
+            "ticker": ["ticker{}".format(i % 9) for i in range(80)],
+            "date": ["20{:02d}-{:02d}-15".format(10 + i // 36, 1 + i % 4 * 3) for i in range(80)],
+            "doc": ["doc{}\nline two, with a comma".format(i) for i in range(80)],
+        }
+    ).drop_duplicates(["ticker", "date"])
+    return tabular_df, text_df
+
+
+def _sorted(df):
+    return df.sort_values(["price", "doc"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+def test_build_tabText_chunked_from_chunks(tmp_path, how):
+    tabular_df, text_df = _tabtext_frames()
+    chunks = (text_df.iloc[start : start + 7] for start in range(0, len(text_df), 7))
+    output_path = str(tmp_path / "joined.csv")
+
+    rows = build_tabText_chunked(
+        tabular_df,
+        "ticker",
+        "date",
+        chunks,
+        "ticker",
+        "date",
+        output_path,
+        how=how,
+        num_partitions=5,
+    )
+    expected = build_tabText(tabular_df, "ticker", "date", text_df, "ticker", "date", how=how)
+    actual = pd.read_csv(output_path)
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected), check_dtype=False)
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_build_tabText_chunked_from_file(tmp_path, file_format):
+    if file_format == "parquet":
+        pytest.importorskip("pyarrow")
+    tabular_df, text_df = _tabtext_frames()
+    text_path = str(tmp_path / "text.{}".format(file_format))
+    if file_format == "csv":
+        text_df.to_csv(text_path, index=False)
+        output_path = str(tmp_path / "joined.csv")
+    else:
+        text_df.to_parquet(text_path, index=False)
+        output_path = str(tmp_path / "joined")
+
+    rows = build_tabText_chunked(
+        tabular_df, "ticker", "date", text_path, "ticker", "date", output_path, chunksize=10
+    )
+    expected = build_tabText(tabular_df, "ticker", "date", text_df, "ticker", "date")
+    if file_format == "csv":
+        actual = pd.read_csv(output_path)
+    else:
+        actual = pd.concat(
+            pd.read_parquet(str(part)) for part in sorted(tmp_path.glob("joined/*.parquet"))
+        )
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected))
+
+
+@pytest.mark.parametrize("tabular_date_column, text_date_column", [(None, None), ("date", None)])
+def test_build_tabText_chunked_without_dates(tmp_path, tabular_date_column, text_date_column):
+    tabular_df, text_df = _tabtext_frames()
+    tabular_df = tabular_df.drop_duplicates("ticker")
+    text_path = str(tmp_path / "text.csv")
+    text_df.to_csv(text_path, index=False)
+    output_path = str(tmp_path / "joined.csv")
+
+    rows = build_tabText_chunked(
+        tabular_df,
+        "ticker",
+        tabular_date_column,
+        text_path,
+        "ticker",
+        text_date_column,
+        output_path,
+        how="left",
+        chunksize=7,
+    )
+    expected = build_tabText(
+        tabular_df, "ticker", tabular_date_column, text_df, "ticker", text_date_column, how="left"
+    )
+    actual = pd.read_csv(output_path)
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected), check_dtype=False)
+
+
+@pytest.mark.parametrize("how", ["left", "outer"])
+def test_build_tabText_chunked_parquet_partitions_without_matches(tmp_path, how):
+    pytest.importorskip("pyarrow")
+    tabular_df = pd.DataFrame(
+        {"ticker": ["a", "b", "c", "d"], "date": ["2020-01-01"] * 4, "price": [1.0, 2.0, 3.0, 4.0]}
+    )
+    text_df = pd.DataFrame(
+        {"ticker": ["a"], "date": ["2020-01-02"], "doc": ["filing"], "count": [1]}
+    )
+    output_path = str(tmp_path / "joined")
+
+    rows = build_tabText_chunked(
+        tabular_df,
+        "ticker",
+        "date",
+        [text_df],
+        "ticker",
+        "date",
+        output_path,
+        how=how,
+        num_partitions=4,
+    )
+    expected = build_tabText(tabular_df, "ticker", "date", text_df, "ticker", "date", how=how)
+    actual = pd.read_parquet(output_path)
+    assert len(list(tmp_path.glob("joined/*.parquet"))) > 1
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected))
+
+
+def test_build_tabText_chunked_parquet_rerun(tmp_path):
+    pytest.importorskip("pyarrow")
+    tabular_df, text_df = _tabtext_frames()
+    output_path = str(tmp_path / "joined")
+    build_tabText_chunked(
+        tabular_df, "ticker", "date", [text_df], "ticker", "date", output_path, num_partitions=8
+    )
+
+    rows = build_tabText_chunked(
+        tabular_df.iloc[:2],
+        "ticker",
+        "date",
+        [text_df],
+        "ticker",
+        "date",
+        output_path,
+        num_partitions=8,
+    )
+    expected = build_tabText(tabular_df.iloc[:2], "ticker", "date", text_df, "ticker", "date")
+    actual = pd.read_parquet(output_path)
+    assert rows == len(actual)
+    pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected))
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+@pytest.mark.parametrize("text_key", ["ticker", "symbol"])
+def test_build_tabText_parallel_matches_serial(how, text_key):
+    tabular_df, text_df = _tabtext_frames()
+    # Two dates per quarter and shuffled rows make the order of the serial join nontrivial.
+    tabular_df = pd.concat(
+        [
+            tabular_df,
+            tabular_df.assign(date=tabular_df["date"].str.replace("-01$", "-20", regex=True)),
+        ]
+    ).sample(frac=1, random_state=0)
+    text_df = (
+        pd.concat(
+            [text_df, text_df.assign(date=text_df["date"].str.replace("-15$", "-25", regex=True))]
+        )
+        .sample(frac=1, random_state=1)
+        .rename(columns={"ticker": text_key})
+    )
+    expected = build_tabText(tabular_df, "ticker", "date", text_df, text_key, "date", how=how)
+
+    ordered = build_tabText(
+        tabular_df,
+        "ticker",
+        "date",
+        text_df,
+        text_key,
+        "date",
+        how=how,
+        n_jobs=3,
+        preserve_order=True,
+    )
+    unordered = build_tabText(
+        tabular_df, "ticker", "date", text_df, text_key, "date", how=how, n_jobs=3
+    )
+    pd.testing.assert_frame_equal(ordered, expected)
+    pd.testing.assert_frame_equal(_sorted(unordered), _sorted(expected))
+
+
+def test_build_tabText_parallel_asof():
+    tabular_df, text_df = _tabtext_frames()
+    tabular_df = tabular_df.sample(frac=1, random_state=0)
+    expected = build_tabText(
+        tabular_df, "ticker", "date", text_df, "ticker", "date", how="left", direction="backward"
+    )
+
+    actual = build_tabText(
+        tabular_df,
+        "ticker",
+        "date",
+        text_df,
+        "ticker",
+        "date",
+        how="left",
+        direction="backward",
+        n_jobs=2,
+        preserve_order=True,
+    )
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_build_tabText_invalid_n_jobs():
+    tabular_df, text_df = _tabtext_frames()
+    with pytest.raises(ValueError, match="n_jobs"):
+        build_tabText(tabular_df, "ticker", "date", text_df, "ticker", "date", n_jobs=0)
@@ -0,0 +1,116 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tests embedding module."""
+from __future__ import absolute_import
+
+import pickle
+
+import numpy as np
+import pytest
+from smjsindustry.finance.embedding import (
+    CachedEmbedding,
+    Doc2VecEmbedding,
+    HashingEmbedding,
+    SentenceEmbedding,
+    TfidfSvdEmbedding,
+)
+
+TOKEN_LISTS = [
+    ["net", "sale", "increas"],
+    ["net", "sale", "decreas"],
+    ["oper", "incom", "increas"],
+    [],
+    ["net", "sale", "increas"],
+]
+
+
+@pytest.mark.parametrize("embedding", [HashingEmbedding(16), TfidfSvdEmbedding(3)])
+def test_sentence_embedding(embedding):
+    vectors = embedding.embed(TOKEN_LISTS)
+
+    assert vectors.shape == (5, embedding.vector_size)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), [1, 1, 1, 0, 1])
+    np.testing.assert_allclose(vectors[0], vectors[4])
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    np.testing.assert_array_equal(vectors, embedding.embed(TOKEN_LISTS))
+
+
+def test_tfidf_svd_embedding_small_document():
+    vectors = TfidfSvdEmbedding(100).embed(TOKEN_LISTS)
+    assert vectors.shape == (5, 5)
+    assert TfidfSvdEmbedding(100).embed([[], []]).shape == (2, 1)
+
+
+def test_sentence_embedding_invalid_vector_size():
+    with pytest.raises(ValueError, match="vector_size"):
+        HashingEmbedding(0)
+    with pytest.raises(TypeError):
+        SentenceEmbedding(10)
+
+
+def test_cached_embedding(tmp_path):
+    embedding = CachedEmbedding(HashingEmbedding(16), str(tmp_path))
+    vectors = embedding.embed(TOKEN_LISTS)
+
+    assert vectors.dtype == np.float32
+    np.testing.assert_allclose(vectors, HashingEmbedding(16).embed(TOKEN_LISTS), rtol=1e-6)
+    assert (embedding.hits, embedding.misses) == (0, 5)
+    np.testing.assert_array_equal(embedding.embed(TOKEN_LISTS[::-1]), vectors[::-1])
+    assert (embedding.hits, embedding.misses) == (5, 5)
+
+    reopened = pickle.loads(pickle.dumps(CachedEmbedding(HashingEmbedding(16), str(tmp_path))))
+    np.testing.assert_array_equal(reopened.embed(TOKEN_LISTS), vectors)
+    assert (reopened.hits, reopened.misses) == (5, 0)
+    assert CachedEmbedding(HashingEmbedding(8), str(tmp_path)).directory != embedding.directory
+
+
+def test_cached_embedding_eviction(tmp_path):
+    embedding = CachedEmbedding(HashingEmbedding(16), str(tmp_path), capacity=3)
+    embedding.embed([["net"], ["sale"], ["oper"]])
+    embedding.embed([["net"]])
+    embedding.embed([["incom"], ["increas"]])
+    embedding.embed([["net"], ["sale"]])
+
+    # "sale" and "oper" were the least recently used vectors when "incom" and "increas" came.
+    assert (embedding.hits, embedding.misses) == (2, 6)
+    # "incom" or "increas" was then evicted for "sale".
+    embedding.embed([["net"], ["sale"], ["oper"], ["incom"], ["increas"]])
+    assert (embedding.hits, embedding.misses) == (5, 8)
+
+
+def test_cached_embedding_shared(tmp_path):
+    # Two instances stand for two processes that share the cache files.
+    first = CachedEmbedding(HashingEmbedding(16), str(tmp_path), capacity=2)
+    second = CachedEmbedding(HashingEmbedding(16), str(tmp_path), capacity=2)
+    first.embed([["net"], ["sale"]])
+    second.embed([["oper"], ["incom"]])
+
+    # The first instance sees that "net" and "sale" were evicted by the second one.
+    vectors = first.embed([["net"], ["oper"]])
+    np.testing.assert_array_equal(vectors, HashingEmbedding(16).embed([["net"], ["oper"]]))
+    assert (first.hits, first.misses) == (1, 3)
+
+
+def test_cached_embedding_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError, match="cannot be cached"):
+        CachedEmbedding(TfidfSvdEmbedding(16), str(tmp_path))
+    with pytest.raises(TypeError):
+        CachedEmbedding("hashing", str(tmp_path))
+    with pytest.raises(ValueError, match="capacity"):
+        CachedEmbedding(HashingEmbedding(16), str(tmp_path), capacity=0)
+
+
+def test_doc2vec_embedding():
+    pytest.importorskip("gensim")
+    vectors = Doc2VecEmbedding(8, epochs=5).embed(TOKEN_LISTS)
+    assert vectors.shape == (5, 8)
@@ -232,6 +232,69 @@ def test_jaccard_summarizer_config(
         assert summarizer_config.get_config() == expected_config
 
 
+@pytest.mark.parametrize(
+    "approximate, num_perm, num_bands, error, message",
+    [
+        (True, 128, 32, None, None),
+        ("yes", 128, 32, TypeError, "approximate to be a boolean"),
+        (True, 12.5, 32, TypeError, "num_perm to be an integer"),
+        (True, 0, 32, ValueError, "num_perm to be a positive integer"),
+        (True, 128, "32", TypeError, "num_bands to be an integer"),
+        (True, 128, 0, ValueError, "num_bands to be a positive divisor of num_perm"),
+        (True, 128, 48, ValueError, "num_bands to be a positive divisor of num_perm"),
+    ],
+)
+def test_jaccard_summarizer_config_approximate(approximate, num_perm, num_bands, error, message):
+    if error is None:
+        summarizer_config = JaccardSummarizerConfig(
+            summary_size=10, approximate=approximate, num_perm=num_perm, num_bands=num_bands
+        )
+        assert summarizer_config.approximate
+        assert summarizer_config.num_perm == num_perm
+        assert summarizer_config.num_bands == num_bands
+        assert "approximate" not in summarizer_config.get_config()
+    else:
+        with pytest.raises(error) as e:
+            JaccardSummarizerConfig(
+                summary_size=10, approximate=approximate, num_perm=num_perm, num_bands=num_bands
+            )
+        assert str(e.value) == "JaccardSummarizerConfig requires {}.".format(message)
+
+
+@pytest.mark.parametrize(
+    "sampling, num_samples, max_memory_mb, error, message",
+    [
+        (True, 5, 256, None, None),
+        ("yes", 5, 256, TypeError, "sampling to be a boolean"),
+        (True, 2.5, 256, TypeError, "num_samples to be an integer"),
+        (True, 0, 256, ValueError, "num_samples to be a positive integer"),
+        (True, 5, "256", TypeError, "max_memory_mb to be an integer"),
+        (True, 5, -1, ValueError, "max_memory_mb to be a positive integer"),
+    ],
+)
+def test_kmedoids_summarizer_config_sampling(sampling, num_samples, max_memory_mb, error, message):
+    if error is None:
+        summarizer_config = KMedoidsSummarizerConfig(
+            summary_size=10,
+            sampling=sampling,
+            num_samples=num_samples,
+            max_memory_mb=max_memory_mb,
+        )
+        assert summarizer_config.sampling
+        assert summarizer_config.num_samples == num_samples
+        assert summarizer_config.max_memory_mb == max_memory_mb
+        assert "sampling" not in summarizer_config.get_config()
+    else:
+        with pytest.raises(error) as e:
+            KMedoidsSummarizerConfig(
+                summary_size=10,
+                sampling=sampling,
+                num_samples=num_samples,
+                max_memory_mb=max_memory_mb,
+            )
+        assert str(e.value) == "KMedoidsSummarizerConfig requires {}.".format(message)
+
+
 @pytest.mark.parametrize("summary_size", [100, -100])
 @pytest.mark.parametrize("vector_size", [100, 0.5])
 @pytest.mark.parametrize("min_count", [10, "abc"])
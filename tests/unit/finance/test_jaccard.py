@@ -0,0 +1,91 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tests jaccard module."""
+from __future__ import absolute_import
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from smjsindustry.finance.jaccard import (
+    approximate_jaccard_similarity_sums,
+    jaccard_similarity_sums,
+    minhash_signatures,
+    token_matrix,
+)
+from smjsindustry.finance.tokenizer import split_sentences, tokenize
+
+DATA_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "finance", "processor_data.csv"
+)
+
+
+def _pairwise_similarity_sums(token_lists):
+    token_sets = [set(tokens) for tokens in token_lists]
+    sums = np.zeros(len(token_sets))
+    for i, tokens_i in enumerate(token_sets):
+        for j, tokens_j in enumerate(token_sets):
+            if i != j and tokens_i | tokens_j:
+                sums[i] += len(tokens_i & tokens_j) / len(tokens_i | tokens_j)
+    return sums
+
+
+def test_token_matrix():
+    matrix = token_matrix([["a", "b", "a"], [], ["b", "c"]])
+    assert matrix.shape == (3, 3)
+    np.testing.assert_array_equal(matrix.toarray(), [[1, 1, 0], [0, 0, 0], [0, 1, 1]])
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1024])
+def test_jaccard_similarity_sums(block_size):
+    text = pd.read_csv(DATA_FILE)["text"][0]
+    token_lists = [tokenize(sentence) for sentence in split_sentences(text)] + [[]]
+
+    sums = jaccard_similarity_sums(token_lists, block_size=block_size)
+    np.testing.assert_allclose(sums, _pairwise_similarity_sums(token_lists))
+    assert sums[-1] == 0
+
+
+def test_jaccard_similarity_sums_empty():
+    assert len(jaccard_similarity_sums([])) == 0
+
+
+@pytest.mark.parametrize(
+    "num_perm, num_bands, min_correlation", [(128, 32, 0.95), (128, 128, 0.99)]
+)
+def test_approximate_jaccard_similarity_sums(num_perm, num_bands, min_correlation):
+    text = pd.read_csv(DATA_FILE)["text"][0]
+    token_lists = [tokenize(sentence) for sentence in split_sentences(text)] + [[]]
+
+    exact = jaccard_similarity_sums(token_lists)
+    approximate = approximate_jaccard_similarity_sums(token_lists, num_perm, num_bands)
+    assert np.corrcoef(exact, approximate)[0, 1] > min_correlation
+    assert approximate[-1] == 0
+    np.testing.assert_array_equal(
+        approximate, approximate_jaccard_similarity_sums(token_lists, num_perm, num_bands)
+    )
+
+
+def test_approximate_jaccard_similarity_sums_duplicates():
+    token_lists = [["net", "sale"], ["net", "sale"], ["oper", "incom"], []]
+    sums = approximate_jaccard_similarity_sums(token_lists, 16, 4)
+    np.testing.assert_allclose(sums, [1, 1, 0, 0])
+
+
+def test_minhash_signatures():
+    matrix = token_matrix([["a", "b"], [], ["b", "a"], ["c"]])
+    signatures = minhash_signatures(matrix, 8)
+    assert signatures.shape == (4, 8)
+    np.testing.assert_array_equal(signatures[0], signatures[2])
+    assert (signatures[1] == 2**31 - 1).all()
@@ -0,0 +1,113 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tests kmedoids module."""
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+from smjsindustry.finance.constants import (
+    KMEDOIDS_SUMMARIZER_INIT_VALUES,
+    KMEDOIDS_SUMMARIZER_METRIC_VALUES,
+)
+from smjsindustry.finance.kmedoids import (
+    clara,
+    initialize_medoids,
+    kmedoids,
+    max_sample_size,
+    pairwise_distances,
+)
+
+
+def _blobs():
+    rng = np.random.RandomState(0)
+    centers = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+    return np.concatenate([center + rng.normal(scale=0.5, size=(20, 2)) for center in centers])
+
+
+@pytest.mark.parametrize("metric", KMEDOIDS_SUMMARIZER_METRIC_VALUES)
+def test_pairwise_distances(metric):
+    vectors = np.random.RandomState(0).normal(size=(6, 3))
+    distances = pairwise_distances(vectors, metric)
+
+    assert distances.shape == (6, 6)
+    assert distances.dtype == np.float32
+    np.testing.assert_allclose(distances, distances.T, atol=1e-12)
+    np.testing.assert_array_equal(np.diag(distances), 0)
+    assert (distances >= 0).all()
+    if metric == "euclidean":
+        np.testing.assert_allclose(
+            distances[0, 1], np.linalg.norm(vectors[0] - vectors[1]), rtol=1e-5
+        )
+    elif metric == "cosine":
+        cosine = vectors[0] @ vectors[1] / np.linalg.norm(vectors[0]) / np.linalg.norm(vectors[1])
+        np.testing.assert_allclose(distances[0, 1], 1 - cosine, rtol=1e-5)
+
+
+@pytest.mark.parametrize("init", KMEDOIDS_SUMMARIZER_INIT_VALUES)
+def test_kmedoids(init):
+    distances = pairwise_distances(_blobs(), "euclidean")
+    medoids = kmedoids(distances, 3, init=init)
+
+    assert sorted(medoids // 20) == [0, 1, 2]
+    assert list(medoids) == sorted(medoids)
+    np.testing.assert_array_equal(
+        initialize_medoids(distances, 3, init), initialize_medoids(distances, 3, init)
+    )
+    assert len(set(initialize_medoids(distances, 60, init))) == 60
+
+
+@pytest.mark.parametrize("n_clusters", [1, 4])
+def test_kmedoids_local_optimum(n_clusters):
+    distances = pairwise_distances(np.random.RandomState(1).normal(size=(30, 2)), "euclidean")
+    medoids = kmedoids(distances, n_clusters, init="random")
+
+    def cost(positions):
+        return distances[positions].min(axis=0).sum(dtype=np.float64)
+
+    for position in range(n_clusters):
+        for candidate in np.setdiff1d(np.arange(30), medoids):
+            swapped = medoids.copy()
+            swapped[position] = candidate
+            assert cost(swapped) >= cost(medoids) - 1e-4
+
+
+@pytest.mark.parametrize("metric", KMEDOIDS_SUMMARIZER_METRIC_VALUES)
+def test_clara(metric):
+    vectors = _blobs() + [5.0, 5.0]
+    medoids = clara(vectors, 3, metric, sample_size=30, num_samples=3)
+
+    assert len(set(medoids)) == 3 and list(medoids) == sorted(medoids)
+    if metric == "euclidean":
+        assert sorted(medoids // 20) == [0, 1, 2]
+    np.testing.assert_array_equal(
+        clara(vectors, 3, metric, sample_size=60),
+        kmedoids(pairwise_distances(vectors, metric), 3),
+    )
+    with pytest.raises(ValueError, match="sample size"):
+        clara(vectors, 31, metric, sample_size=30)
+
+
+@pytest.mark.parametrize("max_memory_mb", [1, 16, 256])
+def test_max_sample_size(max_memory_mb):
+    sample_size = max_sample_size(max_memory_mb)
+    assert 4 * sample_size**2 < max_memory_mb * 2**20 < 4 * (sample_size + 4096) ** 2
+
+
+def test_kmedoids_invalid_arguments():
+    distances = pairwise_distances(_blobs(), "euclidean")
+    with pytest.raises(ValueError, match="n_clusters"):
+        kmedoids(distances, 61)
+    with pytest.raises(ValueError, match="not valid"):
+        kmedoids(distances, 3, init="kmeans")
+    with pytest.raises(ValueError, match="not valid"):
+        pairwise_distances(_blobs(), "manhattan")
@@ -0,0 +1,178 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tests local_nlp_scorer module."""
+from __future__ import absolute_import
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+from smjsindustry.finance.nlp_score_type import NLPScoreType
+from smjsindustry.finance.processor_config import NLPScorerConfig
+from smjsindustry.finance.local_nlp_scorer import LocalNLPScorer, WordListIndex, word_list_index
+from smjsindustry.finance.tokenizer import tokenize
+
+SCORE_CONFIG = NLPScorerConfig(
+    [
+        NLPScoreType(NLPScoreType.POSITIVE, ["increase", "growth", "Profitable"]),
+        NLPScoreType(NLPScoreType.RISK, ["decline", "uncertain", "increased"]),
+        NLPScoreType("litigation", ["lawsuit", "court"]),
+    ]
+)
+TEXTS = [
+    "Net sales increased and growth was profitable.",
+    "The court dismissed the lawsuit; the outlook is uncertain.",
+    "The and of.",
+    None,
+]
+
+
+def _score_by_type(score_config, text):
+    tokens = tokenize(text)
+    return [
+        sum(token in {stem for word in words for stem in tokenize(word)} for token in tokens)
+        / max(len(tokens), 1)
+        for words in score_config.get_config()["score_types"].values()
+    ]
+
+
+def test_word_list_index():
+    index = WordListIndex(SCORE_CONFIG)
+    scores = index.score(TEXTS)
+
+    assert index.score_names == ["positive", "risk", "litigation"]
+    np.testing.assert_allclose(scores[0], [3 / 5, 1 / 5, 0])
+    for text, row in zip(TEXTS[:3], scores):
+        np.testing.assert_allclose(row, _score_by_type(SCORE_CONFIG, text))
+    assert np.isnan(scores[3]).all()
+    assert index.score([]).shape == (0, 3)
+
+
+def test_local_nlp_scorer():
+    dataframe = pd.DataFrame({"id": range(4), "text": TEXTS})
+    scores = LocalNLPScorer().calculate(SCORE_CONFIG, "text", dataframe)
+
+    assert list(scores.columns) == ["id", "text", "positive", "risk", "litigation"]
+    assert list(dataframe.columns) == ["id", "text"]
+    np.testing.assert_allclose(scores["litigation"][:3], [0, 2 / 5, 0])
+
+
+def test_document_term_matrix():
+    index = WordListIndex(SCORE_CONFIG)
+    matrix = index.document_term_matrix(TEXTS + ["Growth, growth and more growth."])
+
+    assert matrix.shape[0] == 5
+    np.testing.assert_array_equal(np.asarray(matrix.sum(axis=1)).ravel(), [5, 5, 0, 0, 3])
+    assert matrix[4].nnz == 1 and matrix[4].max() == 3
+    np.testing.assert_allclose(
+        LocalNLPScorer().calculate_batch(SCORE_CONFIG, TEXTS[:3]), index.score(TEXTS[:3])
+    )
+
+
+def test_local_nlp_scorer_calculate_file(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    input_file_path = str(tmp_path / "input.csv")
+    output_file_path = str(tmp_path / "output.csv")
+    dataframe = pd.DataFrame({"id": range(5), "text": TEXTS + ["Growth, growth, and court."]})
+    dataframe.to_csv(input_file_path, index=False)
+
+    rows = LocalNLPScorer().calculate_file(
+        SCORE_CONFIG, "text", input_file_path, output_file_path, chunksize=2
+    )
+
+    assert rows == 5
+    pd.testing.assert_frame_equal(
+        pd.read_csv(output_file_path),
+        LocalNLPScorer().calculate(SCORE_CONFIG, "text", pd.read_csv(input_file_path)),
+    )
+    assert "Scored 5 rows" in caplog.text and "rows/sec" in caplog.text
+    with pytest.raises(ValueError, match="chunksize"):
+        LocalNLPScorer().calculate_file(
+            SCORE_CONFIG, "text", input_file_path, output_file_path, chunksize=0
+        )
+
+
+def _covered_fraction(word_list, text):
+    tokens = tokenize(text)
+    covered = set()
+    for entry in word_list:
+        phrase = tokenize(entry)
+        for start in range(len(tokens) - len(phrase) + 1):
+            if phrase and tokens[start : start + len(phrase)] == phrase:
+                covered.update(range(start, start + len(phrase)))
+    return len(covered) / max(len(tokens), 1)
+
+
+def test_word_list_index_phrases():
+    word_lists = {
+        "weakness": ["material weakness", "weakness in internal control", "control"],
+        "concern": ["going concern", "substantial doubt", "doubt about going concern", "going"],
+    }
+    index = WordListIndex(
+        NLPScorerConfig([NLPScoreType(name, words) for name, words in word_lists.items()])
+    )
+    texts = [
+        "We identified a material weakness in internal control over financial reporting.",
+        "There is substantial doubt about our ability to continue as a going concern.",
+        "Going, going, gone: concern about the control of the material.",
+        "Material weakness. Weakness in internal control, and doubt about going concern.",
+    ]
+    scores = index.score(texts)
+
+    for text, row in zip(texts, scores):
+        expected = [_covered_fraction(words, text) for words in word_lists.values()]
+        np.testing.assert_allclose(row, expected)
+    assert scores[0, 0] == 4 / 7
+
+
+def test_word_list_index_cache():
+    score_config = NLPScorerConfig(NLPScoreType("talent", ["adept", "highly talented"]))
+    assert word_list_index(score_config) is word_list_index(score_config)
+    assert word_list_index(score_config) is not word_list_index(SCORE_CONFIG)
+
+
+@pytest.mark.parametrize(
+    "score_type",
+    [
+        NLPScoreType(NLPScoreType.POSITIVE, []),
+        NLPScoreType(NLPScoreType.SENTIMENT, None),
+        NLPScoreType(NLPScoreType.POLARITY, None),
+    ],
+)
+def test_word_list_index_without_word_list(score_type):
+    with pytest.raises(ValueError, match="requires a word_list"):
+        WordListIndex(NLPScorerConfig(score_type))
+    with pytest.raises(TypeError):
+        WordListIndex(SCORE_CONFIG.get_config())
+
+
+def test_word_list_index_readability():
+    score_config = NLPScorerConfig(
+        [
+            NLPScoreType(NLPScoreType.READABILITY, None),
+            NLPScoreType(NLPScoreType.POSITIVE, ["growth"]),
+        ]
+    )
+    texts = [
+        "The company reported growth. Revenue increased.",
+        "Growth.",
+        "",
+        None,
+    ]
+    scores = WordListIndex(score_config).score(texts)
+
+    # 6 words in 2 sentences, of which "company", "reported" and "revenue" are complex.
+    np.testing.assert_allclose(scores[:, 0][:3], [0.4 * (6 / 2 + 100 * 3 / 6), 0.4, 0])
+    np.testing.assert_allclose(scores[:, 1][:3], [1 / 5, 1, 0])
+    assert np.isnan(scores[3]).all()
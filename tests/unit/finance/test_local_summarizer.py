@@ -0,0 +1,289 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tests local summarizer module."""
+from __future__ import absolute_import
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from smjsindustry import (
+    JaccardSummarizerConfig,
+    KMedoidsSummarizerConfig,
+    NLPScoreType,
+    NLPScorerConfig,
+)
+from smjsindustry.finance.embedding import (
+    CachedEmbedding,
+    Doc2VecEmbedding,
+    HashingEmbedding,
+    TfidfSvdEmbedding,
+)
+from smjsindustry.finance.local_summarizer import (
+    JaccardSummarizer,
+    KMedoidsSummarizer,
+    LocalSummarizer,
+    select_by_centrality,
+)
+from smjsindustry.finance.tokenizer import split_sentences
+
+DATA_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "data", "finance", "processor_data.csv"
+)
+DOCUMENT = (
+    "Net sales increased in the quarter. Net sales and operating income increased. "
+    "The weather was pleasant. Operating income increased in the quarter."
+)
+
+
+@pytest.fixture(scope="module")
+def filing_text():
+    return pd.read_csv(DATA_FILE)["text"][0]
+
+
+def test_jaccard_summarizer_scores():
+    summarizer = JaccardSummarizer(JaccardSummarizerConfig(summary_size=2))
+    scores = summarizer.score_sentences(split_sentences(DOCUMENT))
+    assert scores[2] == 0
+    assert scores[0] > scores[2] and scores[1] > scores[2] and scores[3] > scores[2]
+    assert summarizer.summarize(DOCUMENT).count(".") == 2
+    assert "weather" not in summarizer.summarize(DOCUMENT)
+
+
+@pytest.mark.parametrize(
+    "config_args",
+    [
+        {"summary_size": 5},
+        {"summary_percentage": 0.1},
+        {"max_tokens": 150},
+        {"cutoff": 0.05},
+    ],
+)
+def test_jaccard_summarizer_size_arguments(filing_text, config_args):
+    summarizer = JaccardSummarizer(JaccardSummarizerConfig(**config_args))
+    sentences = split_sentences(filing_text)
+    selected = summarizer.select_sentences(sentences)
+    scores = summarizer.score_sentences(sentences)
+
+    assert selected == sorted(selected)
+    if "summary_size" in config_args:
+        assert len(selected) == 5
+    elif "summary_percentage" in config_args:
+        assert len(selected) == int(0.1 * len(sentences))
+    elif "max_tokens" in config_args:
+        assert 0 < sum(len(sentences[i].split()) for i in selected) <= 150
+    else:
+        assert all((scores[i] >= 0.05) == (i in selected) for i in range(len(sentences)))
+    if "max_tokens" not in config_args:
+        unselected = [i for i in range(len(sentences)) if i not in selected]
+        assert scores[selected].min() >= scores[unselected].max()
+    summary = summarizer.summarize(filing_text)
+    assert summary == " ".join(sentences[i] for i in selected)
+
+
+def test_jaccard_summarizer_vocabulary():
+    summarizer = JaccardSummarizer(
+        JaccardSummarizerConfig(summary_size=1, vocabulary={"weather", "pleasant"})
+    )
+    assert summarizer.score_sentences(split_sentences(DOCUMENT)).sum() == 0
+    assert summarizer.summarize(DOCUMENT) == "Net sales increased in the quarter."
+
+
+def test_jaccard_summarizer_invalid_config():
+    with pytest.raises(TypeError):
+        JaccardSummarizer(KMedoidsSummarizerConfig(summary_size=2))
+
+
+def test_jaccard_summarizer_approximate(filing_text):
+    exact = JaccardSummarizer(JaccardSummarizerConfig(summary_size=10))
+    approximate = JaccardSummarizer(
+        JaccardSummarizerConfig(summary_size=10, approximate=True, num_perm=128, num_bands=128)
+    )
+    sentences = split_sentences(filing_text)
+    assert approximate.select_sentences(sentences) == exact.select_sentences(sentences)
+
+
+@pytest.mark.parametrize("n_jobs, chunksize", [(1, None), (2, None), (2, 3)])
+def test_local_summarizer(filing_text, n_jobs, chunksize):
+    sentences = split_sentences(filing_text)
+    dataframe = pd.DataFrame(
+        {
+            "id": range(20),
+            "text": [" ".join(sentences[i * 9 : (i + 1) * 9]) for i in range(19)] + [None],
+        }
+    )
+    summarizer_config = JaccardSummarizerConfig(summary_size=2)
+
+    summarized = LocalSummarizer(n_jobs=n_jobs, chunksize=chunksize).summarize(
+        summarizer_config, "text", dataframe, new_summary_column_name="my_summary"
+    )
+    summarizer = JaccardSummarizer(summarizer_config)
+    assert list(summarized.columns) == ["id", "text", "my_summary"]
+    assert summarized["my_summary"].tolist() == [
+        summarizer.summarize(text) for text in dataframe["text"]
+    ]
+    assert "my_summary" not in dataframe.columns
+
+
+def test_local_summarizer_invalid_arguments():
+    with pytest.raises(ValueError, match="n_jobs"):
+        LocalSummarizer(n_jobs=0)
+    with pytest.raises(ValueError, match="chunksize"):
+        LocalSummarizer(chunksize=0)
+    with pytest.raises(TypeError):
+        LocalSummarizer().summarize(
+            NLPScorerConfig(NLPScoreType("positive", ["good"])), "text", pd.DataFrame({"text": []})
+        )
+    with pytest.raises(TypeError, match="embedding"):
+        LocalSummarizer(embedding="hashing")
+    with pytest.raises(TypeError, match="KMedoidsSummarizerConfig"):
+        LocalSummarizer(embedding=HashingEmbedding(16)).summarize(
+            JaccardSummarizerConfig(summary_size=2), "text", pd.DataFrame({"text": []})
+        )
+
+
+def _select_by_sorting(scores, token_counts, max_sentences, max_tokens, min_score):
+    ranking = np.argsort(-scores, kind="stable")
+    if max_sentences is not None:
+        return sorted(ranking[:max_sentences].tolist())
+    if min_score is not None:
+        return sorted(ranking[scores[ranking] >= min_score].tolist())
+    selected = []
+    for position in ranking:
+        if token_counts[position] <= max_tokens:
+            selected.append(position)
+            max_tokens -= token_counts[position]
+    return sorted(selected)
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"max_sentences": 7},
+        {"max_sentences": 0},
+        {"max_tokens": 60},
+        {"max_tokens": 1},
+        {"min_score": 0.5},
+    ],
+)
+def test_select_by_centrality(rule):
+    rng = np.random.default_rng(0)
+    # Rounded scores produce ties, which are broken by position.
+    scores = np.round(rng.random(200), 1)
+    token_counts = rng.integers(3, 30, size=200).tolist()
+    arguments = {"max_sentences": None, "max_tokens": None, "min_score": None, **rule}
+
+    assert select_by_centrality(scores, token_counts, **rule) == _select_by_sorting(
+        scores, token_counts, **arguments
+    )
+
+
+@pytest.mark.parametrize(
+    "embedding",
+    [None, HashingEmbedding(64), TfidfSvdEmbedding(20)],
+    ids=["default", "hashing", "tfidf"],
+)
+@pytest.mark.parametrize("metric", ["euclidean", "cosine", "dot-product"])
+def test_kmedoids_summarizer(filing_text, embedding, metric):
+    summarizer_config = KMedoidsSummarizerConfig(summary_size=4, min_count=2, metric=metric)
+    summarizer = KMedoidsSummarizer(summarizer_config, embedding=embedding)
+    sentences = split_sentences(filing_text)
+
+    selected = summarizer.select_sentences(sentences)
+    assert len(selected) == 4 and selected == sorted(set(selected))
+    assert summarizer.summarize(filing_text) == " ".join(sentences[i] for i in selected)
+    if embedding is None:
+        assert isinstance(summarizer.embedding, TfidfSvdEmbedding)
+        assert summarizer.embedding.vector_size == 100
+
+
+def test_kmedoids_summarizer_sampling(filing_text):
+    sentences = split_sentences(filing_text)
+    exact = KMedoidsSummarizer(KMedoidsSummarizerConfig(summary_size=4))
+    sampled = KMedoidsSummarizer(
+        KMedoidsSummarizerConfig(summary_size=4, sampling=True, max_memory_mb=1)
+    )
+    within_budget = KMedoidsSummarizer(KMedoidsSummarizerConfig(summary_size=4, sampling=True))
+
+    selected = sampled.select_sentences(sentences)
+    assert len(selected) == 4 and selected == sorted(set(selected))
+    assert within_budget.select_sentences(sentences) == exact.select_sentences(sentences)
+
+
+def test_kmedoids_summarizer_cached_embedding(filing_text, tmp_path):
+    sentences = split_sentences(filing_text)
+    summarizer_config = KMedoidsSummarizerConfig(summary_size=4)
+    embedding = CachedEmbedding(HashingEmbedding(100), str(tmp_path))
+    summarizer = KMedoidsSummarizer(summarizer_config, embedding=embedding)
+    uncached = KMedoidsSummarizer(summarizer_config, embedding=HashingEmbedding(100))
+
+    summarizer.select_sentences(sentences[:150])
+    misses = embedding.misses
+    assert summarizer.select_sentences(sentences[29:]) == uncached.select_sentences(sentences[29:])
+    assert 0 < embedding.misses - misses < 50
+
+
+def test_kmedoids_summarizer_doc2vec_config(caplog):
+    summarizer_config = KMedoidsSummarizerConfig(summary_size=4, vector_size=50, epochs=20)
+    KMedoidsSummarizer(summarizer_config, embedding=Doc2VecEmbedding(50, epochs=20))
+    assert "Doc2VecEmbedding" not in caplog.text
+
+    KMedoidsSummarizer(summarizer_config, embedding=Doc2VecEmbedding(50))
+    assert "epochs 60, while the config has vector_size 50 and epochs 20" in caplog.text
+
+
+def test_kmedoids_summarizer_short_document():
+    summarizer = KMedoidsSummarizer(KMedoidsSummarizerConfig(summary_size=5))
+    assert summarizer.summarize(DOCUMENT) == DOCUMENT
+    assert summarizer.summarize(None) == ""
+
+
+def test_kmedoids_summarizer_invalid_arguments():
+    with pytest.raises(TypeError):
+        KMedoidsSummarizer(JaccardSummarizerConfig(summary_size=2))
+    with pytest.raises(TypeError):
+        KMedoidsSummarizer(KMedoidsSummarizerConfig(summary_size=2), embedding="hashing")
+
+
+def test_local_summarizer_kmedoids(filing_text):
+    dataframe = pd.DataFrame({"text": [filing_text, DOCUMENT]})
+    summarizer_config = KMedoidsSummarizerConfig(summary_size=3)
+    summarized = LocalSummarizer().summarize(summarizer_config, "text", dataframe)
+    summarizer = KMedoidsSummarizer(summarizer_config)
+    assert summarized["summary"].tolist() == [
+        summarizer.summarize(filing_text),
+        summarizer.summarize(DOCUMENT),
+    ]
+
+
+def test_local_summarizer_kmedoids_cached_embedding(filing_text, tmp_path):
+    sentences = split_sentences(filing_text)
+    # Overlapping sections, like consecutive filings that repeat their boilerplate.
+    dataframe = pd.DataFrame(
+        {"text": [" ".join(sentences[i * 20 : i * 20 + 60]) for i in range(6)]}
+    )
+    summarizer_config = KMedoidsSummarizerConfig(summary_size=3)
+    embedding = CachedEmbedding(HashingEmbedding(100), str(tmp_path))
+
+    summarized = LocalSummarizer(n_jobs=2, chunksize=1, embedding=embedding).summarize(
+        summarizer_config, "text", dataframe
+    )
+    summarizer = KMedoidsSummarizer(summarizer_config, embedding=HashingEmbedding(100))
+    assert summarized["summary"].tolist() == [
+        summarizer.summarize(text) for text in dataframe["text"]
+    ]
+    # The workers filled the shared cache files.
+    reopened = CachedEmbedding(HashingEmbedding(100), str(tmp_path))
+    LocalSummarizer(embedding=reopened).summarize(summarizer_config, "text", dataframe)
+    assert reopened.hits > 0 and reopened.misses == 0
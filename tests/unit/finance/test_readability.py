@@ -0,0 +1,94 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tests readability module."""
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+from smjsindustry.finance.readability import count_syllables, gunning_fog, syllable_table
+
+
+@pytest.mark.parametrize(
+    "word, syllables",
+    [
+        ("the", 1),
+        ("income", 2),
+        ("table", 2),
+        ("rates", 1),
+        ("prices", 2),
+        ("based", 1),
+        ("reported", 3),
+        ("management", 3),
+        ("radio", 3),
+        ("actual", 3),
+        ("financial", 3),
+        ("nation", 2),
+        ("quarter", 2),
+        ("earlier", 3),
+        ("depreciation", 5),
+        ("million", 2),
+    ],
+)
+def test_count_syllables(word, syllables):
+    assert count_syllables(word) == syllables
+
+
+@pytest.mark.parametrize(
+    "word, syllables",
+    [
+        ("revenue", 3),
+        ("company", 3),
+        ("quarterly", 3),
+        ("liabilities", 5),
+        ("subsidiary", 5),
+        ("operating", 4),
+        ("amortization", 5),
+        ("acquisition", 4),
+        ("inventory", 4),
+        ("securities", 4),
+        ("sustainability", 6),
+        ("biopharmaceutical", 7),
+        # The vowel-group heuristic miscounts these words.
+        ("interest", 2),
+        ("shareholders", 3),
+        ("reinsurance", 4),
+        ("everyone", 3),
+        ("business", 2),
+        ("science", 2),
+    ],
+)
+def test_count_syllables_vocabulary(word, syllables):
+    assert word in syllable_table()
+    assert count_syllables(word) == syllables
+
+
+@pytest.mark.parametrize(
+    "word, syllables",
+    [("fintech", 2), ("cybersecurity", 6), ("tokenization", 5), ("decarbonization", 6)],
+)
+def test_count_syllables_unknown_words(word, syllables):
+    assert word not in syllable_table()
+    assert count_syllables(word) == syllables
+
+
+def test_syllable_table():
+    table = syllable_table()
+    assert len(table) > 100000
+    assert all(word.isalpha() and word.islower() and count > 0 for word, count in table.items())
+
+
+def test_gunning_fog():
+    np.testing.assert_allclose(
+        gunning_fog([20, 10, 0], [2, 0, 0], [4, 0, 0]),
+        [0.4 * (10 + 100 * 4 / 20), 0.4 * 10, 0],
+    )
@@ -0,0 +1,327 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tests sec_parser module."""
+from __future__ import absolute_import
+
+import json
+import logging
+import os
+
+import pandas as pd
+import pytest
+from smjsindustry.finance import sec_parser
+from smjsindustry.finance.sec_parser import (
+    SEC_FILING_COLUMNS,
+    SEC_HEADER_INDEX_COLUMNS,
+    LocalSECFilingParser,
+    iter_submission,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data", "finance", "sec_filings")
+FILING_PATH = os.path.join(DATA_DIR, "0000949377-21-000112.txt")
+SUBMISSION = b"""<SEC-DOCUMENT>0000320193-20-000096.txt : 20201030
+<SEC-HEADER>0000320193-20-000096.hdr.sgml : 20201030
+<ACCEPTANCE-DATETIME>20201029180625
+ACCESSION NUMBER:\t\t0000320193-20-000096
+CONFORMED SUBMISSION TYPE:\t10-K
+FILED AS OF DATE:\t\t20201030
+
+FILER:
+\tCOMPANY DATA:\t
+\t\tCOMPANY CONFORMED NAME:\t\t\tApple Inc.
+\t\tCENTRAL INDEX KEY:\t\t\t0000320193
+</SEC-HEADER>
+<DOCUMENT>
+<TYPE>10-K
+<SEQUENCE>1
+<FILENAME>aapl-20200926.htm
+<TEXT>
+<html><head><title>10-K</title><style>p {margin: 0}</style></head>
+<body><p>Net sales&nbsp;increased
+ in 2020.</p><div>Item&#160;1A. <b>Risk</b> Factors</div>
+</body></html>
+</TEXT>
+</DOCUMENT>
+<DOCUMENT>
+<TYPE>EX-21.1
+<SEQUENCE>2
+<FILENAME>a10-kexhibit2112020.txt
+<DESCRIPTION>SUBSIDIARIES
+<TEXT>
+Subsidiaries of
+<PAGE>
+Apple Inc.
+</TEXT>
+</DOCUMENT>
+<DOCUMENT>
+<TYPE>GRAPHIC
+<SEQUENCE>3
+<FILENAME>logo.jpg
+<TEXT>
+begin 644 logo.jpg
+M_]C_X  02D9)1@ ! @  9 !D  #_[  11'5C:WD  0 $    /   _^X #D%D
+end
+</TEXT>
+</DOCUMENT>
+</SEC-DOCUMENT>
+"""
+
+
+def test_iter_submission():
+    documents = list(iter_submission(SUBMISSION.splitlines(keepends=True)))
+    header = documents[0][0]
+
+    assert header["accession_number"] == "0000320193-20-000096"
+    assert header["conformed_submission_type"] == "10-K"
+    assert header["acceptance_datetime"] == "20201029180625"
+    assert header["company_conformed_name"] == "Apple Inc."
+    assert [document["type"] for _, document in documents] == ["10-K", "EX-21.1", "GRAPHIC"]
+    assert documents[0][1]["text"] == "Net sales increased in 2020.\nItem 1A. Risk Factors"
+    assert documents[1][1]["description"] == "SUBSIDIARIES"
+    assert documents[1][1]["text"] == "Subsidiaries of\nApple Inc."
+    assert documents[2][1]["text"] == ""
+
+
+def test_local_sec_filing_parser(tmp_path):
+    (tmp_path / "0000320193-20-000096.txt").write_bytes(SUBMISSION)
+    (tmp_path / "notes.md").write_text("Not a submission")
+    parser = LocalSECFilingParser()
+    parsed = parser.parse(str(tmp_path))
+
+    assert list(parsed.columns) == SEC_FILING_COLUMNS
+    assert parsed.iloc[0].tolist() == [
+        "0000320193",
+        "10-K",
+        "0000320193-20-000096",
+        "2020-10-30",
+        "Net sales increased in 2020.\nItem 1A. Risk Factors",
+    ]
+
+    row = parser.parse_file(FILING_PATH)
+    assert row["form_type"] == "497K" and row["filing_date"] == "2021-04-30"
+    assert row["text"].startswith("Summary Prospectus\nRoyce Special Equity Fund | May 1, 2021")
+    assert "<" not in row["text"] and "begin 644" not in row["text"]
+    assert len(list(parser.iter_documents(FILING_PATH))) == 7
+
+    with pytest.raises(ValueError, match="not an EDGAR full-submission file"):
+        parser.parse(str(tmp_path / "notes.md"))
+
+
+def test_parse_file_without_document_of_submission_type(tmp_path, caplog):
+    amended_path = tmp_path / "0000949377-21-000112.txt"
+    with open(FILING_PATH, "rb") as file:
+        amended_path.write_bytes(
+            file.read().replace(
+                b"CONFORMED SUBMISSION TYPE:\t497K", b"CONFORMED SUBMISSION TYPE:\t497K/A", 1
+            )
+        )
+    parser = LocalSECFilingParser()
+
+    row = parser.parse_file(str(amended_path))
+    assert row["form_type"] == "497K/A"
+    assert row["text"] == parser.parse_file(FILING_PATH)["text"]
+    assert "has no 497K/A document, using its first document of type 497K" in caplog.text
+    assert parser.parse_file(str(amended_path), document_types=["497K/A"])["text"] == ""
+
+
+def test_iter_documents_document_types(tmp_path):
+    file_path = tmp_path / "0000320193-20-000096.txt"
+    file_path.write_bytes(SUBMISSION)
+    parser = LocalSECFilingParser()
+
+    assert list(parser.iter_documents(str(file_path))) == list(
+        iter_submission(SUBMISSION.splitlines(keepends=True))
+    )
+    documents = [document for _, document in parser.iter_documents(FILING_PATH)]
+    with open(FILING_PATH, "rb") as file:
+        assert documents == [document for _, document in iter_submission(file)]
+
+    exhibits = list(parser.iter_documents(str(file_path), document_types=["EX-21.1"]))
+    assert [document["sequence"] for _, document in exhibits] == ["2"]
+    assert exhibits[0][0]["central_index_key"] == "0000320193"
+    assert parser.parse_file(str(file_path), ["10-K", "EX-21.1"])["text"].endswith(
+        "Risk Factors\nSubsidiaries of\nApple Inc."
+    )
+    (tmp_path / "empty.txt").write_bytes(b"")
+    assert list(parser.iter_documents(str(tmp_path / "empty.txt"))) == []
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_parse_directory(tmp_path, caplog, n_jobs, extension):
+    input_path = tmp_path / "filings"
+    (input_path / "2020").mkdir(parents=True)
+    (input_path / "2020" / "0000320193-20-000096.txt").write_bytes(SUBMISSION)
+    (input_path / "0000949377-21-000112.txt").write_bytes(open(FILING_PATH, "rb").read())
+    (input_path / "malformed.txt").write_bytes(b"<DOCUMENT>\n<TYPE>10-K\n</DOCUMENT>\n")
+    if extension == "parquet":
+        pytest.importorskip("pyarrow")
+    output_path = str(tmp_path / "parsed.{}".format(extension))
+    parser = LocalSECFilingParser(n_jobs=n_jobs)
+
+    failures = parser.parse_directory(str(input_path), output_path, batch_size=1)
+
+    assert list(failures) == [str(input_path / "malformed.txt")]
+    assert "Failed to parse" in caplog.text
+    if extension == "csv":
+        parsed = pd.read_csv(output_path, dtype=str)
+    else:
+        parsed = pd.read_parquet(output_path)
+        import pyarrow.parquet as pq
+
+        assert pq.ParquetFile(output_path).num_row_groups == 2
+    pd.testing.assert_frame_equal(
+        parsed,
+        pd.concat(
+            [parser.parse(FILING_PATH), parser.parse(str(input_path / "2020"))],
+            ignore_index=True,
+        ),
+    )
+    with pytest.raises(ValueError, match="not an EDGAR full-submission file"):
+        parser.parse(str(input_path))
+
+
+def test_parse_directory_arguments(tmp_path):
+    parser = LocalSECFilingParser()
+    with pytest.raises(ValueError, match="output_file_path"):
+        parser.parse_directory(str(tmp_path), str(tmp_path / "parsed.json"))
+    with pytest.raises(ValueError, match="batch_size"):
+        parser.parse_directory(str(tmp_path), str(tmp_path / "parsed.csv"), batch_size=0)
+    with pytest.raises(ValueError, match="n_jobs"):
+        LocalSECFilingParser(n_jobs=0)
+    assert parser.parse_directory(str(tmp_path), str(tmp_path / "parsed.csv")) == {}
+    assert list(pd.read_csv(tmp_path / "parsed.csv").columns) == SEC_FILING_COLUMNS
+
+
+def _read_parts(output_path):
+    parts = sorted(name for name in os.listdir(output_path) if name.startswith("part-"))
+    return pd.concat(
+        [pd.read_csv(os.path.join(output_path, name), dtype=str) for name in parts],
+        ignore_index=True,
+    ).sort_values("accession_number", ignore_index=True)
+
+
+def test_update_directory(tmp_path, caplog, monkeypatch):
+    caplog.set_level(logging.INFO)
+    input_path = tmp_path / "filings"
+    input_path.mkdir()
+    output_path = str(tmp_path / "parsed")
+    (input_path / "0000949377-21-000112.txt").write_bytes(open(FILING_PATH, "rb").read())
+    parser = LocalSECFilingParser()
+
+    assert parser.update_directory(str(input_path), output_path, file_format="csv") == {}
+    assert _read_parts(output_path)["accession_number"].tolist() == ["0000949377-21-000112"]
+    with open(os.path.join(output_path, "_manifest.json")) as manifest_file:
+        manifest = json.load(manifest_file)
+    assert manifest["0000949377-21-000112"]["output"] == "part-00000.csv"
+    assert len(manifest["0000949377-21-000112"]["hash"]) == 32
+
+    # A new filing is parsed into a new part, without reading the unchanged file.
+    submission_path = input_path / "0000320193-20-000096.txt"
+    submission_path.write_bytes(SUBMISSION)
+    hashed = []
+    monkeypatch.setattr(sec_parser, "_file_hash", _recording(sec_parser._file_hash, hashed))
+    assert parser.update_directory(str(input_path), output_path, file_format="csv") == {}
+    assert hashed == [str(submission_path)]
+    pd.testing.assert_frame_equal(
+        _read_parts(output_path), parser.parse(str(input_path)).sort_values("accession_number")
+    )
+
+    # A changed filing replaces its row, and a touched one is only hashed.
+    submission_path.write_bytes(SUBMISSION.replace(b"Net sales", b"Revenue"))
+    os.utime(input_path / "0000949377-21-000112.txt", ns=(0, 0))
+    assert parser.update_directory(str(input_path), output_path, file_format="csv") == {}
+    parsed = _read_parts(output_path)
+    assert parsed["text"][0].startswith("Revenue increased")
+    assert sorted(os.listdir(output_path)) == ["_manifest.json", "part-00000.csv", "part-00002.csv"]
+    assert "1 new or changed filings" in caplog.text
+
+    # A malformed change keeps the last parse, and a removed filing loses its row.
+    submission_path.write_bytes(b"<DOCUMENT>\n</DOCUMENT>\n")
+    os.remove(input_path / "0000949377-21-000112.txt")
+    failures = parser.update_directory(str(input_path), output_path, file_format="csv")
+    assert list(failures) == [str(submission_path)]
+    pd.testing.assert_frame_equal(_read_parts(output_path), parsed[:1])
+    with open(os.path.join(output_path, "_manifest.json")) as manifest_file:
+        assert list(json.load(manifest_file)) == ["0000320193-20-000096"]
+
+    with pytest.raises(ValueError, match="file_format"):
+        parser.update_directory(str(input_path), output_path, file_format="json")
+
+
+def test_update_directory_reads_back_as_parquet_dataset(tmp_path):
+    pytest.importorskip("pyarrow")
+    input_path = tmp_path / "filings"
+    input_path.mkdir()
+    output_path = str(tmp_path / "parsed")
+    (input_path / "0000949377-21-000112.txt").write_bytes(open(FILING_PATH, "rb").read())
+    submission_path = input_path / "0000320193-20-000096.txt"
+    submission_path.write_bytes(SUBMISSION)
+    parser = LocalSECFilingParser()
+    assert parser.update_directory(str(input_path), output_path) == {}
+
+    # The changed filing's row is removed from a part that keeps the other row.
+    submission_path.write_bytes(SUBMISSION.replace(b"Net sales", b"Revenue"))
+    assert parser.update_directory(str(input_path), output_path) == {}
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(output_path).sort_values("accession_number", ignore_index=True),
+        parser.parse(str(input_path)).sort_values("accession_number", ignore_index=True),
+    )
+
+
+def _recording(function, calls):
+    def record(*args):
+        calls.append(args[0])
+        return function(*args)
+
+    return record
+
+
+def test_index_headers(tmp_path, caplog):
+    input_path = tmp_path / "filings"
+    (input_path / "2020").mkdir(parents=True)
+    # A header larger than a read block, whose fields are read up to its end only.
+    large_header = SUBMISSION.replace(
+        b"</SEC-HEADER>",
+        b"<SERIES-NAME>Fund\n" * 2000 + b"FISCAL YEAR END:\t\t0926\n</SEC-HEADER>",
+    ).replace(b"<TYPE>10-K", b"FISCAL YEAR END:\t\t1231\n<TYPE>10-K")
+    (input_path / "2020" / "0000320193-20-000096.txt").write_bytes(large_header)
+    (input_path / "0000949377-21-000112.txt").write_bytes(open(FILING_PATH, "rb").read())
+    (input_path / "notes.txt").write_bytes(b"Not a submission")
+    output_path = str(tmp_path / "index.csv")
+
+    index = LocalSECFilingParser().index_headers(str(input_path), output_path)
+
+    assert list(index.columns) == SEC_HEADER_INDEX_COLUMNS
+    assert index.drop(columns="file_path").astype(str).values.tolist() == [
+        ["0000949377-21-000112", "497K", "2021-04-30", "0000709364", "ROYCE FUND", "1231"],
+        ["0000320193-20-000096", "10-K", "2020-10-30", "0000320193", "Apple Inc.", "0926"],
+    ]
+    assert index["form_type"].dtype == "category"
+    assert "Skipped 1 files" in caplog.text
+    assert pd.read_csv(output_path, dtype=str)["cik"].tolist() == ["0000709364", "0000320193"]
+    with pytest.raises(ValueError, match="output_file_path"):
+        LocalSECFilingParser().index_headers(str(input_path), str(tmp_path / "index.json"))
+
+
+def test_index_headers_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    output_path = str(tmp_path / "index.parquet")
+    (tmp_path / "0000320193-20-000096.txt").write_bytes(SUBMISSION)
+    (tmp_path / "0000949377-21-000112.txt").write_bytes(open(FILING_PATH, "rb").read())
+
+    index = LocalSECFilingParser(n_jobs=2).index_headers(str(tmp_path), output_path)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(output_path), index)
+    ten_k = pd.read_parquet(output_path, filters=[("form_type", "==", "10-K")])
+    assert ten_k["accession_number"].tolist() == ["0000320193-20-000096"]
@@ -0,0 +1,83 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tests tokenizer module."""
+from __future__ import absolute_import
+
+import pytest
+from smjsindustry.finance.tokenizer import (
+    is_token,
+    split_sentences,
+    split_words,
+    stem,
+    stem_vocabulary,
+    tokenize,
+)
+
+
+@pytest.mark.parametrize(
+    "word, expected",
+    [
+        ("caresses", "caress"),
+        ("ponies", "poni"),
+        ("agreed", "agre"),
+        ("hopping", "hop"),
+        ("filing", "file"),
+        ("happy", "happi"),
+        ("relational", "relat"),
+        ("generalizations", "gener"),
+        ("adjustment", "adjust"),
+        ("adoption", "adopt"),
+        ("controll", "control"),
+        ("sky", "sky"),
+    ],
+)
+def test_stem(word, expected):
+    assert stem(word) == expected
+
+
+def test_split_sentences():
+    text = (
+        "Amazon.com, Inc. reported sales. Net sales rose 5% in the U.S. market!\n"
+        "Did it?  Yes. Mr. Bezos said so. 2019 was good."
+    )
+    assert split_sentences(text) == [
+        "Amazon.com, Inc. reported sales.",
+        "Net sales rose 5% in the U.S. market!",
+        "Did it?",
+        "Yes.",
+        "Mr. Bezos said so.",
+        "2019 was good.",
+    ]
+
+
+def test_tokenize():
+    sentence = "The Company’s net sales increased 15% to $60.0 billion, driven by operations."
+    assert tokenize(sentence) == ["compani", "net", "sale", "increas", "billion", "driven", "oper"]
+    vocabulary = stem_vocabulary({"Sales", "increase"})
+    assert tokenize(sentence, vocabulary) == ["sale", "increas"]
+
+
+def test_split_words():
+    assert split_words("Net sales (U.S.) rose 5%; the café’s naïve") == [
+        "net",
+        "sales",
+        "u",
+        "s",
+        "rose",
+        "the",
+        "caf",
+        "s",
+        "na",
+        "ve",
+    ]
+    assert [is_token(word) for word in ["net", "the", "u"]] == [True, False, False]
@@ -13,8 +13,19 @@
 """Tests utils module."""
 from __future__ import absolute_import
 
+import sys
+
+import pandas as pd
 import pytest
-from smjsindustry.finance.utils import get_freq_label, retrieve_image
+from smjsindustry.finance.utils import (
+    clear_freq_label_cache,
+    freq_label_cache_info,
+    get_freq_label,
+    get_freq_labels,
+    get_freq_start_dates,
+    import_sparse,
+    retrieve_image,
+)
 from smjsindustry.finance.constants import REPOSITORY, CONTAINER_IMAGE_VERSION
 
 
@@ -58,6 +69,82 @@ def test_get_freq_label(date_value, freq):
             get_freq_label(date_value, freq)
 
 
+@pytest.mark.parametrize("freq", ["Y", "Q", "M", "W", "D", "y"])
+def test_get_freq_labels_matches_get_freq_label(freq):
+    date_values = pd.Series(
+        ["2020-05-01", "2019-12-30", "2021-1-3", "2020-05", "2020", "2020q2", "2020M5", "2020w18"]
+    )
+    for date_value in date_values:
+        try:
+            expected = get_freq_label(date_value, freq)
+        except ValueError as error:
+            with pytest.raises(ValueError, match="^{}$".format(error)):
+                get_freq_labels(pd.Series([date_value]), freq)
+        else:
+            assert get_freq_labels(pd.Series([date_value]), freq).tolist() == [expected]
+    valid = [value for value in date_values if _is_valid(value, freq)]
+    expected = [get_freq_label(value, freq) for value in valid]
+    actual = get_freq_labels(pd.Series(valid, index=range(10, 10 + len(valid))), freq)
+    assert actual.tolist() == expected
+    assert actual.index.tolist() == list(range(10, 10 + len(valid)))
+
+
+@pytest.mark.parametrize("date_values", [[2020], ["2020-05-01", None]])
+def test_get_freq_labels_requires_strings(date_values):
+    with pytest.raises(Exception, match="The date column needs to be string"):
+        get_freq_labels(pd.Series(date_values), "Q")
+
+
+def test_get_freq_labels_empty_column():
+    # pandas reads an empty column as float64.
+    date_values = pd.Series([], dtype="float64", index=pd.RangeIndex(0))
+    assert get_freq_labels(date_values, "Q").tolist() == []
+    assert get_freq_start_dates(date_values, "Q").tolist() == []
+
+
+@pytest.mark.parametrize("freq", ["Y", "Q", "M", "W"])
+def test_get_freq_labels_impossible_date(freq):
+    with pytest.raises(ValueError) as expected:
+        get_freq_label("2021-02-30", freq)
+    with pytest.raises(ValueError, match="^{}$".format(expected.value)):
+        get_freq_labels(pd.Series(["2020-05-01", "2021-02-30"]), freq)
+    with pytest.raises(ValueError, match="^{}$".format(expected.value)):
+        get_freq_start_dates(pd.Series(["2021-02-30"]), freq)
+
+
+def test_get_freq_labels_unsupported_freq():
+    with pytest.raises(ValueError, match=r"^frequency T not supported$"):
+        get_freq_labels(pd.Series(["2020-05-01"]), "T")
+
+
+def test_get_freq_labels_maps_repeated_dates():
+    date_values = pd.Series(["2020-05-01", "2019-12-30", "2020-05-01", "2020Q2"] * 1000)
+    actual = get_freq_labels(date_values, "Q")
+    assert actual.tolist() == ["2020Q2", "2019Q4", "2020Q2", "2020Q2"] * 1000
+    assert get_freq_labels(pd.Series([], dtype=object), "Q").tolist() == []
+
+
+def test_get_freq_label_cache():
+    clear_freq_label_cache()
+    assert get_freq_label("2020-05-01", "q") == "2020Q2"
+    assert get_freq_label("2020-05-01", "Q") == "2020Q2"
+    assert get_freq_label("2020-05-01", "Y") == "2020"
+    with pytest.raises(ValueError):
+        get_freq_label("2020/05/01", "Q")
+    cache_info = freq_label_cache_info()
+    assert (cache_info.hits, cache_info.misses, cache_info.currsize) == (1, 3, 2)
+    clear_freq_label_cache()
+    assert freq_label_cache_info().currsize == 0
+
+
+def _is_valid(date_value, freq):
+    try:
+        get_freq_label(date_value, freq)
+    except ValueError:
+        return False
+    return True
+
+
 @pytest.mark.parametrize(
     "region",
     [
@@ -204,3 +291,11 @@ def test_retrieve_image(region):
             REPOSITORY, CONTAINER_IMAGE_VERSION
         )
         assert actual == expected
+
+
+def test_import_sparse(monkeypatch):
+    sparse = pytest.importorskip("scipy.sparse")
+    assert import_sparse() is sparse
+    monkeypatch.setitem(sys.modules, "scipy.sparse", None)
+    with pytest.raises(ImportError, match="smjsindustry\\[local\\]"):
+        import_sparse()